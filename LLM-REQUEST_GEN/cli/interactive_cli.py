@@ -1,7 +1,8 @@
 import json
-from utils.io_utils import save_requests
+from utils.io_utils import save_requests, append_requests_jsonl
 from prompts.request_prompt import create_generation_prompt
-from generators.request_generator import RequestGenerator
+from generators.request_generator import RequestGenerator, DEFAULT_CHUNK_SIZE
+from generators.variation_engine import VariationEngine
 
 def extract_path_variables(endpoint):
     """Extract path variables from endpoint string"""
@@ -109,6 +110,46 @@ def collect_body():
         print("⚠️  Invalid JSON format, treating as plain text")
         return {"data": body_input}
 
+def generate_with_llm(client, model, sample_request, num):
+    """Generate variations with the LLM (chunked for large counts)"""
+    generator = RequestGenerator(client)
+    if num > DEFAULT_CHUNK_SIZE:
+        # Large runs go out as concurrent chunks so one bad completion only costs its chunk
+        corpus = input("Append batches to a JSONL corpus as they arrive? Filename (.jsonl[.gz|.zst], blank to skip): ").strip()
+        on_batch = None
+        if corpus:
+            on_batch = lambda batch: append_requests_jsonl(batch, corpus)
+        print(f"📝 Generating {num} request variations in chunks of {DEFAULT_CHUNK_SIZE}...")
+        requests = generator.generate_chunked(sample_request, num, model, on_batch=on_batch)
+        if corpus and requests:
+            print(f"💾 Appended {len(requests)} requests to {corpus}")
+    else:
+        prompt = create_generation_prompt(sample_request, num)
+        print(f"📝 Generating {num} request variations...")
+        if hasattr(client, 'stream_completion'):
+            # Show each request as soon as the LLM finishes writing it
+            requests = []
+            for request in generator.generate_streaming(prompt, model):
+                requests.append(request)
+                print(f"  ✓ {request['method']} {request['url']}")
+        else:
+            requests = generator.generate(prompt, model)
+    return requests
+
+def generate_locally(client, model, sample_request, num):
+    """Generate variations with the deterministic local engine, optionally seeded by the LLM"""
+    seed = int(input("Random seed [0]: ") or "0")
+    cardinality = int(input("Distinct values per field [1000]: ") or "1000")
+    engine = VariationEngine(sample_request, seed=seed, cardinality=cardinality)
+
+    if input("Seed value pools with a small LLM sample? (y/N): ").strip().lower() == 'y':
+        prompt = create_generation_prompt(sample_request, min(num, 10))
+        llm_requests = RequestGenerator(client).generate(prompt, model)
+        print(f"🌱 Added {engine.seed_pools(llm_requests)} LLM-suggested values to the pools")
+
+    print(f"⚙️  Generating {num} request variations locally...")
+    return engine.generate(num)
+
 def run_cli(client, model):
     print("📋 Enhanced Load Testing Request Generator CLI\n")
     
@@ -168,11 +209,11 @@ def run_cli(client, model):
     
     num = int(input("How many variations? [5]: ") or "5")
     
-    generator = RequestGenerator(client)
-    prompt = create_generation_prompt(sample_request, num)
-    print(f"📝 Generating {num} request variations...")
-    
-    requests = generator.generate(prompt, model)
+    use_local = input("Use the local variation engine instead of the LLM? (y/N): ").strip().lower() == 'y'
+    if use_local:
+        requests = generate_locally(client, model, sample_request, num)
+    else:
+        requests = generate_with_llm(client, model, sample_request, num)
     
     if requests:
         print(f"✅ {len(requests)} requests generated successfully")
@@ -184,7 +225,7 @@ def run_cli(client, model):
         
         save = input("\nSave to file? (Y/n): ").strip().lower() != 'n'
         if save:
-            filename = input("Filename (default: requests_generated.json): ").strip() or "requests_generated.json"
+            filename = input("Filename (.json, or .jsonl[.gz|.zst] to append to a corpus; default: requests_generated.json): ").strip() or "requests_generated.json"
             filepath = save_requests(requests, filename)
             print(f"💾 Saved to {filepath}")
     else:
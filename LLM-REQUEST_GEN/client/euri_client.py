@@ -1,9 +1,13 @@
+import json
+import httpx
 import requests
 
+DEFAULT_BASE_URL = "https://api.euron.one/api/v1/euri/chat/completions"
+
 class EURIClient:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, base_url: str = DEFAULT_BASE_URL):
         self.api_key = api_key
-        self.base_url = "https://api.euron.one/api/v1/euri/chat/completions"
+        self.base_url = base_url
         self.headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {api_key}"
@@ -21,3 +25,59 @@ class EURIClient:
         except Exception as e:
             print(f"[EURIClient] Error: {e}")
             return None
+
+    def stream_completion(self, prompt: str, model: str):
+        """Yield the completion text piece by piece as the API streams it (SSE).
+
+        The generator returns True only if the stream was seen to finish ([DONE]
+        or a finish_reason) and False if it was cut off, by an error or by the
+        connection simply closing, so callers can tell a partial completion apart.
+        """
+        payload = {
+            "messages": [{"role": "user", "content": prompt}],
+            "model": model,
+            "stream": True
+        }
+        complete = False
+        try:
+            with requests.post(self.base_url, headers=self.headers, json=payload, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        complete = True
+                        break
+                    choices = json.loads(data).get('choices') or [{}]
+                    delta = choices[0].get('delta', {}).get('content')
+                    if delta:
+                        yield delta
+                    if choices[0].get('finish_reason'):
+                        complete = True
+            return complete
+        except Exception as e:
+            print(f"[EURIClient] Streaming error: {e}")
+            return False
+
+    def async_session(self, max_connections: int = 10) -> httpx.AsyncClient:
+        """Pooled async HTTP client for concurrent completions (use as `async with`)"""
+        return httpx.AsyncClient(
+            headers=self.headers,
+            timeout=30,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+
+    async def agenerate_completion(self, session: httpx.AsyncClient, prompt: str, model: str) -> str:
+        """Async variant of generate_completion over a shared session"""
+        payload = {
+            "messages": [{"role": "user", "content": prompt}],
+            "model": model
+        }
+        try:
+            response = await session.post(self.base_url, json=payload)
+            response.raise_for_status()
+            return response.json()['choices'][0]['message']['content']
+        except Exception as e:
+            print(f"[EURIClient] Error: {e}")
+            return None
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import time
+from typing import Optional
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "prompts")
+DEFAULT_TTL = 7 * 24 * 3600          # Seconds before a cached completion expires
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024  # Evict least recently used entries above this size
+EVICT_TO = 0.9                         # ...down to this fraction of it, so a full cache isn't rescanned on every put
+
+class PromptCache:
+    """On-disk, content-addressed cache of LLM completions keyed by prompt + model
+
+    A file's mtime is when it was written (the TTL is judged on it); its atime
+    is set on every hit, so eviction can drop the least recently used first.
+    The cache size is scanned once and then tracked as entries are written, so
+    a put() only walks the directory when the size crosses max_bytes.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None  # Estimated bytes on disk; None until the first scan
+
+    @staticmethod
+    def key(prompt: str, model: str) -> str:
+        return hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        # Fan out into 256 subdirectories so no single directory gets huge
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _expired(self, stat: os.stat_result, now: float) -> bool:
+        return bool(self.ttl) and now - stat.st_mtime > self.ttl
+
+    def get(self, prompt: str, model: str) -> Optional[str]:
+        path = self._path(self.key(prompt, model))
+        now = time.time()
+        try:
+            stat = os.stat(path)
+            if self._expired(stat, now):
+                self._remove(path)
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        # Mark as recently used without touching mtime (the write time)
+        os.utime(path, (now, stat.st_mtime))
+        return entry["response"]
+
+    def put(self, prompt: str, model: str, response: str):
+        key = self.key(prompt, model)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {"created": time.time(), "model": model, "response": response}
+        try:
+            replaced = os.path.getsize(path)
+        except FileNotFoundError:
+            replaced = 0
+        # Write then rename so a concurrent reader never sees a half-written entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        written = os.path.getsize(tmp_path)
+        os.replace(tmp_path, path)
+        if self._size is None:
+            self.evict()
+            return
+        self._size += written - replaced
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def invalidate(self, prompt: str, model: str):
+        path = self._path(self.key(prompt, model))
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return
+        self._remove(path)
+        if self._size is not None:
+            self._size -= size
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        entries = []
+        total = 0
+        now = time.time()
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if self._expired(stat, now):
+                    self._remove(path)
+                    continue
+                entries.append((stat.st_atime, stat.st_size, path))
+                total += stat.st_size
+
+        if total > self.max_bytes:
+            target = self.max_bytes * EVICT_TO
+            for _, size, path in sorted(entries):
+                self._remove(path)
+                total -= size
+                if total <= target:
+                    break
+        self._size = total
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+class CachedLLMClient:
+    """Wraps an EURIClient so identical prompts for the same model are answered from disk"""
+
+    def __init__(self, client, cache: PromptCache):
+        self.client = client
+        self.cache = cache
+
+    def generate_completion(self, prompt: str, model: str) -> str:
+        cached = self.cache.get(prompt, model)
+        if cached is not None:
+            print("[PromptCache] Cache hit")
+            return cached
+        response = self.client.generate_completion(prompt, model)
+        if response:
+            self.cache.put(prompt, model, response)
+        return response
+
+    def stream_completion(self, prompt: str, model: str):
+        cached = self.cache.get(prompt, model)
+        if cached is not None:
+            print("[PromptCache] Cache hit")
+            yield cached
+            return True
+        pieces = []
+        stream = self.client.stream_completion(prompt, model)
+        while True:
+            try:
+                piece = next(stream)
+            except StopIteration as stop:
+                complete = stop.value
+                break
+            pieces.append(piece)
+            yield piece
+        # A stream cut off mid-way must not be replayed from the cache
+        if pieces and complete:
+            self.cache.put(prompt, model, ''.join(pieces))
+        return complete
+
+    def async_session(self, max_connections: int = 10):
+        return self.client.async_session(max_connections)
+
+    async def agenerate_completion(self, session, prompt: str, model: str) -> str:
+        cached = self.cache.get(prompt, model)
+        if cached is not None:
+            return cached
+        response = await self.client.agenerate_completion(session, prompt, model)
+        if response:
+            self.cache.put(prompt, model, response)
+        return response
+
+    def invalidate(self, prompt: str, model: str):
+        """Forget a cached completion, e.g. one that turned out not to parse"""
+        self.cache.invalidate(prompt, model)
@@ -0,0 +1,98 @@
+import json
+from typing import Any, List
+
+_decoder = json.JSONDecoder()
+
+class JsonArrayStreamParser:
+    """Incrementally pull elements out of a JSON array arriving in pieces.
+
+    Text before the opening '[' (markdown fences, chatter) is ignored. Each
+    top-level element is handed to json.loads as soon as its closing bracket
+    arrives, so callers can act on it before the rest of the completion is
+    generated. An element that fails to parse is skipped, and any complete
+    objects nested inside it (e.g. after a missing closing brace) are salvaged.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.finished = False
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.element: List[str] = []
+        self.errors = 0
+
+    def feed(self, text: str) -> List[Any]:
+        """Consume the next piece of text; returns elements completed by it"""
+        done = []
+        for ch in text:
+            if self.finished:
+                break
+            if not self.started:
+                if ch == '[':
+                    self.started = True
+                    self.depth = 1
+                continue
+
+            if self.in_string:
+                self.element.append(ch)
+                if self.escape:
+                    self.escape = False
+                elif ch == '\\':
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                continue
+
+            if self.depth == 1 and ch in ',]':
+                # A scalar element ends at the separator; containers already ended at depth 1
+                self._finish_element(done)
+                if ch == ']':
+                    self.depth = 0
+                    self.finished = True
+                continue
+
+            if ch in '{[':
+                self.depth += 1
+            elif ch in '}]':
+                self.depth -= 1
+            elif ch == '"':
+                self.in_string = True
+            if self.element or not ch.isspace():
+                self.element.append(ch)
+            if self.depth == 1 and ch in '}]':
+                self._finish_element(done)
+        return done
+
+    def close(self) -> List[Any]:
+        """Salvage whatever complete objects are left in a truncated final element"""
+        done = []
+        if self.element:
+            self.errors += 1
+            done.extend(_salvage(''.join(self.element)))
+            self.element = []
+        return done
+
+    def _finish_element(self, done: List[Any]):
+        text = ''.join(self.element).strip()
+        self.element = []
+        if not text:
+            return
+        try:
+            done.append(json.loads(text))
+        except json.JSONDecodeError:
+            self.errors += 1
+            done.extend(_salvage(text[1:]))
+
+def _salvage(text: str) -> List[Any]:
+    """Find complete JSON objects anywhere inside a broken fragment"""
+    found = []
+    pos = text.find('{')
+    while pos != -1:
+        try:
+            obj, end = _decoder.raw_decode(text, pos)
+            found.append(obj)
+            pos = text.find('{', end)
+        except json.JSONDecodeError:
+            pos = text.find('{', pos + 1)
+    return found
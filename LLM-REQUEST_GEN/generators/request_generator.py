@@ -1,5 +1,11 @@
+import asyncio
 import json
-import re
+from generators.json_stream import JsonArrayStreamParser
+from prompts.request_prompt import create_generation_prompt
+
+DEFAULT_CHUNK_SIZE = 25     # Variations requested per LLM call in chunked mode
+DEFAULT_CONCURRENCY = 4     # LLM calls in flight at once
+DEFAULT_RETRIES = 2         # Extra attempts for a chunk that fails or doesn't parse
 
 class RequestGenerator:
     def __init__(self, llm_client):
@@ -7,52 +13,127 @@ class RequestGenerator:
 
     def generate(self, prompt_messages, model):
         """Generate request variations using LLM"""
+        if hasattr(self.llm_client, 'stream_completion'):
+            return list(self.generate_streaming(prompt_messages, model))
         raw_output = self.llm_client.generate_completion(prompt_messages, model)
+        requests = self._parse_output(raw_output)
+        if not requests:
+            self._invalidate_cached(prompt_messages, model)
+        return requests or []
+
+    def generate_streaming(self, prompt_messages, model):
+        """Yield validated requests one by one while the LLM is still streaming its answer"""
+        parser = JsonArrayStreamParser()
+        index = valid = 0
+        for piece in self.llm_client.stream_completion(prompt_messages, model):
+            for request in parser.feed(piece):
+                if self._validate_request(request, index):
+                    valid += 1
+                    yield request
+                index += 1
+        for request in parser.close():
+            if self._validate_request(request, index):
+                valid += 1
+                yield request
+            index += 1
+
+        if parser.errors:
+            print(f"[RequestGenerator] Skipped {parser.errors} malformed element(s) in LLM output")
+        if not parser.started:
+            print("[RequestGenerator] No JSON array found in LLM output")
+        print(f"[RequestGenerator] Generated {valid} valid requests")
+        if not valid:
+            self._invalidate_cached(prompt_messages, model)
+
+    def generate_chunked(self, sample_request, num_variations, model, chunk_size=DEFAULT_CHUNK_SIZE,
+                         concurrency=DEFAULT_CONCURRENCY, retries=DEFAULT_RETRIES, on_batch=None):
+        """Generate a large number of variations as concurrent chunks of `chunk_size`"""
+        return asyncio.run(self.agenerate_chunked(
+            sample_request, num_variations, model, chunk_size, concurrency, retries, on_batch))
+
+    async def agenerate_chunked(self, sample_request, num_variations, model, chunk_size=DEFAULT_CHUNK_SIZE,
+                                concurrency=DEFAULT_CONCURRENCY, retries=DEFAULT_RETRIES, on_batch=None):
+        """Split generation into chunks that run concurrently with per-chunk retries.
 
+        A chunk that keeps failing only loses its own share of the variations.
+        Results are merged and deduplicated by method, URL and body as each chunk
+        finishes; `on_batch(requests)` is called with every chunk's new requests
+        (e.g. to append them to a JSONL corpus straight away).
+        """
+        sizes = [chunk_size] * (num_variations // chunk_size)
+        if num_variations % chunk_size:
+            sizes.append(num_variations % chunk_size)
+        sem = asyncio.Semaphore(concurrency)
+        seen = set()
+        merged = []
+
+        async with self.llm_client.async_session(max_connections=concurrency) as session:
+            async def run_chunk(index, size):
+                prompt = create_generation_prompt(sample_request, size, index, len(sizes))
+                for attempt in range(retries + 1):
+                    async with sem:
+                        raw_output = await self.llm_client.agenerate_completion(session, prompt, model)
+                    batch = self._parse_output(raw_output)
+                    if batch:
+                        unique = self._deduplicate(batch, seen)
+                        merged.extend(unique)
+                        if on_batch and unique:
+                            on_batch(unique)
+                        return
+                    # Don't let a cached bad completion be replayed on the retry
+                    self._invalidate_cached(prompt, model)
+                    if attempt < retries:
+                        await asyncio.sleep(0.5 * 2 ** attempt)
+                print(f"[RequestGenerator] Chunk {index + 1}/{len(sizes)} failed after {retries + 1} attempts")
+
+            await asyncio.gather(*(run_chunk(i, size) for i, size in enumerate(sizes)))
+
+        print(f"[RequestGenerator] Merged {len(merged)} unique requests from {len(sizes)} chunks")
+        return merged
+
+    def _invalidate_cached(self, prompt, model):
+        invalidate = getattr(self.llm_client, 'invalidate', None)
+        if invalidate:
+            invalidate(prompt, model)
+
+    def _deduplicate(self, requests, seen=None):
+        """Drop repeated requests (same method, URL and body), keeping the first"""
+        seen = set() if seen is None else seen
+        unique = []
+        for request in requests:
+            key = (request['method'].upper(), request['url'],
+                   json.dumps(request.get('body'), sort_keys=True, default=str))
+            if key not in seen:
+                seen.add(key)
+                unique.append(request)
+        return unique
+
+    def _parse_output(self, raw_output):
+        """Parse and validate raw LLM output; returns None if nothing usable came back"""
         if not raw_output:
             print("[RequestGenerator] No output received from LLM")
-            return []
+            return None
 
-        try:
-            # Clean the output
-            cleaned = self._clean_llm_output(raw_output)
-            
-            # Parse JSON
-            data = json.loads(cleaned)
-            
-            # Validate structure
-            if not isinstance(data, list):
-                print("[RequestGenerator] Expected list of requests, got:", type(data))
-                return []
-            
-            # Validate each request
-            validated_requests = []
-            for i, request in enumerate(data):
-                if self._validate_request(request, i):
-                    validated_requests.append(request)
-            
-            print(f"[RequestGenerator] Generated {len(validated_requests)} valid requests")
-            return validated_requests
-            
-        except json.JSONDecodeError as e:
-            print(f"[RequestGenerator] JSON parsing error: {e}")
+        # The incremental parser also handles whole outputs: it skips markdown and
+        # chatter around the array and drops malformed elements instead of the batch
+        parser = JsonArrayStreamParser()
+        data = parser.feed(raw_output) + parser.close()
+
+        if not parser.started:
+            print("[RequestGenerator] Expected list of requests, no JSON array found")
             print(f"[RequestGenerator] Raw output preview: {raw_output[:200]}...")
-            return []
+            return None
+        if parser.errors:
+            print(f"[RequestGenerator] Skipped {parser.errors} malformed element(s) in LLM output")
 
-    def _clean_llm_output(self, raw_output):
-        """Clean LLM output to extract JSON"""
-        # Remove markdown code blocks
-        cleaned = re.sub(r'```(?:json)?\s*', '', raw_output)
-        cleaned = re.sub(r'```\s*$', '', cleaned, flags=re.MULTILINE)
-        
-        # Remove any text before the first '[' and after the last ']'
-        start_idx = cleaned.find('[')
-        end_idx = cleaned.rfind(']')
-        
-        if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
-            cleaned = cleaned[start_idx:end_idx + 1]
-        
-        return cleaned.strip()
+        # Validate each request
+        validated_requests = []
+        for i, request in enumerate(data):
+            if self._validate_request(request, i):
+                validated_requests.append(request)
+
+        print(f"[RequestGenerator] Generated {len(validated_requests)} valid requests")
+        return validated_requests or None
 
     def _validate_request(self, request, index):
         """Validate individual request structure"""
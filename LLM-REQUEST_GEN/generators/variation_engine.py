@@ -0,0 +1,279 @@
+import random
+import re
+import uuid
+from datetime import date, datetime, timedelta
+from itertools import count
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs, quote, quote_plus, unquote
+from parser.endpoint_parser import EndpointParser
+
+FIRST_NAMES = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "David",
+               "Elizabeth", "Aarav", "Priya", "Wei", "Mei", "Carlos", "Sofia", "Omar", "Fatima", "Yuki", "Lars"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Sharma",
+              "Patel", "Chen", "Wang", "Rodriguez", "Martinez", "Hassan", "Tanaka", "Nielsen", "Kim", "Singh"]
+DOMAINS = ["example.com", "example.org", "test.io", "mail.test", "corp.example"]
+WORDS = ["alpha", "bravo", "update", "release", "report", "summary", "draft", "review", "launch", "notice",
+         "event", "feature", "sample", "account", "order", "invoice", "ticket", "status", "note", "item"]
+# Field names whose values are usually one of a small set
+ENUM_VOCAB = {
+    "status": ["active", "inactive", "pending", "archived"],
+    "state": ["open", "closed", "pending"],
+    "sort": ["asc", "desc"],
+    "order": ["asc", "desc"],
+    "role": ["admin", "user", "guest", "editor"],
+    "type": ["basic", "premium", "trial"],
+    "category": ["books", "electronics", "clothing", "home", "sports"],
+    "lang": ["en", "es", "fr", "de", "hi"],
+    "language": ["en", "es", "fr", "de", "hi"],
+    "country": ["US", "IN", "GB", "DE", "JP", "BR"],
+    "currency": ["USD", "EUR", "INR", "GBP", "JPY"],
+    "gender": ["female", "male", "other"],
+    "priority": ["low", "medium", "high"],
+}
+
+_EMAIL = re.compile(r'^[^@\s]+@[^@\s]+\.[a-zA-Z]{2,}$')
+_UUID = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_DATETIME = re.compile(r'^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?$')
+_INT = re.compile(r'^-?\d+$')
+_FLOAT = re.compile(r'^-?\d+\.\d+$')
+
+def infer_kind(name: str, value: Any) -> str:
+    """Guess what kind of value a field holds from its name and sample value"""
+    lname = name.lower()
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    if not isinstance(value, str):
+        return "const"
+    if _INT.match(value):
+        return "int_str"
+    if _FLOAT.match(value):
+        return "float_str"
+    if value.lower() in ("true", "false"):
+        return "bool_str"
+    if _EMAIL.match(value) or lname.endswith("email"):
+        return "email"
+    if _UUID.match(value):
+        return "uuid"
+    if _DATE.match(value):
+        return "date"
+    if _DATETIME.match(value):
+        return "datetime"
+    if lname in ENUM_VOCAB:
+        return "enum"
+    if "name" in lname:
+        return "name"
+    return "string"
+
+class VariationEngine:
+    """Deterministic, schema-driven request variations without an LLM round-trip.
+
+    Each variable field (path variables, query parameters and body leaves) gets
+    a pool of `cardinality` values inferred from the sample; requests are then
+    assembled by picking from the pools with a seeded RNG, so the same seed
+    always produces the same corpus.
+    """
+
+    def __init__(self, sample_request: Dict[str, Any], seed: int = 0, cardinality: int = 1000):
+        self.sample_request = sample_request
+        self.seed = seed
+        self.cardinality = cardinality
+        self.method = sample_request.get('method', 'GET').upper()
+        self.headers = sample_request.get('headers') or {}
+        self.body = sample_request.get('body')
+
+        base_url = sample_request.get('base_url', '')
+        endpoint = sample_request.get('endpoint', '')
+        _, path_var_names, endpoint_query = EndpointParser.parse_endpoint(endpoint)
+        path_vars = {name: sample_request.get('path_variables', {}).get(name, '1') for name in path_var_names}
+        query_params = {**endpoint_query, **(sample_request.get('query_parameters') or {})}
+
+        # Fields are ("path"|"query", name) or ("body", key path tuple)
+        self.fields: List[Tuple[str, Any]] = []
+        samples: List[Tuple[str, Any]] = []
+        for name, value in path_vars.items():
+            self.fields.append(("path", name))
+            samples.append((name, value))
+        for name, value in query_params.items():
+            self.fields.append(("query", name))
+            samples.append((name, value))
+        if isinstance(self.body, (dict, list)):
+            for path, value in _leaves(self.body):
+                self.fields.append(("body", path))
+                samples.append((str(path[-1]) if path else "body", value))
+
+        self.kinds = [infer_kind(name, value) for name, value in samples]
+        rng = random.Random(seed)
+        self.pools = [_build_pool(kind, name, value, cardinality, rng)
+                      for kind, (name, value) in zip(self.kinds, samples)]
+
+        self._url_parts = self._compile_url(base_url, endpoint, path_vars, query_params)
+        self._path_regex = self._compile_path_regex(base_url, endpoint)
+
+    def _compile_url(self, base_url, endpoint, path_vars, query_params):
+        # Render the URL once through build_sample_url with sentinel values, then split
+        # on the sentinels so each request only has to join strings
+        slot_of = {}
+        for i, (where, name) in enumerate(self.fields):
+            if where in ("path", "query"):
+                slot_of[(where, name)] = i
+        sentinel_path = {name: f"\x00{slot_of[('path', name)]}\x00" for name in path_vars}
+        sentinel_query = {name: f"\x00{slot_of[('query', name)]}\x00" for name in query_params}
+        template = EndpointParser.build_sample_url(base_url, endpoint, sentinel_path, sentinel_query)
+        parts = template.split("\x00")
+        # Odd positions are slot indexes, even positions literal text
+        return [int(p) if i % 2 else p for i, p in enumerate(parts)]
+
+    def _compile_path_regex(self, base_url, endpoint):
+        path = urlparse(base_url.rstrip('/') + '/' + endpoint.lstrip('/')).path
+        pattern = re.sub(r'\\\{([^}]+)\\\}', lambda m: f"(?P<{_group(m.group(1))}>[^/]+)", re.escape(path))
+        return re.compile(f"^{pattern}$")
+
+    def seed_pools(self, requests: List[Dict[str, Any]]) -> int:
+        """Add values seen in (e.g. LLM-generated) requests to the pools; returns values added"""
+        added = 0
+        index = {field: i for i, field in enumerate(self.fields)}
+        for request in requests:
+            parsed = urlparse(request.get('url', ''))
+            match = self._path_regex.match(parsed.path)
+            observed = []
+            if match:
+                observed += [(("path", _ungroup(k)), unquote(v)) for k, v in match.groupdict().items()]
+            observed += [(("query", k), v[0]) for k, v in parse_qs(parsed.query, keep_blank_values=True).items()]
+            if isinstance(request.get('body'), (dict, list)):
+                observed += [(("body", path), value) for path, value in _leaves(request['body'])]
+            for field, value in observed:
+                i = index.get(field)
+                if i is not None and value not in self.pools[i]:
+                    self.pools[i].append(value)
+                    added += 1
+        return added
+
+    def generate(self, num_variations: int) -> List[Dict[str, Any]]:
+        return list(self.iter_requests(num_variations))
+
+    def iter_requests(self, num_variations: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yield request dicts in the generator's output format (endless if num_variations is None)"""
+        rng = random.Random(self.seed + 1)
+        pools = self.pools
+        url_parts = self._url_parts
+        slot_of = {path: i for i, (where, path) in enumerate(self.fields) if where == "body"}
+        build_body = _body_builder(self.body, slot_of) if isinstance(self.body, (dict, list)) else None
+        has_body = self.body is not None
+        counter = range(num_variations) if num_variations is not None else count()
+        # URL slots are percent-encoded once per pool value, not once per request
+        encoded = [[_encode(where, value) for value in pool] if where in ("path", "query") else None
+                   for (where, _), pool in zip(self.fields, pools)]
+        sizes = [len(pool) for pool in pools]
+        randrange = rng.randrange
+
+        for _ in counter:
+            picks = [randrange(size) for size in sizes]
+            values = [pool[i] for pool, i in zip(pools, picks)]
+            url = "".join(encoded[p][picks[p]] if i % 2 else p for i, p in enumerate(url_parts))
+            request = {"method": self.method, "url": url, "headers": dict(self.headers)}
+            if has_body:
+                request["body"] = build_body(values) if build_body else self.body
+            yield request
+
+def _encode(where, value):
+    # Path segments must not introduce a "/", query values must not introduce "&" or "#"
+    return quote(str(value), safe="") if where == "path" else quote_plus(str(value))
+
+def _leaves(obj, prefix=()):
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            yield from _leaves(value, prefix + (key,))
+    elif isinstance(obj, list) and obj:
+        for i, value in enumerate(obj):
+            yield from _leaves(value, prefix + (i,))
+    else:
+        yield prefix, obj
+
+def _body_builder(obj, slot_of, prefix=()):
+    """Compile the body structure into a function building a fresh body from slot values"""
+    if isinstance(obj, dict):
+        items = [(key, _body_builder(value, slot_of, prefix + (key,))) for key, value in obj.items()]
+        return lambda values: {key: build(values) for key, build in items}
+    if isinstance(obj, list) and obj:
+        elements = [_body_builder(value, slot_of, prefix + (i,)) for i, value in enumerate(obj)]
+        return lambda values: [build(values) for build in elements]
+    if prefix in slot_of:
+        return itemgetter(slot_of[prefix])
+    # Empty containers are copied so requests never share a mutable object
+    return lambda values: type(obj)() if isinstance(obj, (dict, list)) else obj
+
+def _group(name):
+    # Regex group names must be identifiers
+    return "v_" + re.sub(r'\W', '_', name)
+
+def _ungroup(group):
+    return group[2:]
+
+def _build_pool(kind, name, sample, size, rng):
+    lname = name.lower()
+    if kind in ("null", "const"):
+        return [sample]
+    if kind == "bool":
+        return [True, False]
+    if kind == "bool_str":
+        return ["true", "false"]
+    if kind == "enum":
+        return list(ENUM_VOCAB[lname])
+    if kind in ("int", "int_str"):
+        n = int(sample)
+        high = max(abs(n) * 10, 1000)
+        # Ids and counts stay non-negative; only a negative sample allows negatives
+        low = -high if n < 0 else min(n, 1)
+        values = rng.sample(range(low, high + 1), min(size, high - low + 1))
+        return [str(v) for v in values] if kind == "int_str" else values
+    if kind in ("float", "float_str"):
+        f = float(sample)
+        decimals = len(str(sample).split('.')[-1]) if '.' in str(sample) else 2
+        high = max(abs(f) * 10, 100.0)
+        values = [round(rng.uniform(0 if f >= 0 else -high, high), decimals) for _ in range(size)]
+        return [str(v) for v in values] if kind == "float_str" else values
+    if kind == "email":
+        return [f"{rng.choice(FIRST_NAMES).lower()}.{rng.choice(LAST_NAMES).lower()}{rng.randint(1, 9999)}"
+                f"@{rng.choice(DOMAINS)}" for _ in range(size)]
+    if kind == "uuid":
+        return [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(size)]
+    # Samples that only look like dates (e.g. "2024-02-30") fall through to the text pool
+    if kind == "date":
+        try:
+            base = date.fromisoformat(sample)
+            return [(base + timedelta(days=rng.randint(-365, 365))).isoformat() for _ in range(size)]
+        except ValueError:
+            pass
+    if kind == "datetime":
+        try:
+            base = datetime.fromisoformat(sample.replace("Z", "+00:00"))
+            return [(base + timedelta(seconds=rng.randint(-31_536_000, 31_536_000))).isoformat() for _ in range(size)]
+        except ValueError:
+            pass
+    if kind == "name":
+        if "first" in lname:
+            return list(FIRST_NAMES)
+        if "last" in lname or "surname" in lname:
+            return list(LAST_NAMES)
+        if "user" in lname:
+            return [f"{rng.choice(FIRST_NAMES).lower()}{rng.choice(LAST_NAMES).lower()}{rng.randint(1, 999)}"
+                    for _ in range(size)]
+        return [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(size)]
+    # Free text: keep roughly the sample's length in words, and its casing
+    words = max(len(sample.split()), 1)
+    return [_match_case(" ".join(rng.choice(WORDS) for _ in range(words)), sample) for _ in range(size)]
+
+def _match_case(text, sample):
+    if sample.isupper():
+        return text.upper()
+    if sample[:1].isupper():
+        return text.capitalize()
+    return text
@@ -1,11 +1,23 @@
+import argparse
 import os
 from dotenv import load_dotenv
-from client.euri_client import EURIClient
+from client.euri_client import EURIClient, DEFAULT_BASE_URL
+from client.prompt_cache import PromptCache, CachedLLMClient, DEFAULT_CACHE_DIR, DEFAULT_TTL
 from cli.interactive_cli import run_cli
 
 load_dotenv()
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="LLM-powered load testing request generator")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always call the LLM instead of reusing cached completions")
+    parser.add_argument("--cache-dir", default=os.getenv("EURI_CACHE_DIR", DEFAULT_CACHE_DIR))
+    parser.add_argument("--cache-ttl", type=float, default=float(os.getenv("EURI_CACHE_TTL", DEFAULT_TTL)),
+                        help="Seconds before a cached completion expires")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
     api_key = os.getenv("EURI_API_KEY") or input("Enter EURI API key: ").strip()
     model = os.getenv("EURI_MODEL", "gpt-4.1-nano")
 
@@ -13,7 +25,10 @@ def main():
         print("❌ API key is required")
         return
 
-    client = EURIClient(api_key)
+    # EURI_BASE_URL can point at a local stub server instead of the real API
+    client = EURIClient(api_key, os.getenv("EURI_BASE_URL", DEFAULT_BASE_URL))
+    if not (args.no_cache or os.getenv("EURI_NO_CACHE")):
+        client = CachedLLMClient(client, PromptCache(args.cache_dir, args.cache_ttl))
     run_cli(client, model)
 
 if __name__ == "__main__":
@@ -1,8 +1,13 @@
 import json
 from typing import Dict, Any, Optional
 
-def create_generation_prompt(sample_request: Dict[str, Any], num_variations: int = 10) -> str:
-    """Create a strict prompt for generating request variations"""
+def create_generation_prompt(sample_request: Dict[str, Any], num_variations: int = 10,
+                             batch_index: Optional[int] = None, batch_count: Optional[int] = None) -> str:
+    """Create a strict prompt for generating request variations
+
+    When generating in chunks, batch_index/batch_count tell the LLM which batch this
+    is so parallel batches don't all return the same values.
+    """
     
     method = sample_request.get('method', 'GET')
     base_url = sample_request.get('base_url', '')
@@ -87,6 +92,10 @@ Generate realistic variations for:"""
     if body is not None:
         prompt += f"\n- Body data values (maintain structure)"
 
+    if batch_index is not None and batch_count:
+        prompt += (f"\n\nThis is batch {batch_index + 1} of {batch_count} generated in parallel. "
+                   f"Pick values that other batches are unlikely to choose (e.g. different ID ranges and names).")
+
     prompt += f"\n\nGenerate {num_variations} variations now:"
 
     return prompt
\ No newline at end of file
@@ -0,0 +1,92 @@
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import pytest
+
+# Modules import each other from the LLM-REQUEST_GEN root (`from generators... import`).
+# Run from LLM-REQUEST_GEN: `python -m pytest tests`
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class StubLLM:
+    """Local stand-in for the chat completions API.
+
+    Every completion is a JSON array of `per_call` requests with URLs numbered
+    by a global counter, plus one URL shared by all calls (so merging has
+    something to deduplicate). Calls listed in `fail_calls` get a 500, and
+    streamed calls listed in `cut_calls` drop the connection mid-array.
+    """
+
+    def __init__(self, per_call=3):
+        self.per_call = per_call
+        self.calls = 0
+        self.fail_calls = set()
+        self.cut_calls = set()
+        self.lock = threading.Lock()
+        self.next_id = 0
+
+    def completion(self):
+        with self.lock:
+            ids = range(self.next_id, self.next_id + self.per_call)
+            self.next_id += self.per_call
+        requests = [{"method": "GET", "url": f"https://api.example.com/users/{i}"} for i in ids]
+        requests.append({"method": "GET", "url": "https://api.example.com/users/shared"})
+        return "```json\n" + json.dumps(requests) + "\n```"
+
+
+@pytest.fixture
+def stub_llm():
+    stub = StubLLM()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with stub.lock:
+                stub.calls += 1
+                call = stub.calls
+            if call in stub.fail_calls:
+                self._send(500, b'{"error": "overloaded"}')
+                return
+            text = stub.completion()
+            if not payload.get("stream"):
+                self._send(200, json.dumps({"choices": [{"message": {"content": text}}]}).encode())
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            pieces = [text[i:i + 16] for i in range(0, len(text), 16)]
+            if call in stub.cut_calls:
+                pieces = pieces[:len(pieces) // 2]
+            for piece in pieces:
+                event = {"choices": [{"delta": {"content": piece}}]}
+                self.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+            if call not in stub.cut_calls:
+                self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+            if call in stub.cut_calls:
+                # Abort without a clean end of stream
+                self.connection.shutdown(2)
+            self.close_connection = True
+
+        def _send(self, status, body):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    stub.url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    yield stub
+    server.shutdown()
+    server.server_close()
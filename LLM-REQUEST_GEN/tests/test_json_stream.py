@@ -0,0 +1,50 @@
+from generators.json_stream import JsonArrayStreamParser
+
+
+def parse(pieces):
+    parser = JsonArrayStreamParser()
+    elements = []
+    for piece in pieces:
+        elements.extend(parser.feed(piece))
+    return parser, elements + parser.close()
+
+
+def test_elements_arrive_as_they_complete():
+    parser = JsonArrayStreamParser()
+    assert parser.feed('Sure! ```json\n[{"a": 1}, {"b": "x]}') == [{"a": 1}]
+    assert parser.feed('"}, 3') == [{"b": "x]}"}]
+    assert parser.feed(']```') == [3]
+    assert parser.finished
+
+
+def test_split_anywhere():
+    text = '[{"url": "/a", "body": {"q": "a, \\"b\\""}}, [1, 2], "s", null]'
+    for size in (1, 2, 5):
+        _, elements = parse([text[i:i + size] for i in range(0, len(text), size)])
+        assert elements == [{"url": "/a", "body": {"q": 'a, "b"'}}, [1, 2], "s", None]
+
+
+def test_malformed_element_is_skipped():
+    parser, elements = parse(['[{"a": 1}, {"b": 2,}, {"c": 3}]'])
+    assert elements == [{"a": 1}, {"c": 3}]
+    assert parser.errors == 1
+
+
+def test_nested_objects_salvaged_from_broken_element():
+    # Missing closing brace swallows the next element; both inner objects survive
+    parser, elements = parse(['[{"x": {"a": 1}, {"b": 2}, {"c": 3}]'])
+    assert {"a": 1} in elements and {"b": 2} in elements
+    assert parser.errors >= 1
+
+
+def test_truncated_stream_keeps_complete_elements():
+    parser, elements = parse(['[{"a": 1}, {"b": 2}, {"c": '])
+    assert elements == [{"a": 1}, {"b": 2}]
+    assert not parser.finished
+    assert parser.errors == 1
+
+
+def test_no_array():
+    parser, elements = parse(["I cannot help with that."])
+    assert elements == []
+    assert not parser.started
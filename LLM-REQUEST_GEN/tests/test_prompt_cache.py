@@ -0,0 +1,38 @@
+import os
+import time
+from client.prompt_cache import PromptCache
+
+
+def test_get_put_invalidate(tmp_path):
+    cache = PromptCache(str(tmp_path))
+    assert cache.get("p", "m") is None
+    cache.put("p", "m", "answer")
+    assert cache.get("p", "m") == "answer"
+    assert cache.get("p", "other-model") is None
+    cache.invalidate("p", "m")
+    assert cache.get("p", "m") is None
+
+
+def test_ttl_is_judged_on_write_time(tmp_path):
+    cache = PromptCache(str(tmp_path), ttl=60)
+    cache.put("p", "m", "answer")
+    path = cache._path(cache.key("p", "m"))
+    old = time.time() - 120
+    os.utime(path, (time.time(), old))
+    # A hit refreshes recency (atime) but must not extend the entry's life
+    assert cache.get("p", "m") is None
+
+
+def test_hits_keep_entries_from_eviction(tmp_path):
+    cache = PromptCache(str(tmp_path), ttl=0, max_bytes=2000)
+    for i in range(7):
+        cache.put(f"p{i}", "m", "x" * 200)
+        path = cache._path(cache.key(f"p{i}", "m"))
+        os.utime(path, (1000 + i, 1000 + i))
+    cache.get("p0", "m")
+    for i in range(7, 10):
+        cache.put(f"p{i}", "m", "x" * 200)
+    kept = [i for i in range(10) if cache.get(f"p{i}", "m") is not None]
+    assert 0 in kept and 1 not in kept
+    assert 9 in kept
+    assert sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(tmp_path) for f in files) <= 2000
@@ -0,0 +1,24 @@
+from client.euri_client import EURIClient
+from generators.request_generator import RequestGenerator
+
+SAMPLE = {"method": "GET", "url": "https://api.example.com/users/1"}
+
+
+def test_chunked_generation_merges_and_deduplicates(stub_llm):
+    generator = RequestGenerator(EURIClient("key", stub_llm.url))
+    batches = []
+    requests = generator.generate_chunked(SAMPLE, 9, "model", chunk_size=3, concurrency=3, on_batch=batches.append)
+    urls = [r["url"] for r in requests]
+    # Three chunks of three unique URLs, plus the shared URL kept once
+    assert len(urls) == 10 == len(set(urls))
+    assert sum(len(batch) for batch in batches) == 10
+    assert stub_llm.calls == 3
+
+
+def test_failed_chunk_is_retried(stub_llm):
+    stub_llm.fail_calls = {1}
+    generator = RequestGenerator(EURIClient("key", stub_llm.url))
+    requests = generator.generate_chunked(SAMPLE, 6, "model", chunk_size=3, concurrency=1, retries=1)
+    assert stub_llm.calls == 3
+    assert len(requests) == 7
+
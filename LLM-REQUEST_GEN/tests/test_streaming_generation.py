@@ -0,0 +1,23 @@
+from client.euri_client import EURIClient
+from client.prompt_cache import CachedLLMClient, PromptCache
+from generators.request_generator import RequestGenerator
+
+
+def test_streaming_generation(stub_llm):
+    generator = RequestGenerator(EURIClient("key", stub_llm.url))
+    requests = list(generator.generate_streaming("prompt", "model"))
+    assert [r["url"] for r in requests][-1] == "https://api.example.com/users/shared"
+    assert len(requests) == 4
+
+
+def test_cut_off_stream_is_not_cached(stub_llm, tmp_path):
+    stub_llm.cut_calls = {1}
+    cache = PromptCache(str(tmp_path))
+    client = CachedLLMClient(EURIClient("key", stub_llm.url), cache)
+    partial = ''.join(client.stream_completion("prompt", "model"))
+    assert partial and cache.get("prompt", "model") is None
+    complete = ''.join(client.stream_completion("prompt", "model"))
+    assert cache.get("prompt", "model") == complete
+    # Served from disk now
+    assert ''.join(client.stream_completion("prompt", "model")) == complete
+    assert stub_llm.calls == 2
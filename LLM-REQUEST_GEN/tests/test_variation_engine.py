@@ -0,0 +1,69 @@
+from urllib.parse import parse_qs, unquote, urlsplit
+from generators.variation_engine import VariationEngine, infer_kind
+
+SAMPLE = {
+    "method": "post",
+    "base_url": "https://api.example.com",
+    "endpoint": "/users/{userId}/posts/{slug}?q=two words&limit=10",
+    "path_variables": {"userId": "42", "slug": "hello world"},
+    "headers": {"Authorization": "Bearer x"},
+    "body": {"id": 0, "title": "Launch notes", "tags": ["release"], "email": "a@b.io", "due": "2024-02-30"},
+}
+
+
+def test_same_seed_same_requests():
+    first = VariationEngine(SAMPLE, seed=3, cardinality=50).generate(200)
+    second = VariationEngine(SAMPLE, seed=3, cardinality=50).generate(200)
+    assert first == second
+    assert first != VariationEngine(SAMPLE, seed=4, cardinality=50).generate(200)
+
+
+def test_url_shape():
+    engine = VariationEngine(SAMPLE, seed=1, cardinality=50)
+    for request in engine.generate(100):
+        parts = urlsplit(request["url"])
+        assert parts.scheme == "https" and parts.netloc == "api.example.com"
+        segments = parts.path.split("/")
+        assert len(segments) == 5 and segments[1] == "users" and segments[3] == "posts"
+        assert " " not in request["url"]
+        query = parse_qs(parts.query)
+        assert set(query) == {"q", "limit"}
+        assert len(query["q"][0].split(" ")) == 2
+        assert int(query["limit"][0]) >= 0
+
+
+def test_values_with_url_syntax_are_encoded():
+    engine = VariationEngine(SAMPLE, seed=1, cardinality=5)
+    slot = engine.fields.index(("path", "slug"))
+    query = engine.fields.index(("query", "q"))
+    # Seeded values are stored decoded
+    engine.seed_pools([{"url": "https://api.example.com/users/7/posts/a%2Fb%3Fc?q=x%26y%23z&limit=1"}])
+    assert "a/b?c" in engine.pools[slot]
+    assert "x&y#z" in engine.pools[query]
+    engine.pools[slot] = ["a/b?c"]
+    engine.pools[query] = ["x&y#z"]
+    parts = urlsplit(engine.generate(1)[0]["url"])
+    assert unquote(parts.path.split("/")[-1]) == "a/b?c"
+    assert parse_qs(parts.query)["q"] == ["x&y#z"]
+
+
+def test_body_values_keep_kind_and_casing():
+    engine = VariationEngine(SAMPLE, seed=2, cardinality=100)
+    bodies = [request["body"] for request in engine.generate(300)]
+    assert all(body["id"] >= 0 for body in bodies)
+    assert all(body["title"][0].isupper() for body in bodies)
+    # Lower-case sample tags stay lower case
+    assert all(body["tags"][0] == body["tags"][0].lower() for body in bodies)
+    assert all("@" in body["email"] for body in bodies)
+    assert engine.kinds[engine.fields.index(("body", ("due",)))] == "date"
+    # Bodies are fresh objects, never shared between requests
+    assert bodies[0] is not bodies[1] and bodies[0]["tags"] is not bodies[1]["tags"]
+
+
+def test_infer_kind():
+    assert infer_kind("id", 5) == "int"
+    assert infer_kind("userId", "42") == "int_str"
+    assert infer_kind("email", "x@y.io") == "email"
+    assert infer_kind("status", "active") == "enum"
+    assert infer_kind("created", "2024-01-01T10:00:00Z") == "datetime"
+    assert infer_kind("note", "hello") == "string"
@@ -1,7 +1,10 @@
+import gzip
 import json
 import os
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
+
+JSONL_SUFFIXES = ('.jsonl', '.jsonl.gz', '.jsonl.zst')
 
 def save_requests(requests: List[Dict[str, Any]], filename: str = None) -> str:
     """Save generated requests to a JSON file with metadata"""
@@ -14,6 +17,14 @@ def save_requests(requests: List[Dict[str, Any]], filename: str = None) -> str:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"requests_{timestamp}.json"
     
+    # JSONL corpora are appended to rather than rewritten
+    if filename.endswith(JSONL_SUFFIXES):
+        filepath = append_requests_jsonl(requests, filename)
+        if filepath:
+            print("📊 Generation Statistics:")
+            _print_stats(_get_request_stats(requests))
+        return filepath
+
     # Ensure .json extension
     if not filename.endswith('.json'):
         filename += '.json'
@@ -45,7 +56,9 @@ def save_requests(requests: List[Dict[str, Any]], filename: str = None) -> str:
         return None
 
 def load_requests(filepath: str) -> List[Dict[str, Any]]:
-    """Load requests from a JSON file"""
+    """Load requests from a JSON file (or a JSONL corpus)"""
+    if filepath.endswith(JSONL_SUFFIXES):
+        return list(iter_requests_jsonl(filepath))
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             data = json.load(f)
@@ -69,6 +82,79 @@ def load_requests(filepath: str) -> List[Dict[str, Any]]:
         print(f"❌ Error loading file: {e}")
         return []
 
+def _open_jsonl(filepath: str, mode: str):
+    """Open a JSONL corpus as text, transparently handling .gz and .zst compression"""
+    if filepath.endswith('.gz'):
+        return gzip.open(filepath, mode + 't', encoding='utf-8')
+    if filepath.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("Reading/writing .zst corpora needs the 'zstandard' package (pip install zstandard)")
+        return zstandard.open(filepath, mode + 't', encoding='utf-8')
+    return open(filepath, mode, encoding='utf-8')
+
+def metadata_path(filepath: str) -> str:
+    """Sidecar metadata file for a JSONL corpus (requests.jsonl.gz -> requests.meta.json)"""
+    for suffix in JSONL_SUFFIXES[::-1]:
+        if filepath.endswith(suffix):
+            return filepath[:-len(suffix)] + '.meta.json'
+    return filepath + '.meta.json'
+
+def append_requests_jsonl(requests: List[Dict[str, Any]], filename: str) -> Optional[str]:
+    """Append requests to a JSONL corpus (one request per line) and update its sidecar metadata
+
+    Appending keeps memory flat and lets batches be written as soon as they are generated.
+    gzip/zstd appends add a new compressed member/frame, which readers handle transparently.
+    """
+    os.makedirs("generated", exist_ok=True)
+    filepath = filename if os.path.dirname(filename) else os.path.join("generated", filename)
+
+    try:
+        with _open_jsonl(filepath, 'a') as f:
+            for request in requests:
+                f.write(json.dumps(request, ensure_ascii=False, separators=(',', ':')) + '\n')
+        _update_jsonl_metadata(filepath, requests)
+        return filepath
+    except Exception as e:
+        print(f"❌ Error appending to corpus: {e}")
+        return None
+
+def _update_jsonl_metadata(filepath: str, requests: List[Dict[str, Any]]):
+    meta_file = metadata_path(filepath)
+    now = datetime.now().isoformat()
+    try:
+        with open(meta_file, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        metadata = {"format": "jsonl", "generated_at": now, "total_requests": 0, "batches": 0,
+                    "methods": {}, "has_headers": 0, "has_body": 0}
+
+    # Only additive stats are kept, so appending never needs to re-read the corpus
+    metadata["updated_at"] = now
+    metadata["total_requests"] += len(requests)
+    metadata["batches"] += 1
+    for request in requests:
+        method = request.get('method', 'UNKNOWN').upper()
+        metadata["methods"][method] = metadata["methods"].get(method, 0) + 1
+        if request.get('headers'):
+            metadata["has_headers"] += 1
+        if request.get('body') is not None:
+            metadata["has_body"] += 1
+
+    tmp_file = meta_file + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(tmp_file, meta_file)
+
+def iter_requests_jsonl(filepath: str) -> Iterator[Dict[str, Any]]:
+    """Stream requests from a JSONL corpus one line at a time"""
+    with _open_jsonl(filepath, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
 def _get_request_stats(requests: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Calculate statistics for generated requests"""
     if not requests:
@@ -144,7 +230,8 @@ def list_generated_files():
         print("📂 No generated files directory found")
         return []
     
-    files = [f for f in os.listdir(generated_dir) if f.endswith('.json')]
+    files = [f for f in os.listdir(generated_dir)
+             if (f.endswith('.json') and not f.endswith('.meta.json')) or f.endswith(JSONL_SUFFIXES)]
     
     if not files:
         print("📂 No generated files found")
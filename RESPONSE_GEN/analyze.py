@@ -0,0 +1,193 @@
+"""Post-hoc analysis of result logs written with --result-log.
+
+    python analyze.py summary run.rlog [run.w1.rlog ...] [--window 10]
+    python analyze.py diff base.rlog new.rlog [--alpha 0.05]
+
+"summary" prints request rate, error rate and latency percentiles for every
+time window of a run. "diff" compares two runs overall and per endpoint: the
+latency shift (percentiles, plus Welch's t-test on the means) and the error
+rate change (two-proportion z-test). Only first attempts are counted; an
+error is a failed request or a 5xx. Several files given for one side (e.g.
+the per-worker logs of a multi-process run) are read as one run.
+"""
+import argparse
+import math
+from histogram import Histogram
+from resultlog import ResultLogReader
+
+
+class Stats:
+    """Counts, latency histogram and running moments for one run, window or endpoint."""
+
+    __slots__ = ("requests", "errors", "latency", "total", "squares")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.latency = Histogram()
+        self.total = 0.0
+        self.squares = 0.0
+
+    def add(self, status, latency):
+        self.requests += 1
+        if status == 0 or status >= 500:
+            self.errors += 1
+        if latency == latency:  # NaN when there was no response
+            self.latency.record(latency)
+            self.total += latency
+            self.squares += latency * latency
+
+    @property
+    def error_rate(self):
+        return self.errors / self.requests if self.requests else 0.0
+
+    def mean(self):
+        n = self.latency.count
+        return self.total / n if n else 0.0
+
+    def variance(self):
+        n = self.latency.count
+        if n < 2:
+            return 0.0
+        return max((self.squares - self.total * self.total / n) / (n - 1), 0.0)
+
+
+def _first_attempts(paths):
+    """Yield (time, endpoint name, status, latency) for every first attempt in the logs."""
+    for path in paths:
+        reader = ResultLogReader(path)
+        try:
+            names = reader.endpoints
+            for block in reader.blocks():
+                times, endpoints, statuses = block["time"], block["endpoint"], block["status"]
+                latencies, attempts = block["latency"], block["attempt"]
+                for i in range(len(times)):
+                    if not attempts[i]:
+                        yield times[i], names[endpoints[i]], statuses[i], latencies[i]
+        finally:
+            reader.close()
+
+
+def load_run(paths):
+    overall = Stats()
+    endpoints = {}
+    for _, endpoint, status, latency in _first_attempts(paths):
+        overall.add(status, latency)
+        stats = endpoints.get(endpoint)
+        if stats is None:
+            stats = endpoints[endpoint] = Stats()
+        stats.add(status, latency)
+    return overall, endpoints
+
+
+def windowed(paths, window):
+    """{window index: Stats} keyed by seconds since the first request // window."""
+    # Two passes over the mmap'd logs rather than holding every row in memory
+    start = min((row[0] for row in _first_attempts(paths)), default=0.0)
+    windows = {}
+    for sent_at, _, status, latency in _first_attempts(paths):
+        key = int((sent_at - start) // window)
+        stats = windows.get(key)
+        if stats is None:
+            stats = windows[key] = Stats()
+        stats.add(status, latency)
+    return windows
+
+
+def _p_two_sided(z):
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+def error_rate_test(base, new):
+    """Two-proportion z-test: (z, p) for the change in error rate."""
+    pooled = (base.errors + new.errors) / (base.requests + new.requests)
+    se = math.sqrt(pooled * (1 - pooled) * (1 / base.requests + 1 / new.requests))
+    if se == 0:
+        return 0.0, 1.0
+    z = (new.error_rate - base.error_rate) / se
+    return z, _p_two_sided(z)
+
+
+def latency_test(base, new):
+    """Welch's t-test on mean latency, normal approximation (runs have thousands of samples): (t, p)."""
+    nb, nn = base.latency.count, new.latency.count
+    if nb < 2 or nn < 2:
+        return 0.0, 1.0
+    se = math.sqrt(base.variance() / nb + new.variance() / nn)
+    if se == 0:
+        return 0.0, 1.0
+    t = (new.mean() - base.mean()) / se
+    return t, _p_two_sided(t)
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:.1f}ms"
+
+
+def print_windows(windows, window):
+    print("\n🕒 Windowed Results")
+    print("-------------------")
+    print(f"{'t (s)':>8} {'req/s':>9} {'errors':>8} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}")
+    for key in sorted(windows):
+        stats = windows[key]
+        s = stats.latency.summary()
+        print(f"{key * window:>8.0f} {stats.requests / window:>9.1f} {stats.error_rate * 100:>7.2f}% "
+              f"{_ms(s['p50']):>9} {_ms(s['p90']):>9} {_ms(s['p99']):>9} {_ms(s['max']):>9}")
+
+
+def _verdict(p, alpha):
+    return "significant" if p < alpha else "not significant"
+
+
+def print_diff(base, new, alpha, label="Overall"):
+    z, pz = error_rate_test(base, new)
+    t, pt = latency_test(base, new)
+    print(f"{label}: {base.requests} -> {new.requests} requests")
+    print(f"   error rate   {base.error_rate * 100:6.2f}% -> {new.error_rate * 100:6.2f}%  "
+          f"({(new.error_rate - base.error_rate) * 100:+.2f}pp, z={z:.2f}, p={pz:.4f}, {_verdict(pz, alpha)})")
+    print(f"   mean latency {_ms(base.mean()):>8} -> {_ms(new.mean()):>8}  "
+          f"({(new.mean() - base.mean()) * 1000:+.1f}ms, t={t:.2f}, p={pt:.4f}, {_verdict(pt, alpha)})")
+    b, n = base.latency.summary(), new.latency.summary()
+    shifts = "  ".join(f"{q} {_ms(b[q])} -> {_ms(n[q])} ({(n[q] - b[q]) / b[q] * 100:+.1f}%)" if b[q] else
+                       f"{q} {_ms(b[q])} -> {_ms(n[q])}" for q in ("p50", "p90", "p99"))
+    print(f"   {shifts}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse result logs written with --result-log")
+    sub = parser.add_subparsers(dest="command", required=True)
+    summary = sub.add_parser("summary", help="Percentiles and rates per time window")
+    summary.add_argument("logs", nargs="+")
+    summary.add_argument("--window", type=float, default=10.0, help="Window length in seconds")
+    diff = sub.add_parser("diff", help="Compare two runs")
+    diff.add_argument("base", help="Baseline log (comma-separate several files of one run)")
+    diff.add_argument("new", help="New log (comma-separate several files of one run)")
+    diff.add_argument("--alpha", type=float, default=0.05, help="Significance level")
+    args = parser.parse_args()
+
+    if args.command == "summary":
+        print_windows(windowed(args.logs, args.window), args.window)
+        overall, _ = load_run(args.logs)
+        print(f"\nTotal: {overall.requests} requests, {overall.error_rate * 100:.2f}% errors, "
+              f"p99 {_ms(overall.latency.percentile(99))}")
+        return
+
+    base, base_endpoints = load_run(args.base.split(","))
+    new, new_endpoints = load_run(args.new.split(","))
+    if not base.requests or not new.requests:
+        raise SystemExit("❌ Both runs need at least one request")
+    print("\n📉 Run Comparison")
+    print("-----------------")
+    print_diff(base, new, args.alpha)
+    shared = sorted(set(base_endpoints) & set(new_endpoints))
+    if shared:
+        print("\nBy Endpoint:\n------------")
+        for endpoint in shared:
+            print_diff(base_endpoints[endpoint], new_endpoints[endpoint], args.alpha, endpoint)
+    only = sorted(set(base_endpoints) ^ set(new_endpoints))
+    if only:
+        print(f"\nIn one run only: {', '.join(only)}")
+
+
+if __name__ == "__main__":
+    main()
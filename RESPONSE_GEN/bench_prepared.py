@@ -0,0 +1,86 @@
+"""Micro-benchmark: raw request dicts (json= per send) vs compiled PreparedRequests.
+
+"build" times only the per-request preparation (client.build_request), which is
+the work compiling removes. "send" goes through the full httpx.AsyncClient
+stack against an in-process MockTransport, so it shows how much of the
+generator's total per-request CPU that preparation was.
+
+    python bench_prepared.py [--requests N] [--repeat R]
+"""
+import argparse
+import asyncio
+import time
+import httpx
+from prepared import compile_requests
+
+
+def sample_requests(n):
+    return [
+        {
+            "method": "POST",
+            "url": f"https://api.example.com/users/{i}/posts?limit=10&sort=date",
+            "headers": {"Authorization": "Bearer token", "X-Client": "load-test"},
+            "body": {"title": f"Post {i}", "body": "Lorem ipsum " * 8, "userId": i, "tags": ["a", "b", "c"]},
+        }
+        for i in range(n)
+    ]
+
+
+def _respond(request):
+    return httpx.Response(200, content=b"{}")
+
+
+def _build_raw(client, requests, repeat):
+    for _ in range(repeat):
+        for req in requests:
+            client.build_request(req['method'].lower(), req['url'], headers=req.get('headers', {}),
+                                 json=req.get('body', {}))
+
+
+def _build_prepared(client, requests, repeat):
+    for _ in range(repeat):
+        for req in requests:
+            client.build_request(req.method, req.url, headers=req.headers, content=req.content)
+
+
+async def _run_raw(client, requests, repeat):
+    for _ in range(repeat):
+        for req in requests:
+            await client.request(req['method'].lower(), req['url'], headers=req.get('headers', {}),
+                                 json=req.get('body', {}))
+
+
+async def _run_prepared(client, requests, repeat):
+    for _ in range(repeat):
+        for req in requests:
+            await client.request(req.method, req.url, headers=req.headers, content=req.content)
+
+
+async def bench(n, repeat):
+    raw = sample_requests(n)
+    prepared = compile_requests(raw)
+    total = n * repeat
+    async with httpx.AsyncClient(transport=httpx.MockTransport(_respond)) as client:
+        for stage, raw_fn, prepared_fn in (("build", _build_raw, _build_prepared), ("send", _run_raw, _run_prepared)):
+            rates = []
+            for label, fn, requests in (("raw dicts", raw_fn, raw), ("prepared", prepared_fn, prepared)):
+                start = time.perf_counter()
+                result = fn(client, requests, repeat)
+                if asyncio.iscoroutine(result):
+                    await result
+                elapsed = time.perf_counter() - start
+                rates.append(total / elapsed)
+                print(f"{stage:<5} {label:<10}: {total / elapsed:>10.0f} req/s  ({elapsed:.2f}s for {total} requests)")
+            print(f"{stage:<5} speedup   : {rates[1] / rates[0]:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(bench(args.requests, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
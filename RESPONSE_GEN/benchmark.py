@@ -0,0 +1,209 @@
+"""Self-benchmark: how fast is the load generator itself?
+
+Runs each engine mode against the bundled mock_server.py (started in a
+separate process, so its CPU is not counted) and reports:
+
+  closed / stream         max requests/sec and client CPU per request
+  open                    achieved rate, CPU per request and schedule lag at --rate
+  memory                  Python heap per in-flight request (tracemalloc, slow target)
+
+Results can be saved as a baseline and later runs compared against it; any
+metric that is worse by more than --tolerance is flagged and the exit code
+is 1, so the suite can gate CI.
+
+    python benchmark.py --save-baseline bench_baseline.json
+    python benchmark.py --baseline bench_baseline.json [--tolerance 0.15]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+import httpx
+from prepared import compile_requests
+from runner import run_requests_concurrently, run_requests_open_loop
+
+HERE = Path(__file__).resolve().parent
+# Metrics checked against the baseline, and which way is better. Open-loop
+# lag is reported only: a few ms of scheduler jitter swamps any relative check.
+HIGHER_IS_BETTER = {"rps": True, "cpu_us_per_request": False, "bytes_per_in_flight": False}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class MockTarget:
+    """mock_server.py in a child process, for the duration of a `with` block."""
+
+    def __init__(self, *args):
+        self.port = _free_port()
+        self.args = list(args)
+        self.process = None
+
+    def __enter__(self):
+        command = [sys.executable, str(HERE / "mock_server.py"), "--port", str(self.port), *self.args]
+        self.process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", self.port), timeout=0.2).close()
+                return self
+            except OSError:
+                time.sleep(0.05)
+        self.process.kill()
+        raise RuntimeError("mock server did not start")
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.wait()
+
+    def requests(self, n, path="/items"):
+        return compile_requests({"method": "GET", "url": f"http://127.0.0.1:{self.port}{path}/{i}", "body": None}
+                                for i in range(n))
+
+
+def _measure(run):
+    cpu = time.process_time()
+    results = asyncio.run(run())
+    cpu = time.process_time() - cpu
+    total = results['success'] + results['fail']
+    if results['fail']:
+        print(f"⚠️  {results['fail']} of {total} benchmark requests failed")
+    return results, {"rps": total / results['elapsed'], "cpu_us_per_request": cpu / total * 1e6}
+
+
+def bench_closed(target, concurrency, total):
+    requests = target.requests(1000)
+    repeat = max(total // len(requests), 1)
+    _, metrics = _measure(lambda: run_requests_concurrently(requests, concurrency, repeat))
+    return metrics
+
+
+def bench_open(target, rate, duration, max_in_flight):
+    requests = target.requests(1000)
+    results, metrics = _measure(lambda: run_requests_open_loop(requests, [(duration, rate, rate)], max_in_flight=max_in_flight))
+    metrics["lag_p99_ms"] = results['lag'].percentile(99) * 1000
+    return metrics
+
+
+def bench_stream(target, concurrency, total):
+    requests = target.requests(200, path="/sse")
+    repeat = max(total // len(requests), 1)
+    _, metrics = _measure(lambda: run_requests_concurrently(requests, concurrency, repeat, streaming=True))
+    return metrics
+
+
+def bench_memory(target, in_flight):
+    """Heap growth with `in_flight` requests parked on a slow target, divided by in_flight."""
+    requests = target.requests(in_flight)
+    peak = 0
+
+    async def run():
+        nonlocal peak
+        task = asyncio.create_task(run_requests_concurrently(requests, in_flight, 1))
+        while not task.done():
+            await asyncio.sleep(0.05)
+            peak = max(peak, tracemalloc.get_traced_memory()[0])
+        return await task
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        asyncio.run(run())
+    finally:
+        tracemalloc.stop()
+    return {"bytes_per_in_flight": (peak - baseline) / in_flight}
+
+
+def run_suite(args):
+    metrics = {}
+    with MockTarget("--latency", "0", "--workers", str(args.server_workers)) as fast:
+        print("⚙️  closed loop ...")
+        metrics["closed"] = bench_closed(fast, args.concurrency, args.requests)
+        print("⚙️  open loop ...")
+        metrics["open"] = bench_open(fast, args.rate, args.duration, args.concurrency)
+    with MockTarget("--sse-tokens", "20", "--workers", str(args.server_workers)) as sse:
+        print("⚙️  streaming ...")
+        metrics["stream"] = bench_stream(sse, args.concurrency, args.requests // 4)
+    with MockTarget("--latency", "1.0") as slow:
+        print("⚙️  memory per in-flight request ...")
+        metrics["memory"] = bench_memory(slow, args.in_flight)
+    return metrics
+
+
+def compare(metrics, baseline, tolerance):
+    """[(name, old, new, change)] for every metric worse than the baseline by more than tolerance."""
+    regressions = []
+    for mode, values in metrics.items():
+        for name, new in values.items():
+            old = baseline.get(mode, {}).get(name)
+            if not old or name not in HIGHER_IS_BETTER:
+                continue
+            change = (new - old) / old
+            worse = -change if HIGHER_IS_BETTER[name] else change
+            if worse > tolerance:
+                regressions.append((f"{mode}.{name}", old, new, change))
+    return regressions
+
+
+def print_report(metrics, baseline=None):
+    print("\n🏁 Generator Benchmark")
+    print("----------------------")
+    for mode, values in metrics.items():
+        parts = []
+        for name, value in values.items():
+            text = f"{name} {value:,.1f}"
+            old = (baseline or {}).get(mode, {}).get(name)
+            if old:
+                text += f" ({(value - old) / old * 100:+.1f}%)"
+            parts.append(text)
+        print(f"{mode:<7}: " + "  ".join(parts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the load generator against a local mock target")
+    parser.add_argument("--requests", type=int, default=20000, help="Requests per closed-loop measurement")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=3000, help="Target rate for the open-loop measurement")
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--in-flight", type=int, default=500, help="Parked requests for the memory measurement")
+    parser.add_argument("--server-workers", type=int, default=2, help="Mock server processes (keep the target ahead)")
+    parser.add_argument("--baseline", help="Compare against this saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed fractional regression per metric")
+    parser.add_argument("--save-baseline", help="Write this run's numbers as the new baseline")
+    args = parser.parse_args()
+
+    metrics = run_suite(args)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["metrics"]
+    print_report(metrics, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "httpx": httpx.__version__, "cpus": os.cpu_count(),
+                       "settings": vars(args), "metrics": metrics}, f, indent=2)
+        print(f"💾 Baseline written to {args.save_baseline}")
+
+    if baseline is not None:
+        regressions = compare(metrics, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance * 100:.0f}%:")
+            for name, old, new, change in regressions:
+                print(f"   {name}: {old:,.1f} -> {new:,.1f} ({change * 100:+.1f}%)")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.tolerance * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
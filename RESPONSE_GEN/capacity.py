@@ -0,0 +1,113 @@
+"""Find the highest sustainable load under a latency / error-rate SLO.
+
+Short steps are run at increasing load (geometric ramp) until one breaks the
+SLO, then the gap between the last passing and the first failing step is
+bisected. Load is an arrival rate (open loop, the usual capacity measure) or
+a worker count (closed loop).
+"""
+import json
+
+
+def step_stats(results):
+    """SLO-relevant numbers for one step; 5xx responses count as errors."""
+    total = results['success'] + results['fail']
+    server_errors = sum(n for status, n in results['status_codes'].items() if isinstance(status, int) and status >= 500)
+    latency = results['latency']
+    summary = latency.summary()
+    return {
+        "requests": total,
+        "throughput": total / results['elapsed'] if results['elapsed'] else 0.0,
+        "error_rate": (results['fail'] + server_errors) / total if total else 1.0,
+        "p50": summary['p50'],
+        "p90": summary['p90'],
+        "p99": summary['p99'],
+        "max": summary['max'],
+    }
+
+
+def meets_slo(stats, slo_p99, slo_error_rate):
+    return stats['requests'] > 0 and stats['p99'] <= slo_p99 and stats['error_rate'] <= slo_error_rate
+
+
+def search_capacity(run_step, start, slo_p99, slo_error_rate, max_load=None, growth=2.0,
+                    precision=0.05, integer=False, max_steps=20, on_step=None):
+    """Ramp-then-bisect search. run_step(load) runs one step and returns its results dict.
+
+    Returns {"steps": [...], "capacity": highest passing load (0 if none), "limit": lowest failing load or None}.
+    """
+    steps = []
+    passed, failed = 0, None
+
+    def probe(load):
+        stats = step_stats(run_step(load))
+        stats['load'] = load
+        stats['ok'] = meets_slo(stats, slo_p99, slo_error_rate)
+        steps.append(stats)
+        if on_step:
+            on_step(stats)
+        return stats['ok']
+
+    load = start
+    # Ramp: grow geometrically until a step breaks the SLO or the ceiling is reached
+    while len(steps) < max_steps:
+        if probe(load):
+            passed = load
+            if max_load is not None and load >= max_load:
+                break
+            next_load = load * growth
+            if integer:
+                next_load = max(int(next_load), load + 1)
+            load = min(next_load, max_load) if max_load is not None else next_load
+        else:
+            failed = load
+            break
+
+    # Bisect between the last pass and the first failure
+    while failed is not None and len(steps) < max_steps:
+        if integer:
+            if failed - passed <= 1:
+                break
+            load = (passed + failed) // 2
+        else:
+            if failed - passed <= precision * failed:
+                break
+            load = (passed + failed) / 2
+        if probe(load):
+            passed = load
+        else:
+            failed = load
+
+    return {"steps": steps, "capacity": passed, "limit": failed}
+
+
+def print_step(stats, unit):
+    verdict = "✅" if stats['ok'] else "❌"
+    print(f"{verdict} {stats['load']:>10.4g} {unit:<8} achieved {stats['throughput']:>9.1f} req/s  "
+          f"err {stats['error_rate'] * 100:5.2f}%  p50 {stats['p50']:.3f}s  p90 {stats['p90']:.3f}s  "
+          f"p99 {stats['p99']:.3f}s  max {stats['max']:.3f}s")
+
+
+def print_capacity_report(report, slo_p99, slo_error_rate, unit="req/s"):
+    print("\n📈 Capacity Report")
+    print("------------------")
+    print(f"SLO              : p99 <= {slo_p99:.3f}s, errors <= {slo_error_rate * 100:.2f}%")
+    print(f"Steps Run        : {len(report['steps'])}")
+    if report['capacity']:
+        print(f"Max Sustainable  : {report['capacity']:.4g} {unit}")
+    else:
+        print("Max Sustainable  : none - every step broke the SLO")
+    if report['limit'] is not None:
+        print(f"First Failure    : {report['limit']:.4g} {unit}")
+    else:
+        print("First Failure    : not reached (raise the ceiling to search further)")
+
+    # Latency curve, ordered by load rather than by when each step ran
+    print("\nLatency Curve:\n--------------")
+    for stats in sorted(report['steps'], key=lambda s: s['load']):
+        print_step(stats, unit)
+
+
+def save_capacity_report(report, path, slo_p99, slo_error_rate, by):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"by": by, "slo": {"p99": slo_p99, "error_rate": slo_error_rate}, **report}, f, indent=2)
+    print(f"💾 Capacity report written to {path}")
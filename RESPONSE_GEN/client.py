@@ -0,0 +1,53 @@
+import asyncio
+import contextlib
+import httpx
+from config import TIMEOUT, MAX_CONNECTIONS, MAX_KEEPALIVE, KEEPALIVE_EXPIRY, HTTP2, MAX_PER_HOST
+
+
+def pool_settings(max_connections=MAX_CONNECTIONS, max_keepalive=MAX_KEEPALIVE,
+                  keepalive_expiry=KEEPALIVE_EXPIRY, http2=HTTP2, max_per_host=MAX_PER_HOST):
+    # Plain dict so it can be handed to worker processes as-is
+    return {
+        "max_connections": max_connections,
+        "max_keepalive": max_keepalive,
+        "keepalive_expiry": keepalive_expiry,
+        "http2": http2,
+        "max_per_host": max_per_host,
+    }
+
+
+def build_client(pool=None, default_connections=100, timeout=TIMEOUT):
+    """Create the shared AsyncClient with explicit pool limits.
+
+    httpx defaults to 100 connections, which silently caps concurrency above
+    that, so the pool is sized to the run unless configured otherwise.
+    `timeout` is the client-wide default (a number or an httpx.Timeout).
+    """
+    pool = pool or pool_settings()
+    max_connections = pool["max_connections"] or default_connections
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=pool["max_keepalive"] or max_connections,
+        keepalive_expiry=pool["keepalive_expiry"],
+    )
+    try:
+        return httpx.AsyncClient(limits=limits, http2=pool["http2"], timeout=timeout)
+    except ImportError:
+        print("⚠️  HTTP/2 requested but the 'h2' package is not installed; falling back to HTTP/1.1")
+        return httpx.AsyncClient(limits=limits, timeout=timeout)
+
+
+class HostLimiter:
+    """Per-host cap on concurrent requests, on top of the overall pool size."""
+
+    def __init__(self, max_per_host):
+        self.max_per_host = max_per_host
+        self._slots = {}
+
+    def slot(self, host):
+        if not self.max_per_host:
+            return contextlib.nullcontext()
+        sem = self._slots.get(host)
+        if sem is None:
+            sem = self._slots[host] = asyncio.Semaphore(self.max_per_host)
+        return sem
@@ -1,3 +1,63 @@
 CONCURRENCY = 10           # Number of concurrent workers
 TIMEOUT = 5                # Timeout per request (in seconds)
 REPEAT = 1                 # Number of times to repeat all requests
+SHUFFLE_WINDOW = 0         # Shuffle requests within a sliding window of this size (0 = keep file order)
+SEED = None                # Random seed for shuffling and Poisson arrivals
+STREAMING = False          # Consume SSE/chunked responses incrementally and report token metrics
+PROCESSES = 1              # Worker processes to shard the load across (each gets its own event loop)
+SCENARIO = None            # Weighted mix / journey file replayed instead of a flat request file
+ITERATIONS = 1000          # Scenario draws per closed-mode run
+
+# Open-loop (constant arrival rate) mode
+MODE = "closed"            # "closed" = fixed concurrency, "open" = fixed arrival rate
+RATE = 50                  # Target requests per second in open mode
+DURATION = 30              # Length of an open-mode run (in seconds)
+ARRIVAL = "constant"       # Inter-arrival distribution: "constant" or "poisson"
+PROFILE = None             # Optional step/ramp profile, e.g. "30:50,60:50-200" (seconds:rps[-rps])
+MAX_IN_FLIGHT = 1000       # Cap on outstanding requests in open mode
+
+# Capacity search (--mode capacity)
+CAPACITY_BY = "rate"       # Search over "rate" (open loop, req/s) or "concurrency" (closed loop, workers)
+SLO_P99 = 0.5              # p99 latency a step must stay under (in seconds)
+SLO_ERROR_RATE = 0.01      # Fraction of failed / 5xx requests a step may have
+CAPACITY_STEP = 10         # Length of each load step (in seconds)
+CAPACITY_MAX = None        # Ceiling for the search (None = keep ramping until the SLO breaks)
+CAPACITY_PRECISION = 0.05  # Stop bisecting once the pass/fail gap is within this fraction
+
+# Timeouts, retries and circuit breaking
+CONNECT_TIMEOUT = None     # Seconds to establish a connection (None = TIMEOUT)
+READ_TIMEOUT = None        # Seconds to wait for each chunk of the response (None = TIMEOUT)
+POOL_TIMEOUT = None        # Seconds to wait for a free pooled connection (None = TIMEOUT)
+ENDPOINT_TIMEOUTS = {}     # Per-endpoint overrides, e.g. {"POST /upload": 30} (requests can also set "timeout")
+RETRIES = 0                # Retries for timeouts, connection errors, 429 and 5xx (0 = off)
+RETRY_BACKOFF = 0.1        # Base backoff before the first retry; doubles each attempt, fully jittered
+RETRY_BACKOFF_MAX = 2.0    # Cap on a single backoff (in seconds)
+BREAKER_THRESHOLD = 0      # Consecutive failures that open a host's circuit breaker (0 = off)
+BREAKER_COOLDOWN = 5.0     # Seconds a breaker stays open before a single probe request is let through
+
+# Distributed runs (controller / agents)
+AGENTS = None              # Comma-separated agent host:port list; the load is split across them (None = run locally)
+AGENT_PORT = 7700          # Default port agents listen on
+START_DELAY = 2.0          # Seconds between "start" being sent and every agent starting, so they begin together
+PROGRESS_INTERVAL = 2.0    # Seconds between agents' progress reports
+
+# Per-request result log
+RESULT_LOG = None          # Write every attempt to this columnar .rlog file for analyze.py (None = off)
+RESULT_LOG_BLOCK = 4096    # Rows buffered per column before a block is written
+
+# Reporting
+MAX_ENDPOINTS = 100        # Distinct endpoints tracked separately; the rest are grouped as "OTHER"
+MAX_ERROR_CLASSES = 50     # Distinct error classes tracked; the rest are counted together
+ERROR_SAMPLES = 3          # Sample requests kept per error class
+
+# Connection pool
+MAX_CONNECTIONS = None     # Pool size (None = one per concurrent worker / in-flight slot)
+MAX_KEEPALIVE = None       # Idle connections kept alive for reuse (None = same as MAX_CONNECTIONS)
+KEEPALIVE_EXPIRY = 5.0     # Seconds an idle keep-alive connection is kept open
+HTTP2 = False              # Multiplex requests over HTTP/2 (needs the optional `h2` package)
+MAX_PER_HOST = None        # Cap on concurrent requests to any single host (None = no cap)
+
+# Live metrics during a run
+LIVE_INTERVAL = 0          # Seconds between ticker snapshots (0 = off)
+PROMETHEUS_PORT = None     # Serve live metrics on 127.0.0.1:<port>/metrics (None = off)
+METRICS_JSONL = None       # Append each snapshot as a JSON line to this file (None = off)
@@ -0,0 +1,183 @@
+"""Compiled, memory-mapped request corpus.
+
+Layout (little endian):
+
+    header  : magic b"LLMCORP1", version u32, count u64, index offset u64
+    records : one packed record per request (see _RECORD)
+    index   : count + 1 u64 file offsets, record i spans index[i]..index[i+1]
+
+A record is a fixed header of field lengths, then the method, URL, endpoint
+key, host, headers and body bytes, then (if flagged) four f64 timeouts.
+
+Records hold the method, URL, endpoint key, host, headers and the already
+JSON-encoded body, so request i is decoded in O(1) without parsing JSON. The
+file is mmap'd read-only, so every worker process shares the same page-cache
+pages instead of holding its own copy.
+
+    python corpus.py compile <requests.json|.jsonl[.gz]> <out.corpus>
+"""
+import argparse
+import mmap
+import struct
+import sys
+from array import array
+import httpx
+from prepared import PreparedRequest, prepare_request
+from utils import iter_requests
+
+MAGIC = b"LLMCORP1"
+VERSION = 2
+CORPUS_SUFFIX = ".corpus"
+_HEADER = struct.Struct("<8sIQQ")
+# method, url, endpoint, host and headers lengths, body length (-1 = no body), has-timeout flag
+_RECORD = struct.Struct("<HIHHIiB")
+# connect, read, write, pool seconds (NaN = no limit)
+_TIMEOUT = struct.Struct("<4d")
+# Index entries: always little endian, so a corpus can be copied between machines
+_OFFSET = struct.Struct("<Q")
+_NAN = float("nan")
+
+
+def is_corpus(file_path):
+    return str(file_path).endswith(CORPUS_SUFFIX)
+
+
+def _pack_headers(headers):
+    # name\0value\0name\0value... avoids a JSON parse on the read path
+    return b"\0".join(part.encode("utf-8") for kv in headers.items() for part in kv)
+
+
+def _unpack_headers(raw):
+    if not raw:
+        return {}
+    parts = raw.decode("utf-8").split("\0")
+    return dict(zip(parts[::2], parts[1::2]))
+
+
+def _pack_timeout(timeout):
+    values = (timeout.connect, timeout.read, timeout.write, timeout.pool)
+    return _TIMEOUT.pack(*(_NAN if v is None else v for v in values))
+
+
+def _unpack_timeout(mm, pos):
+    connect, read, write, pool = (None if v != v else v for v in _TIMEOUT.unpack_from(mm, pos))
+    return httpx.Timeout(connect=connect, read=read, write=write, pool=pool)
+
+
+def compile_corpus(requests, out_path):
+    """Write raw request dicts to a compiled corpus file; returns the number of requests."""
+    offsets = array("Q")
+    with open(out_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, 0))
+        for request in requests:
+            prepared = prepare_request(request)
+            method = prepared.method.encode("ascii")
+            url = str(prepared.url).encode("utf-8")
+            endpoint = prepared.endpoint.encode("utf-8")
+            host = prepared.host.encode("utf-8")
+            headers = _pack_headers(prepared.headers)
+            content = prepared.content
+            offsets.append(f.tell())
+            timeout = prepared.timeout
+            f.write(_RECORD.pack(len(method), len(url), len(endpoint), len(host), len(headers),
+                                 -1 if content is None else len(content), timeout is not None))
+            f.write(method + url + endpoint + host + headers + (content or b""))
+            if timeout is not None:
+                f.write(_pack_timeout(timeout))
+        index_offset = f.tell()
+        offsets.append(index_offset)
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        offsets.tofile(f)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, VERSION, len(offsets) - 1, index_offset))
+    return len(offsets) - 1
+
+
+class Corpus:
+    """Read-only, random-access view of a compiled corpus (a sequence of PreparedRequests)."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._file = open(self.path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, index_offset = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} request corpus")
+        self._count = count
+        self._index_offset = index_offset
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("corpus index out of range")
+        mm = self._mm
+        (pos,) = _OFFSET.unpack_from(mm, self._index_offset + _OFFSET.size * i)
+        method_len, url_len, endpoint_len, host_len, headers_len, content_len, has_timeout = _RECORD.unpack_from(mm, pos)
+        pos += _RECORD.size
+        method = mm[pos:pos + method_len].decode("ascii")
+        pos += method_len
+        url = mm[pos:pos + url_len].decode("utf-8")
+        pos += url_len
+        endpoint = mm[pos:pos + endpoint_len].decode("utf-8")
+        pos += endpoint_len
+        host = mm[pos:pos + host_len].decode("utf-8")
+        pos += host_len
+        headers = _unpack_headers(mm[pos:pos + headers_len])
+        pos += headers_len
+        content = None
+        if content_len >= 0:
+            content = mm[pos:pos + content_len]
+            pos += content_len
+        timeout = _unpack_timeout(mm, pos) if has_timeout else None
+        return PreparedRequest(method, httpx.URL(url), headers, content, endpoint, host, timeout)
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+    def shard(self, index, processes):
+        """Every `processes`-th request starting at `index`, as a lazy re-iterable."""
+        return _CorpusShard(self, range(index, self._count, processes))
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+
+class _CorpusShard:
+    def __init__(self, corpus, indexes):
+        self.corpus = corpus
+        self.indexes = indexes
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def __getitem__(self, i):
+        return self.corpus[self.indexes[i]]
+
+    def __iter__(self):
+        for i in self.indexes:
+            yield self.corpus[i]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile generated requests into a memory-mapped corpus")
+    sub = parser.add_subparsers(dest="command", required=True)
+    compile_cmd = sub.add_parser("compile", help="Compile a .json/.jsonl request file")
+    compile_cmd.add_argument("source")
+    compile_cmd.add_argument("output")
+    args = parser.parse_args()
+
+    if not is_corpus(args.output):
+        parser.error(f"output file must end with {CORPUS_SUFFIX}")
+    count = compile_corpus(iter_requests(args.source), args.output)
+    print(f"💾 Compiled {count} requests into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""Controller / agent mode for driving load from several machines.
+
+Agents listen on a TCP port; the controller connects to each of them, ships
+its share of the corpus and the rate plan, tells every agent to start at the
+same wall-clock instant, and merges the results they send back into a single
+summary. Messages are length-prefixed JSON frames (4-byte big-endian length,
+then a UTF-8 JSON object with a "type"):
+
+    controller -> agent : setup {plan}, corpus {requests}..., corpus_end, start {at}, abort
+    agent -> controller : ready {count}, progress {success, fail, latency}, results {results}, error {message}
+
+One agent runs one event loop; start several per machine (on different
+ports) to use more cores. Agents run whatever they are sent, so bind them to
+a private interface. Synchronised starts assume the machines' clocks are
+NTP-synced. An agent stops its test as soon as the controller sends abort or
+disconnects; the controller aborts every agent if any one of them fails or
+the run is interrupted.
+
+    python distributed.py agent --bind 127.0.0.1:7700
+    python main.py --agents 127.0.0.1:7700,127.0.0.1:7701 --mode open --rate 500
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import struct
+import time
+from config import AGENT_PORT, START_DELAY, PROGRESS_INTERVAL
+from histogram import Histogram
+from prepared import compile_requests
+from multiproc import _split
+from reporter import new_results, merge_results, results_to_dict, results_from_dict
+from runner import run_requests_concurrently, run_requests_open_loop
+from utils import iter_requests
+
+_LENGTH = struct.Struct(">I")
+MAX_FRAME = 64 * 1024 * 1024
+CORPUS_CHUNK = 1000
+
+
+async def send_message(writer, message):
+    data = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    # One write per frame, so frames from concurrent tasks never interleave
+    writer.write(_LENGTH.pack(len(data)) + data)
+    await writer.drain()
+
+
+async def read_message(reader):
+    """Next frame as a dict, or None once the peer has closed the connection."""
+    try:
+        (size,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+        if size > MAX_FRAME:
+            raise ValueError(f"frame of {size} bytes exceeds the {MAX_FRAME} byte limit")
+        return json.loads(await reader.readexactly(size))
+    except asyncio.IncompleteReadError:
+        return None
+
+
+def parse_address(address, default_port=AGENT_PORT):
+    host, sep, port = address.strip().rpartition(":")
+    if not sep:
+        return address.strip(), default_port
+    return host, int(port)
+
+
+def agent_plans(agents, mode, concurrency=10, repeat=1, window=0, stages=None, arrival="constant",
+                max_in_flight=1000, seed=None, pool=None, streaming=False, policy=None):
+    """Split one run into a plan per agent, the same way multiproc splits it across processes."""
+    plans = []
+    slots = _split(concurrency, agents)
+    caps = _split(max_in_flight, agents)
+    for i in range(agents):
+        plan = {"mode": mode, "index": i, "agents": agents, "arrival": arrival,
+                "seed": None if seed is None else seed + i, "pool": pool, "streaming": streaming, "policy": policy}
+        if mode == "open":
+            # Every agent replays the whole corpus at its share of the rate
+            plan["stages"] = [(duration, start / agents, end / agents) for duration, start, end in stages]
+            plan["max_in_flight"] = caps[i]
+        else:
+            # Every agent gets every `agents`-th request
+            plan.update(concurrency=slots[i], repeat=repeat, window=window)
+        plans.append(plan)
+    return plans
+
+
+class Agent:
+    """Serves one controller at a time: receive plan and corpus, run on cue, report back."""
+
+    def __init__(self, progress_interval=PROGRESS_INTERVAL):
+        self.progress_interval = progress_interval
+        self.busy = False
+
+    async def handle(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        if self.busy:
+            await send_message(writer, {"type": "error", "message": "agent is already running a test"})
+            writer.close()
+            return
+        self.busy = True
+        print(f"🔗 Controller connected from {peer}")
+        try:
+            await self._session(reader, writer)
+        except Exception as e:
+            print(f"❌ Agent error: {e}")
+            try:
+                await send_message(writer, {"type": "error", "message": f"{type(e).__name__}: {e}"})
+            except ConnectionError:
+                pass
+        finally:
+            self.busy = False
+            writer.close()
+
+    async def _session(self, reader, writer):
+        plan = raw = requests = None
+        while True:
+            message = await read_message(reader)
+            if message is None:
+                return
+            kind = message["type"]
+            if kind == "setup":
+                plan, raw = message["plan"], []
+            elif kind == "corpus":
+                raw.extend(message["requests"])
+            elif kind == "corpus_end":
+                requests, raw = compile_requests(raw), None
+                await send_message(writer, {"type": "ready", "count": len(requests)})
+            elif kind == "start":
+                delay = message["at"] - time.time()
+                print(f"⏳ Starting {len(requests)} requests in {max(delay, 0):.1f}s ({plan['mode']} mode)")
+                run = asyncio.create_task(self._run(plan, requests, writer, delay))
+                # The controller only speaks again to abort; EOF means it is gone
+                watch = asyncio.create_task(read_message(reader))
+                await asyncio.wait((run, watch), return_when=asyncio.FIRST_COMPLETED)
+                if not run.done():
+                    run.cancel()
+                    await asyncio.gather(run, return_exceptions=True)
+                    message = watch.result()
+                    print("🛑 Aborted by the controller" if message else "🛑 Controller disconnected, test stopped")
+                    return
+                watch.cancel()
+                results = run.result()
+                await send_message(writer, {"type": "results", "results": results_to_dict(results)})
+                print(f"✅ Done: {results['success']} ok, {results['fail']} failed")
+            elif kind == "abort":
+                return
+            else:
+                raise ValueError(f"unexpected message type {kind!r}")
+
+    async def _run(self, plan, requests, writer, delay=0):
+        await asyncio.sleep(max(delay, 0))
+        results = new_results()
+        progress = asyncio.create_task(self._report_progress(results, writer))
+        try:
+            if plan["mode"] == "open":
+                await run_requests_open_loop(requests, plan["stages"], plan["arrival"], plan["max_in_flight"], plan["seed"],
+                                             plan["pool"], plan["streaming"], policy=plan["policy"], results=results)
+            else:
+                await run_requests_concurrently(requests, plan["concurrency"], plan["repeat"], plan["window"], plan["seed"],
+                                                plan["pool"], plan["streaming"], policy=plan["policy"], results=results)
+        finally:
+            progress.cancel()
+        return results
+
+    async def _report_progress(self, results, writer):
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            await send_message(writer, {"type": "progress", "success": results['success'], "fail": results['fail'],
+                                        "latency": results['latency'].to_dict()})
+
+
+async def serve_agent(host, port, progress_interval=PROGRESS_INTERVAL):
+    agent = Agent(progress_interval)
+    server = await asyncio.start_server(agent.handle, host, port)
+    print(f"🛰️  Agent listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def _agent_corpus(file_path, plan):
+    requests = iter_requests(file_path)
+    if plan["mode"] != "open" and plan["agents"] > 1:
+        requests = itertools.islice(requests, plan["index"], None, plan["agents"])
+    return requests
+
+
+async def _ship(address, file_path, plan):
+    host, port = address
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await send_message(writer, {"type": "setup", "plan": plan})
+        requests = _agent_corpus(file_path, plan)
+        while True:
+            chunk = list(itertools.islice(requests, CORPUS_CHUNK))
+            if not chunk:
+                break
+            await send_message(writer, {"type": "corpus", "requests": chunk})
+        await send_message(writer, {"type": "corpus_end"})
+        reply = await _expect(reader, "ready", address)
+    except BaseException:
+        writer.close()
+        raise
+    print(f"🛰️  {host}:{port} ready with {reply['count']} requests")
+    return reader, writer
+
+
+async def _expect(reader, kind, address):
+    message = await read_message(reader)
+    if message is None:
+        raise ConnectionError(f"agent {address[0]}:{address[1]} closed the connection")
+    if message["type"] == "error":
+        raise RuntimeError(f"agent {address[0]}:{address[1]}: {message['message']}")
+    if message["type"] != kind:
+        raise RuntimeError(f"agent {address[0]}:{address[1]} sent {message['type']!r}, expected {kind!r}")
+    return message
+
+
+async def run_distributed(addresses, file_path, plans, start_delay=START_DELAY):
+    """Run one test across agents and return the merged results."""
+    shipped = await asyncio.gather(*(_ship(address, file_path, plan) for address, plan in zip(addresses, plans)),
+                                   return_exceptions=True)
+    connections = [c for c in shipped if not isinstance(c, BaseException)]
+    failures = [c for c in shipped if isinstance(c, BaseException)]
+    if failures:
+        # Release the agents that did get ready; they would otherwise stay busy waiting for a start
+        await _abort(connections)
+        for _, writer in connections:
+            writer.close()
+        raise failures[0]
+    start_at = time.time() + start_delay
+
+    progress = {}
+    reported = set()
+
+    async def collect(address, reader):
+        while True:
+            message = await read_message(reader)
+            if message is None:
+                raise ConnectionError(f"agent {address[0]}:{address[1]} disconnected mid-test")
+            if message["type"] == "progress":
+                progress[address] = message
+                # One ticker line per round of reports, not one per agent
+                reported.add(address)
+                if len(reported) == len(addresses):
+                    reported.clear()
+                    _print_progress(progress, len(addresses), time.time() - start_at)
+            elif message["type"] == "results":
+                return results_from_dict(message["results"])
+            elif message["type"] == "error":
+                raise RuntimeError(f"agent {address[0]}:{address[1]}: {message['message']}")
+
+    tasks = []
+    try:
+        for _, writer in connections:
+            await send_message(writer, {"type": "start", "at": start_at})
+        print(f"🚀 {len(connections)} agents start in {start_delay:.1f}s")
+        tasks = [asyncio.create_task(collect(address, reader)) for address, (reader, _) in zip(addresses, connections)]
+        worker_results = await asyncio.gather(*tasks)
+    except BaseException:
+        # One agent failed or we were interrupted: stop the rest instead of leaving them running
+        for task in tasks:
+            task.cancel()
+        await _abort(connections)
+        raise
+    finally:
+        for _, writer in connections:
+            writer.close()
+    results = new_results()
+    for worker in worker_results:
+        merge_results(results, worker)
+    return results
+
+
+async def _abort(connections):
+    for _, writer in connections:
+        if writer.is_closing():
+            continue
+        try:
+            await asyncio.wait_for(send_message(writer, {"type": "abort"}), 1.0)
+        except (ConnectionError, asyncio.TimeoutError):
+            pass
+    print(f"🛑 Sent abort to {len(connections)} agents")
+
+
+def _print_progress(progress, agents, elapsed):
+    latency = Histogram()
+    success = fail = 0
+    for message in progress.values():
+        success += message["success"]
+        fail += message["fail"]
+        latency.merge(Histogram.from_dict(message["latency"]))
+    print(f"⏱  {elapsed:6.1f}s  agents {len(progress)}/{agents}  ok {success}  fail {fail}  "
+          f"p50 {latency.percentile(50):.3f}s  p99 {latency.percentile(99):.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed load-test agent")
+    sub = parser.add_subparsers(dest="command", required=True)
+    agent = sub.add_parser("agent", help="Wait for a controller and run the tests it sends")
+    agent.add_argument("--bind", default=f"127.0.0.1:{AGENT_PORT}", help="host:port to listen on")
+    agent.add_argument("--progress-interval", type=float, default=PROGRESS_INTERVAL,
+                       help="Seconds between progress reports to the controller")
+    args = parser.parse_args()
+
+    host, port = parse_address(args.bind)
+    try:
+        asyncio.run(serve_agent(host, port, args.progress_interval))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import random
+import re
+import time
+from config import MAX_ERROR_CLASSES, ERROR_SAMPLES
+
+# Variable parts of error messages, replaced so identical failures group together
+_NORMALISERS = (
+    (re.compile(r"\w+://[^\s'\"]+"), "<url>"),
+    (re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"), "<ip>"),
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F-]{27}\b"), "<uuid>"),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b"), "<hex>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "N"),
+)
+_MAX_MESSAGE = 200
+_OVERFLOW = ("Other", "more distinct error classes than MAX_ERROR_CLASSES")
+
+
+def normalise_message(message):
+    for pattern, replacement in _NORMALISERS:
+        message = pattern.sub(replacement, message)
+    return message[:_MAX_MESSAGE]
+
+
+def classify(error):
+    """(exception type, normalised message) for an exception or a plain error string."""
+    if isinstance(error, BaseException):
+        return type(error).__name__, normalise_message(str(error) or repr(error))
+    return "Error", normalise_message(str(error))
+
+
+class ErrorAggregator:
+    """Bounded, deduplicated error counts.
+
+    Failures are grouped by exception type and normalised message. Each class
+    keeps a count, first/last seen timestamps and a small reservoir of sample
+    requests, and the number of classes is capped, so memory stays the same
+    whether a run sees ten errors or ten million.
+    """
+
+    def __init__(self, max_classes=MAX_ERROR_CLASSES, samples=ERROR_SAMPLES):
+        self.max_classes = max_classes
+        self.samples = samples
+        self.classes = {}
+        self.total = 0
+        self._rng = random.Random()
+
+    def __len__(self):
+        return self.total
+
+    def __bool__(self):
+        return self.total > 0
+
+    def record(self, error, request=None):
+        key = classify(error)
+        entry = self.classes.get(key)
+        now = time.time()
+        if entry is None:
+            if len(self.classes) >= self.max_classes:
+                key = _OVERFLOW
+                entry = self.classes.get(key)
+            if entry is None:
+                entry = self.classes[key] = {"count": 0, "first_seen": now, "last_seen": now, "samples": []}
+        self.total += 1
+        entry["count"] += 1
+        entry["last_seen"] = now
+        if request is not None:
+            self._sample(entry, f"{request.method} {request.url}")
+
+    def _sample(self, entry, sample):
+        # Reservoir sampling: every failing request has an equal chance of being kept
+        samples = entry["samples"]
+        if len(samples) < self.samples:
+            samples.append(sample)
+        else:
+            i = self._rng.randrange(entry["count"])
+            if i < self.samples:
+                samples[i] = sample
+
+    def merge(self, other):
+        for key, theirs in other.classes.items():
+            ours = self.classes.get(key)
+            if ours is None:
+                if len(self.classes) >= self.max_classes:
+                    key = _OVERFLOW
+                    ours = self.classes.get(key)
+                if ours is None:
+                    self.classes[key] = {**theirs, "samples": list(theirs["samples"])}
+                    continue
+            ours["count"] += theirs["count"]
+            ours["first_seen"] = min(ours["first_seen"], theirs["first_seen"])
+            ours["last_seen"] = max(ours["last_seen"], theirs["last_seen"])
+            samples = ours["samples"] + theirs["samples"]
+            ours["samples"] = self._rng.sample(samples, min(len(samples), self.samples))
+        self.total += other.total
+        return self
+
+    def top(self, n=None):
+        """Error classes as (type, message, entry), most frequent first."""
+        ranked = sorted(self.classes.items(), key=lambda kv: kv[1]["count"], reverse=True)
+        return [(etype, message, entry) for (etype, message), entry in ranked[:n]]
+
+    def to_dict(self):
+        return {
+            "max_classes": self.max_classes,
+            "samples": self.samples,
+            "total": self.total,
+            "classes": [[etype, message, entry] for (etype, message), entry in self.classes.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        errors = cls(data["max_classes"], data["samples"])
+        errors.total = data["total"]
+        errors.classes = {(etype, message): entry for etype, message, entry in data["classes"]}
+        return errors
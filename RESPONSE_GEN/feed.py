@@ -0,0 +1,59 @@
+import random
+import time
+
+
+def repeat_requests(source, repeat):
+    """Yield every request from source, `repeat` times over.
+
+    source is either a re-iterable (e.g. a list) or a zero-argument callable
+    returning a fresh iterable, so file-backed sources are re-read each pass
+    instead of being held in memory.
+    """
+    for _ in range(repeat):
+        yield from (source() if callable(source) else source)
+
+
+def shuffle_window(requests, window, seed=None):
+    """Approximately shuffle a stream using a bounded buffer of `window` items."""
+    if window <= 1:
+        yield from requests
+        return
+    rng = random.Random(seed)
+    buffer = []
+    for req in requests:
+        if len(buffer) < window:
+            buffer.append(req)
+            continue
+        i = rng.randrange(window)
+        yield buffer[i]
+        buffer[i] = req
+    rng.shuffle(buffer)
+    yield from buffer
+
+
+def build_feed(source, repeat=1, window=0, seed=None):
+    """file -> repeat -> shuffle window, evaluated lazily one request at a time."""
+    return shuffle_window(repeat_requests(source, repeat), window, seed)
+
+
+def cycle_requests(source):
+    """Yield from source over and over (open-loop runs last for a duration, not a count)."""
+    while True:
+        empty = True
+        for req in (source() if callable(source) else source):
+            empty = False
+            yield req
+        if empty:
+            return
+
+
+def timed_feed(source, duration):
+    """Cycle through source until `duration` seconds after the first request is pulled."""
+    deadline = None
+    for req in cycle_requests(source):
+        now = time.monotonic()
+        if deadline is None:
+            deadline = now + duration
+        elif now >= deadline:
+            return
+        yield req
@@ -0,0 +1,114 @@
+class Histogram:
+    """Fixed-memory, log-bucketed (HDR-style) latency histogram.
+
+    Values are recorded in seconds and stored as integer microseconds. Each
+    power-of-two range is split into 2**(precision_bits - 1) linear sub-buckets,
+    so any reported value is within 1 / 2**(precision_bits - 1) of the true one
+    (~0.8% at the default of 8 bits). Recording is O(1) and the bucket array
+    never grows, however many values go in.
+    """
+
+    __slots__ = ("precision_bits", "highest", "counts", "count", "total", "min", "max")
+
+    def __init__(self, precision_bits=8, highest=3600.0):
+        self.precision_bits = precision_bits
+        # Values above this (in seconds) are clamped into the top bucket
+        self.highest = int(highest * 1_000_000)
+        self.counts = [0] * (self._index(self.highest) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        bits = self.precision_bits
+        shift = value.bit_length() - bits
+        if shift <= 0:
+            return value
+        return (shift << (bits - 1)) + (value >> shift)
+
+    def _value_at(self, index):
+        # Highest value that maps to the bucket at `index`
+        bits = self.precision_bits
+        if index < (1 << bits):
+            return index
+        shift = (index >> (bits - 1)) - 1
+        mantissa = index - (shift << (bits - 1))
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, seconds):
+        value = min(max(int(seconds * 1_000_000), 0), self.highest)
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other):
+        """Add another histogram's counts into this one (e.g. from another worker or run)."""
+        if other.precision_bits != self.precision_bits or other.highest != self.highest:
+            raise ValueError("Cannot merge histograms with different precision or range")
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        return self
+
+    def percentile(self, q):
+        """Latency (seconds) at or below which q percent of recorded values fall."""
+        if not self.count:
+            return 0.0
+        if q >= 100:
+            return self.max
+        target = max(1, int(round(self.count * q / 100.0)))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return min(self._value_at(i) / 1_000_000, self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.mean(),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p99.9": self.percentile(99.9),
+            "max": self.max or 0.0,
+        }
+
+    def to_dict(self):
+        """JSON-safe form (sparse bucket counts) for shipping between processes or machines."""
+        return {
+            "precision_bits": self.precision_bits,
+            "highest": self.highest,
+            "counts": [[i, c] for i, c in enumerate(self.counts) if c],
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        hist = cls(data["precision_bits"], data["highest"] / 1_000_000)
+        for i, c in data["counts"]:
+            hist.counts[i] = c
+        hist.count = data["count"]
+        hist.total = data["total"]
+        hist.min = data["min"]
+        hist.max = data["max"]
+        return hist
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import time
+from reporter import new_window
+
+
+def live_settings(interval=0, prometheus_port=None, jsonl_path=None):
+    # Plain dict, like client.pool_settings, so it can be passed around as-is
+    return {"interval": interval, "prometheus_port": prometheus_port, "jsonl_path": jsonl_path}
+
+
+class LiveMetrics:
+    """Periodic interval snapshots of a running test.
+
+    Every `interval` seconds the current window (counts plus a latency
+    histogram) is swapped for a fresh one and turned into a snapshot: RPS,
+    error rate and p50/p99 for just that window. Snapshots are printed as a
+    ticker line, optionally appended to a JSON-lines file, and served in
+    Prometheus text format on 127.0.0.1:<prometheus_port>/metrics.
+    """
+
+    def __init__(self, results, interval, prometheus_port=None, jsonl_path=None):
+        self.results = results
+        self.interval = interval
+        self.prometheus_port = prometheus_port
+        self.jsonl_path = jsonl_path
+        self.snapshot = None
+        self._task = None
+        self._server = None
+        self._started = None
+        self._window_started = None
+
+    async def start(self):
+        self._started = self._window_started = time.monotonic()
+        self.results['window'] = new_window()
+        if self.prometheus_port:
+            self._server = await asyncio.start_server(self._serve_metrics, "127.0.0.1", self.prometheus_port)
+            print(f"📡 Prometheus metrics on http://127.0.0.1:{self.prometheus_port}/metrics")
+        self._task = asyncio.create_task(self._tick_forever())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        # Flush the partial last window, unless it is too short to give a meaningful rate
+        if time.monotonic() - self._window_started >= self.interval / 10:
+            self.tick()
+        self.results['window'] = None
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _tick_forever(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.tick()
+
+    def tick(self):
+        now = time.monotonic()
+        window = self.results['window']
+        self.results['window'] = new_window()
+        span = max(now - self._window_started, 1e-9)
+        self._window_started = now
+
+        done = window['success'] + window['fail']
+        latency = window['latency']
+        self.snapshot = {
+            "timestamp": time.time(),
+            "elapsed": round(now - self._started, 3),
+            "window": round(span, 3),
+            "requests": done,
+            "rps": done / span,
+            "error_rate": window['fail'] / done if done else 0.0,
+            "p50": latency.percentile(50),
+            "p99": latency.percentile(99),
+            "total_success": self.results['success'],
+            "total_fail": self.results['fail'],
+        }
+        self._print(self.snapshot)
+        if self.jsonl_path:
+            with open(self.jsonl_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(self.snapshot) + '\n')
+
+    def _print(self, snap):
+        print(f"⏱  {snap['elapsed']:>7.1f}s | {snap['rps']:>8.1f} req/s | "
+              f"err {snap['error_rate'] * 100:5.1f}% | p50 {snap['p50']:.3f}s | p99 {snap['p99']:.3f}s | "
+              f"total {snap['total_success'] + snap['total_fail']}")
+
+    def prometheus_text(self):
+        snap = self.snapshot or {}
+        lines = [
+            "# HELP loadtest_requests_total Requests completed since the start of the run.",
+            "# TYPE loadtest_requests_total counter",
+            f'loadtest_requests_total{{outcome="success"}} {self.results["success"]}',
+            f'loadtest_requests_total{{outcome="fail"}} {self.results["fail"]}',
+            "# HELP loadtest_window_rps Requests per second over the last interval.",
+            "# TYPE loadtest_window_rps gauge",
+            f"loadtest_window_rps {snap.get('rps', 0.0)}",
+            "# HELP loadtest_window_error_rate Fraction of failed requests over the last interval.",
+            "# TYPE loadtest_window_error_rate gauge",
+            f"loadtest_window_error_rate {snap.get('error_rate', 0.0)}",
+            "# HELP loadtest_window_latency_seconds Latency quantiles over the last interval.",
+            "# TYPE loadtest_window_latency_seconds gauge",
+            f'loadtest_window_latency_seconds{{quantile="0.5"}} {snap.get("p50", 0.0)}',
+            f'loadtest_window_latency_seconds{{quantile="0.99"}} {snap.get("p99", 0.0)}',
+        ]
+        return "\n".join(lines) + "\n"
+
+    async def _serve_metrics(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            # Drain the request headers; only GET /metrics is served
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.split()
+            if len(parts) >= 2 and parts[1] == b"/metrics":
+                status, body = "200 OK", self.prometheus_text().encode()
+            else:
+                status, body = "404 Not Found", b"not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+async def start_live(results, live):
+    """Start live metrics for `results` if enabled in the `live` settings, else return None."""
+    # Any of the three outputs turns it on; the ticker then runs at the default interval
+    if not live or not (live["interval"] or live["prometheus_port"] or live["jsonl_path"]):
+        return None
+    metrics = LiveMetrics(results, live["interval"] or 5, live["prometheus_port"], live["jsonl_path"])
+    await metrics.start()
+    return metrics
@@ -1,13 +1,188 @@
-from utils import load_requests
-from runner import run_requests_concurrently
+from utils import REQUESTS_PATH
+from runner import run_requests_concurrently, run_requests_open_loop
+from multiproc import run_multiprocess
+from prepared import corpus_source
+from scenario import load_scenario
+from capacity import search_capacity, print_capacity_report, save_capacity_report, print_step
+from feed import timed_feed
 from reporter import print_summary
-from config import CONCURRENCY
+from scheduler import parse_profile, constant_profile
+from client import pool_settings
+from live import live_settings
+from resilience import policy_settings, parse_endpoint_timeouts
+from distributed import run_distributed, agent_plans, parse_address
+from corpus import is_corpus
+from resultlog import step_log_path
+from config import CONCURRENCY, REPEAT, SHUFFLE_WINDOW, SEED, STREAMING, PROCESSES, SCENARIO, ITERATIONS, MODE, RATE, DURATION, ARRIVAL, PROFILE, MAX_IN_FLIGHT
+from config import MAX_CONNECTIONS, MAX_KEEPALIVE, KEEPALIVE_EXPIRY, HTTP2, MAX_PER_HOST
+from config import LIVE_INTERVAL, PROMETHEUS_PORT, METRICS_JSONL
+from config import TIMEOUT, CONNECT_TIMEOUT, READ_TIMEOUT, POOL_TIMEOUT, ENDPOINT_TIMEOUTS
+from config import RETRIES, RETRY_BACKOFF, RETRY_BACKOFF_MAX, BREAKER_THRESHOLD, BREAKER_COOLDOWN
+from config import AGENTS, START_DELAY, RESULT_LOG
+from config import CAPACITY_BY, SLO_P99, SLO_ERROR_RATE, CAPACITY_STEP, CAPACITY_MAX, CAPACITY_PRECISION
+import argparse
 import asyncio
+import itertools
+from pathlib import Path
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Replay generated requests against a target")
+    parser.add_argument("--requests", type=Path, default=REQUESTS_PATH, help="Generated request file to replay (.json, a .jsonl[.gz|.zst] corpus, or a compiled .corpus)")
+    parser.add_argument("--scenario", type=Path, default=SCENARIO,
+                        help="Weighted mix / journey file to replay instead of --requests")
+    parser.add_argument("--iterations", type=int, default=ITERATIONS,
+                        help="Scenario draws in closed mode (replaces --repeat)")
+    parser.add_argument("--mode", choices=["closed", "open", "capacity"], default=MODE,
+                        help="closed = fixed concurrency, open = fixed arrival rate, capacity = search for max load under the SLO")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="Passes over the request file (closed mode)")
+    parser.add_argument("--shuffle-window", type=int, default=SHUFFLE_WINDOW,
+                        help="Shuffle requests within a window of this many (0 = file order)")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--stream", action=argparse.BooleanOptionalAction, default=STREAMING,
+                        help="Stream SSE/chunked responses and report time-to-first-token and tokens/sec")
+    parser.add_argument("--processes", type=int, default=PROCESSES,
+                        help="Shard the load across this many worker processes")
+    parser.add_argument("--rate", type=float, default=RATE, help="Target requests/sec (open mode)")
+    parser.add_argument("--duration", type=float, default=DURATION, help="Run length in seconds (open mode)")
+    parser.add_argument("--arrival", choices=["constant", "poisson"], default=ARRIVAL)
+    parser.add_argument("--profile", default=PROFILE,
+                        help='Step/ramp profile, e.g. "30:50,60:50-200" (overrides --rate/--duration)')
+    parser.add_argument("--max-in-flight", type=int, default=MAX_IN_FLIGHT)
+    parser.add_argument("--max-connections", type=int, default=MAX_CONNECTIONS,
+                        help="Connection pool size (default: one per worker / in-flight slot)")
+    parser.add_argument("--max-keepalive", type=int, default=MAX_KEEPALIVE,
+                        help="Idle keep-alive connections kept in the pool")
+    parser.add_argument("--keepalive-expiry", type=float, default=KEEPALIVE_EXPIRY,
+                        help="Seconds an idle connection is kept open")
+    parser.add_argument("--http2", action=argparse.BooleanOptionalAction, default=HTTP2,
+                        help="Multiplex requests over HTTP/2 (needs the h2 package)")
+    parser.add_argument("--max-per-host", type=int, default=MAX_PER_HOST,
+                        help="Cap on concurrent requests to a single host")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="Default per-request timeout in seconds")
+    parser.add_argument("--connect-timeout", type=float, default=CONNECT_TIMEOUT)
+    parser.add_argument("--read-timeout", type=float, default=READ_TIMEOUT)
+    parser.add_argument("--pool-timeout", type=float, default=POOL_TIMEOUT,
+                        help="Seconds to wait for a free pooled connection")
+    parser.add_argument("--endpoint-timeout", action="append", default=[], metavar="'METHOD /path=SECONDS'",
+                        help='Per-endpoint timeout, e.g. "POST /upload=30" (repeatable)')
+    parser.add_argument("--retries", type=int, default=RETRIES,
+                        help="Retry timeouts, connection errors, 429 and 5xx this many times (counted separately)")
+    parser.add_argument("--retry-backoff", type=float, default=RETRY_BACKOFF)
+    parser.add_argument("--retry-backoff-max", type=float, default=RETRY_BACKOFF_MAX)
+    parser.add_argument("--breaker-threshold", type=int, default=BREAKER_THRESHOLD,
+                        help="Consecutive failures that open a host's circuit breaker (0 = off)")
+    parser.add_argument("--breaker-cooldown", type=float, default=BREAKER_COOLDOWN)
+    parser.add_argument("--live-interval", type=float, default=LIVE_INTERVAL,
+                        help="Print RPS / error rate / p50 / p99 every N seconds (0 = off)")
+    parser.add_argument("--prometheus-port", type=int, default=PROMETHEUS_PORT,
+                        help="Expose live metrics in Prometheus format on this local port")
+    parser.add_argument("--metrics-file", default=METRICS_JSONL,
+                        help="Append live snapshots as JSON lines to this file")
+    parser.add_argument("--result-log", default=RESULT_LOG,
+                        help="Write every attempt to this columnar .rlog file (see analyze.py)")
+    parser.add_argument("--agents", default=AGENTS,
+                        help="Comma-separated host:port list of agents (python distributed.py agent) to split the load across")
+    parser.add_argument("--start-delay", type=float, default=START_DELAY,
+                        help="Seconds agents wait before starting together")
+    parser.add_argument("--capacity-by", choices=["rate", "concurrency"], default=CAPACITY_BY,
+                        help="Search over arrival rate (starting at --rate) or workers (starting at --concurrency)")
+    parser.add_argument("--slo-p99", type=float, default=SLO_P99, help="p99 latency limit in seconds (capacity mode)")
+    parser.add_argument("--slo-error-rate", type=float, default=SLO_ERROR_RATE,
+                        help="Allowed fraction of failed / 5xx requests (capacity mode)")
+    parser.add_argument("--step-duration", type=float, default=CAPACITY_STEP, help="Seconds per capacity step")
+    parser.add_argument("--capacity-max", type=float, default=CAPACITY_MAX, help="Ceiling for the capacity search")
+    parser.add_argument("--capacity-precision", type=float, default=CAPACITY_PRECISION,
+                        help="Stop once the pass/fail gap is within this fraction")
+    parser.add_argument("--capacity-report", help="Also write the capacity report as JSON to this file")
+    return parser.parse_args()
+
+def run_capacity(args, pool, policy):
+    def source():
+        # A fresh, endless feed per step
+        return load_scenario(args.scenario, args.seed).feed() if args.scenario else corpus_source(args.requests)
+
+    by_rate = args.capacity_by == "rate"
+    steps = itertools.count(1)
+
+    def run_step(load):
+        # One result log per step: run.rlog -> run.step1.rlog, run.step2.rlog, ...
+        log = step_log_path(args.result_log, next(steps)) if args.result_log else None
+        if by_rate:
+            stages = constant_profile(load, args.step_duration)
+            if args.processes > 1:
+                return run_multiprocess(args.requests, args.processes, "open", stages=stages, arrival=args.arrival,
+                                        max_in_flight=args.max_in_flight, seed=args.seed, pool=pool,
+                                        streaming=args.stream, scenario=args.scenario, policy=policy, result_log=log)
+            return asyncio.run(run_requests_open_loop(source(), stages, args.arrival, args.max_in_flight, args.seed, pool,
+                                                      args.stream, policy=policy, result_log=log))
+        feed = timed_feed(source(), args.step_duration)
+        return asyncio.run(run_requests_concurrently(feed, load, 1, 0, args.seed, pool, args.stream, policy=policy,
+                                                     result_log=log))
+
+    if not by_rate and args.processes > 1:
+        print("⚠️  Concurrency search runs in a single process; ignoring --processes")
+    unit = "req/s" if by_rate else "workers"
+    start = args.rate if by_rate else args.concurrency
+    max_load = args.capacity_max
+    if max_load is not None and not by_rate:
+        max_load = int(max_load)
+    print(f"🔎 Searching capacity by {args.capacity_by} from {start} {unit} ({args.step_duration:.0f}s steps)")
+    report = search_capacity(run_step, start, args.slo_p99, args.slo_error_rate, max_load,
+                             precision=args.capacity_precision, integer=not by_rate,
+                             on_step=lambda stats: print_step(stats, unit))
+    print_capacity_report(report, args.slo_p99, args.slo_error_rate, unit)
+    if args.capacity_report:
+        save_capacity_report(report, args.capacity_report, args.slo_p99, args.slo_error_rate, args.capacity_by)
 
 def main():
-    # Load requests from ../LLM_REQUEST-GEN/generated/requests.json
-    requests = load_requests()
-    results = asyncio.run(run_requests_concurrently(requests, CONCURRENCY))
+    args = parse_args()
+    pool = pool_settings(args.max_connections, args.max_keepalive, args.keepalive_expiry, args.http2, args.max_per_host)
+    live = live_settings(args.live_interval, args.prometheus_port, args.metrics_file)
+    endpoint_timeouts = {**ENDPOINT_TIMEOUTS, **parse_endpoint_timeouts(args.endpoint_timeout)}
+    policy = policy_settings(args.timeout, args.connect_timeout, args.read_timeout, args.pool_timeout, endpoint_timeouts,
+                             args.retries, args.retry_backoff, args.retry_backoff_max,
+                             args.breaker_threshold, args.breaker_cooldown)
+    if args.mode == "capacity":
+        run_capacity(args, pool, policy)
+        return
+    stages = None
+    if args.mode == "open":
+        stages = parse_profile(args.profile) if args.profile else constant_profile(args.rate, args.duration)
+
+    if args.agents:
+        if args.scenario or is_corpus(args.requests):
+            raise SystemExit("❌ Distributed runs ship a .json/.jsonl request file; scenarios and .corpus files are not supported")
+        if args.result_log:
+            print("⚠️  --result-log is not supported with --agents; only the merged summary is kept")
+        addresses = [parse_address(a) for a in args.agents.split(",") if a.strip()]
+        plans = agent_plans(len(addresses), args.mode, args.concurrency, args.repeat, args.shuffle_window, stages,
+                            args.arrival, args.max_in_flight, args.seed, pool, args.stream, policy)
+        results = asyncio.run(run_distributed(addresses, args.requests, plans, args.start_delay))
+    elif args.processes > 1:
+        if args.live_interval or args.prometheus_port or args.metrics_file:
+            print("⚠️  Live metrics are only available in single-process runs; showing the final summary only")
+        results = run_multiprocess(
+            args.requests, args.processes, args.mode, args.concurrency, args.repeat, args.shuffle_window,
+            stages, args.arrival, args.max_in_flight, args.seed, pool, args.stream, args.scenario, args.iterations, policy,
+            args.result_log)
+    elif args.scenario:
+        # Scenario draws are already randomised, so repeat and shuffle window don't apply
+        scenario = load_scenario(args.scenario, args.seed)
+        if args.mode == "open":
+            results = asyncio.run(run_requests_open_loop(scenario.feed(), stages, args.arrival, args.max_in_flight, args.seed, pool, args.stream, live, policy, result_log=args.result_log))
+        else:
+            results = asyncio.run(run_requests_concurrently(
+                scenario.feed(args.iterations), args.concurrency, 1, 0, args.seed, pool, args.stream, live, policy, result_log=args.result_log))
+    elif args.mode == "open":
+        # Load requests from ../LLM_REQUEST-GEN/generated/requests.json (or --requests)
+        requests = corpus_source(args.requests)
+        results = asyncio.run(run_requests_open_loop(requests, stages, args.arrival, args.max_in_flight, args.seed, pool, args.stream, live, policy, result_log=args.result_log))
+    else:
+        # JSON files are compiled once and reused across repeats; JSONL corpora are re-streamed per pass
+        requests = corpus_source(args.requests)
+        results = asyncio.run(run_requests_concurrently(
+            requests, args.concurrency, args.repeat, args.shuffle_window, args.seed, pool, args.stream, live, policy, result_log=args.result_log))
     print_summary(results)
 
 if __name__ == "__main__":
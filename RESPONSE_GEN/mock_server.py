@@ -0,0 +1,241 @@
+"""Local mock target for measuring the load generator itself.
+
+A bare asyncio HTTP/1.1 server with keep-alive: no framework, no per-request
+allocations beyond the response bytes, so it can out-run the generator and
+the numbers reflect the tool rather than the target. Requests to paths under
+/sse get an OpenAI-style event stream (chunked, so connections are reused);
+everything else gets a JSON payload of the configured size after a sampled
+delay, or the configured error status at the configured rate.
+
+    python mock_server.py --port 8800 --latency lognormal:0.02,0.5 --error-rate 0.01 --payload-bytes 512
+    python mock_server.py --port 8800 --sse-tokens 50 --sse-interval 0.01 --workers 4
+
+Latency specs: "0.01" or "fixed:0.01", "uniform:LOW-HIGH", "exp:MEAN",
+"lognormal:MEDIAN,SIGMA". --workers > 1 forks processes sharing the port
+(SO_REUSEPORT).
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import random
+import signal
+import socket
+
+_REASONS = {200: "OK", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error",
+            502: "Bad Gateway", 503: "Service Unavailable", 504: "Gateway Timeout"}
+MAX_HEADER_BYTES = 64 * 1024
+
+
+def parse_latency(spec):
+    """Latency spec -> zero-argument sampler returning seconds."""
+    spec = str(spec or 0).strip()
+    kind, _, args = spec.partition(":")
+    if not args:
+        kind, args = "fixed", kind
+    rng = random.Random()
+    try:
+        if kind == "fixed":
+            value = float(args)
+            return lambda: value
+        if kind == "uniform":
+            low, high = (float(v) for v in args.split("-", 1))
+            return lambda: rng.uniform(low, high)
+        if kind == "exp":
+            mean = float(args)
+            return lambda: rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+        if kind == "lognormal":
+            median, sigma = (float(v) for v in args.split(",", 1))
+            mu = math.log(median)
+            return lambda: rng.lognormvariate(mu, sigma)
+    except ValueError:
+        pass
+    raise ValueError(f"Invalid latency spec '{spec}' (fixed:S, uniform:LOW-HIGH, exp:MEAN, lognormal:MEDIAN,SIGMA)")
+
+
+def server_settings(latency="0", error_rate=0.0, error_status=500, payload_bytes=64, sse_tokens=20, sse_interval=0.0):
+    return {
+        "latency": latency,
+        "error_rate": error_rate,
+        "error_status": error_status,
+        "payload_bytes": payload_bytes,
+        "sse_tokens": sse_tokens,
+        "sse_interval": sse_interval,
+    }
+
+
+def _response(status, body, content_type="application/json"):
+    reason = _REASONS.get(status, "Unknown")
+    head = (f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n")
+    return head.encode("ascii") + body
+
+
+def _chunk(data):
+    return b"%x\r\n%s\r\n" % (len(data), data)
+
+
+class MockBehaviour:
+    """Pre-rendered responses plus the samplers shared by every connection."""
+
+    def __init__(self, settings):
+        self.delay = parse_latency(settings["latency"])
+        self.error_rate = settings["error_rate"]
+        self.rng = random.Random()
+        filler = "x" * max(settings["payload_bytes"] - len('{"id":1,"data":""}'), 0)
+        self.ok = _response(200, json.dumps({"id": 1, "data": filler}, separators=(",", ":")).encode())
+        self.error = _response(settings["error_status"], b'{"error":"injected failure"}')
+        self.sse_tokens = settings["sse_tokens"]
+        self.sse_interval = settings["sse_interval"]
+        self.sse_head = (b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                         b"Transfer-Encoding: chunked\r\nConnection: keep-alive\r\n\r\n")
+        self.sse_event = _chunk(b'data: {"choices":[{"delta":{"content":"tok"}}]}\n\n')
+        self.sse_done = _chunk(b"data: [DONE]\n\n") + b"0\r\n\r\n"
+
+
+class MockProtocol(asyncio.Protocol):
+    """One keep-alive connection; requests are answered strictly one at a time, in order."""
+
+    def __init__(self, behaviour):
+        self.behaviour = behaviour
+        self.buffer = bytearray()
+        self.transport = None
+        self.busy = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def connection_lost(self, exc):
+        self.transport = None
+
+    def data_received(self, data):
+        self.buffer += data
+        if not self.busy:
+            self._next_request()
+
+    def _next_request(self):
+        end = self.buffer.find(b"\r\n\r\n")
+        if end < 0:
+            if len(self.buffer) > MAX_HEADER_BYTES:
+                self.transport.close()
+            return
+        head = bytes(self.buffer[:end]).decode("latin-1")
+        length = 0
+        for line in head.split("\r\n")[1:]:
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        total = end + 4 + length
+        if len(self.buffer) < total:
+            return
+        del self.buffer[:total]
+        path = head.split(" ", 2)[1]
+        self.busy = True
+        asyncio.ensure_future(self._respond(path))
+
+    async def _respond(self, path):
+        behaviour = self.behaviour
+        delay = behaviour.delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.transport is None:
+            return
+        if behaviour.error_rate and behaviour.rng.random() < behaviour.error_rate:
+            self.transport.write(behaviour.error)
+        elif path.startswith("/sse"):
+            self.transport.write(behaviour.sse_head)
+            for _ in range(behaviour.sse_tokens):
+                if behaviour.sse_interval:
+                    await asyncio.sleep(behaviour.sse_interval)
+                if self.transport is None:
+                    return
+                self.transport.write(behaviour.sse_event)
+            self.transport.write(behaviour.sse_done)
+        else:
+            self.transport.write(behaviour.ok)
+        self.busy = False
+        if self.buffer:
+            self._next_request()
+
+
+def _listening_socket(host, port, reuse_port):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(4096)
+    return sock
+
+
+async def serve(host, port, settings, reuse_port=False):
+    behaviour = MockBehaviour(settings)
+    loop = asyncio.get_running_loop()
+    server = await loop.create_server(lambda: MockProtocol(behaviour), sock=_listening_socket(host, port, reuse_port))
+    async with server:
+        await server.serve_forever()
+
+
+def _run_worker(host, port, settings, reuse_port):
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    try:
+        asyncio.run(serve(host, port, settings, reuse_port))
+    except KeyboardInterrupt:
+        pass
+
+
+def run_server(host, port, settings, workers=1):
+    """Serve until interrupted; workers > 1 forks processes that share the port."""
+    if workers <= 1:
+        _run_worker(host, port, settings, False)
+        return
+    processes = [multiprocessing.Process(target=_run_worker, args=(host, port, settings, True), daemon=True)
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    def stop(signum, frame):
+        # SIGTERM skips multiprocessing's atexit cleanup; without this the workers outlive us and keep the port
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for process in processes:
+            process.join()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock target for benchmarking the load generator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--latency", default="0", help='Response delay, e.g. "0.01", "uniform:0.005-0.02", "lognormal:0.02,0.5"')
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--payload-bytes", type=int, default=64, help="Size of the JSON response body")
+    parser.add_argument("--sse-tokens", type=int, default=20, help="Events per /sse stream")
+    parser.add_argument("--sse-interval", type=float, default=0.0, help="Seconds between /sse events")
+    parser.add_argument("--workers", type=int, default=1, help="Processes sharing the port (SO_REUSEPORT)")
+    args = parser.parse_args()
+
+    settings = server_settings(args.latency, args.error_rate, args.error_status, args.payload_bytes,
+                               args.sse_tokens, args.sse_interval)
+    parse_latency(args.latency)
+    print(f"🎯 Mock target on http://{args.host}:{args.port} (pid {os.getpid()}, {args.workers} worker(s))")
+    run_server(args.host, args.port, settings, args.workers)
+
+
+if __name__ == "__main__":
+    main()
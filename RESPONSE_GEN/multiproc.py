@@ -0,0 +1,76 @@
+import asyncio
+import multiprocessing
+from reporter import new_results, merge_results
+from prepared import corpus_source
+from runner import run_requests_concurrently, run_requests_open_loop
+from scenario import load_scenario
+from resultlog import worker_log_path
+
+
+def _split(total, parts):
+    """Split an integer budget into `parts` near-equal shares, each at least 1."""
+    base, extra = divmod(total, parts)
+    return [max(base + (1 if i < extra else 0), 1) for i in range(parts)]
+
+
+def _worker_seed(seed, index):
+    return None if seed is None else seed + index
+
+
+def _closed_worker(file_path, index, processes, concurrency, repeat, window, seed, pool, streaming,
+                   scenario=None, iterations=None, policy=None, result_log=None):
+    log_path = worker_log_path(result_log, index) if result_log else None
+    if scenario:
+        feed = load_scenario(scenario, _worker_seed(seed, index)).feed(iterations)
+        return asyncio.run(run_requests_concurrently(feed, concurrency, 1, 0, None, pool, streaming, policy=policy,
+                                                     result_log=log_path))
+    # Each process reads the file itself and keeps every `processes`-th request,
+    # so nothing is pickled across and each worker only prepares its own slice
+    shard = corpus_source(file_path, index, processes)
+    return asyncio.run(run_requests_concurrently(shard, concurrency, repeat, window, _worker_seed(seed, index), pool,
+                                                 streaming, policy=policy, result_log=log_path))
+
+
+def _open_worker(file_path, index, processes, stages, arrival, max_in_flight, seed, pool, streaming, scenario=None,
+                 policy=None, result_log=None):
+    log_path = worker_log_path(result_log, index) if result_log else None
+    if scenario:
+        requests = load_scenario(scenario, _worker_seed(seed, index)).feed()
+    else:
+        requests = corpus_source(file_path)
+    # Every worker replays the whole file at its share of the target rate, phase-shifted by
+    # index/processes of its own interval so the workers take turns instead of firing in bursts
+    share = [(duration, start / processes, end / processes) for duration, start, end in stages]
+    return asyncio.run(run_requests_open_loop(requests, share, arrival, max_in_flight, _worker_seed(seed, index), pool,
+                                              streaming, policy=policy, result_log=log_path, phase=index / processes))
+
+
+def run_multiprocess(file_path, processes, mode="closed", concurrency=10, repeat=1, window=0,
+                     stages=None, arrival="constant", max_in_flight=1000, seed=None, pool=None, streaming=False,
+                     scenario=None, iterations=None, policy=None, result_log=None):
+    """Shard a run across worker processes (one event loop and client each) and merge their results.
+
+    With result_log each worker writes its own file (run.rlog -> run.w0.rlog, run.w1.rlog, ...).
+    A closed-loop run uses at most `concurrency` processes, so the total concurrency is never exceeded.
+    """
+    if mode == "open":
+        caps = _split(max_in_flight, processes)
+        jobs = [(file_path, i, processes, stages, arrival, caps[i], seed, pool, streaming, scenario, policy, result_log)
+                for i in range(processes)]
+        target = _open_worker
+    else:
+        # Every process needs at least one slot; more processes would push the total past concurrency
+        processes = max(min(processes, concurrency), 1)
+        slots = _split(concurrency, processes)
+        draws = _split(iterations, processes) if scenario else [None] * processes
+        jobs = [(file_path, i, processes, slots[i], repeat, window, seed, pool, streaming, scenario, draws[i], policy, result_log)
+                for i in range(processes)]
+        target = _closed_worker
+
+    with multiprocessing.Pool(processes) as workers:
+        worker_results = workers.starmap(target, jobs)
+
+    results = new_results()
+    for worker in worker_results:
+        merge_results(results, worker)
+    return results
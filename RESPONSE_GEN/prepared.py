@@ -0,0 +1,93 @@
+import itertools
+import json
+from urllib.parse import urlsplit
+import httpx
+from reporter import endpoint_key
+from resilience import parse_timeout
+from utils import iter_requests, is_jsonl
+
+
+class PreparedRequest:
+    """A generated request compiled once into exactly what the runner sends.
+
+    The body is JSON-encoded to bytes, headers are final and the URL is parsed
+    up front, so repeats reuse the same objects instead of redoing that work
+    on every send.
+    """
+
+    __slots__ = ("method", "url", "headers", "content", "endpoint", "host", "timeout")
+
+    def __init__(self, method, url, headers, content, endpoint, host, timeout=None):
+        set_ = object.__setattr__
+        set_(self, "method", method)
+        set_(self, "url", url)
+        set_(self, "headers", headers)
+        set_(self, "content", content)
+        set_(self, "endpoint", endpoint)
+        set_(self, "host", host)
+        # httpx.Timeout for this request only; None falls back to the endpoint / client default
+        set_(self, "timeout", timeout)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PreparedRequest is immutable")
+
+    def __repr__(self):
+        return f"PreparedRequest({self.method} {self.url})"
+
+
+def encode_body(body):
+    # Same encoding httpx applies for json=..., done once instead of per send
+    return json.dumps(body, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+
+def prepare_request(request):
+    headers = dict(request.get('headers') or {})
+    # Matches the old json=request.get('body', {}) behaviour: a missing body is sent as {}
+    body = request.get('body', {})
+    content = None
+    if body is not None:
+        content = encode_body(body)
+        if not any(k.lower() == "content-type" for k in headers):
+            headers["Content-Type"] = "application/json"
+    return PreparedRequest(
+        method=request['method'].upper(),
+        url=httpx.URL(request['url']),
+        headers=headers,
+        content=content,
+        endpoint=endpoint_key(request),
+        host=urlsplit(request['url']).netloc,
+        timeout=parse_timeout(request['timeout']) if request.get('timeout') is not None else None,
+    )
+
+
+def compile_requests(requests):
+    """Compile raw request dicts (e.g. from utils.load_requests) into a tuple of PreparedRequests."""
+    return tuple(prepare_request(req) for req in requests)
+
+
+def prepare_requests(requests):
+    """Lazily prepare requests one at a time (for streamed corpora)."""
+    return map(prepare_request, requests)
+
+
+def corpus_source(file_path, index=0, processes=1):
+    """Prepared-request source for a corpus file, optionally sharded (every `processes`-th request).
+
+    JSON documents are compiled once, since they are in memory anyway. JSONL
+    corpora return a callable that re-streams and prepares the file on every
+    pass, so memory stays flat for multi-GB corpora. Compiled .corpus files are
+    memory-mapped and decoded on demand.
+    """
+    # Imported here: corpus.py builds on this module
+    from corpus import Corpus, is_corpus
+    if is_corpus(file_path):
+        corpus = Corpus(file_path)
+        return corpus.shard(index, processes) if processes > 1 else corpus
+
+    def shard():
+        requests = iter_requests(file_path)
+        return itertools.islice(requests, index, None, processes) if processes > 1 else requests
+
+    if is_jsonl(file_path):
+        return lambda: prepare_requests(shard())
+    return compile_requests(shard())
@@ -1,24 +1,326 @@
-def record_result(results, success, elapsed_time, status_or_error):
+import re
+from urllib.parse import urlsplit
+from config import MAX_ENDPOINTS
+from errors import ErrorAggregator
+from histogram import Histogram
+from tracing import PHASES
+from resultlog import ResultLog
+
+# Path segments that look like ids (numbers, uuids, long hex) are collapsed so
+# /users/5 and /users/7 report as one endpoint
+_ID_SEGMENT = re.compile(r'^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F-]{27}|[0-9a-fA-F]{16,})$')
+
+def new_results():
+    return {
+        "success": 0,
+        "fail": 0,
+        "latency": Histogram(),
+        "status_codes": {},
+        "status_latency": {},
+        "endpoints": {},
+        "errors": ErrorAggregator(),
+        "lag": Histogram(),
+        "connections": {"new": 0, "reused": 0},
+        "phases": {},
+        "stream": _new_stream(),
+        "journeys": {},
+        # How every first attempt ended (ok, http_5xx, read_timeout, connect_error, ...)
+        "outcomes": {},
+        # Retry attempts are kept out of the first-attempt stats above
+        "retries": {"attempts": 0, "recovered": 0, "exhausted": 0, "outcomes": {}, "latency": Histogram()},
+        "elapsed": 0.0,
+        # Set by live.LiveMetrics; swapped out for a fresh one every interval
+        "window": None,
+        # Optional per-attempt resultlog.ResultLog sink, open only while a run is going
+        "log": None,
+    }
+
+def new_window():
+    return {"success": 0, "fail": 0, "latency": Histogram()}
+
+def _new_stream():
+    return {
+        "requests": 0,
+        "tokens": 0,
+        "ttft": Histogram(),
+        "itl": Histogram(),
+        # Rates, not seconds, but the same log buckets work for any positive value
+        "tokens_per_sec": Histogram(highest=1_000_000.0),
+    }
+
+def _new_journey():
+    return {"completed": 0, "aborted": 0, "latency": Histogram()}
+
+def _new_endpoint():
+    return {"success": 0, "fail": 0, "latency": Histogram(), "status_codes": {}, "phases": {}}
+
+def endpoint_key(request):
+    path = urlsplit(request['url']).path or '/'
+    path = '/'.join('{id}' if _ID_SEGMENT.match(seg) else seg for seg in path.split('/'))
+    return f"{request['method'].upper()} {path}"
+
+def _endpoint_stats(results, endpoint):
+    endpoints = results['endpoints']
+    stats = endpoints.get(endpoint)
+    if stats is None:
+        # Bound the number of tracked endpoints so memory stays constant
+        if len(endpoints) >= MAX_ENDPOINTS:
+            endpoint = "OTHER"
+            stats = endpoints.get(endpoint)
+        if stats is None:
+            stats = endpoints[endpoint] = _new_endpoint()
+    return stats
+
+def record_result(results, success, elapsed_time, status_or_error, endpoint=None, request=None):
+    stats = _endpoint_stats(results, endpoint) if endpoint else None
+    window = results['window']
+    if window is not None:
+        if success:
+            window['success'] += 1
+            window['latency'].record(elapsed_time)
+        else:
+            window['fail'] += 1
     if success:
         results['success'] += 1
-        results['times'].append(elapsed_time)
+        results['latency'].record(elapsed_time)
         results['status_codes'][status_or_error] = results['status_codes'].get(status_or_error, 0) + 1
+        status_hist = results['status_latency'].get(status_or_error)
+        if status_hist is None:
+            status_hist = results['status_latency'][status_or_error] = Histogram()
+        status_hist.record(elapsed_time)
+        if stats:
+            stats['success'] += 1
+            stats['latency'].record(elapsed_time)
+            stats['status_codes'][status_or_error] = stats['status_codes'].get(status_or_error, 0) + 1
     else:
         results['fail'] += 1
-        results['errors'].append(status_or_error)
+        results['errors'].record(status_or_error, request)
+        if stats:
+            stats['fail'] += 1
+
+def open_result_log(results, path):
+    if path:
+        results['log'] = ResultLog(path)
+
+def close_result_log(results):
+    # Closed and dropped before results are merged, pickled or serialised
+    log = results['log']
+    if log is not None:
+        log.close()
+        results['log'] = None
+
+def record_lag(results, lag):
+    # How far behind its scheduled send time a request actually went out (open-loop mode)
+    results['lag'].record(lag)
+
+def _record_phase(phases, name, seconds):
+    hist = phases.get(name)
+    if hist is None:
+        hist = phases[name] = Histogram()
+    hist.record(seconds)
+
+def record_trace(results, trace, endpoint=None):
+    # Connection reuse plus a per-phase breakdown (connect, tls, send, wait, ttfb, body)
+    if trace.new_connection:
+        results['connections']['new'] += 1
+    else:
+        results['connections']['reused'] += 1
+    stats = _endpoint_stats(results, endpoint) if endpoint else None
+    for name, seconds in trace.phases():
+        _record_phase(results['phases'], name, seconds)
+        if stats:
+            _record_phase(stats['phases'], name, seconds)
+
+def record_stream(results, tokens, first_token, last_token, start):
+    # Per-request decode rate is measured from the first token to the last one
+    stream = results['stream']
+    stream['requests'] += 1
+    stream['tokens'] += tokens
+    if tokens > 1 and last_token > first_token:
+        stream['tokens_per_sec'].record((tokens - 1) / (last_token - first_token))
+    elif tokens and last_token > start:
+        stream['tokens_per_sec'].record(tokens / (last_token - start))
+
+def record_outcome(results, outcome):
+    results['outcomes'][outcome] = results['outcomes'].get(outcome, 0) + 1
+
+def record_retry(results, outcome, elapsed=None):
+    retries = results['retries']
+    retries['attempts'] += 1
+    retries['outcomes'][outcome] = retries['outcomes'].get(outcome, 0) + 1
+    if elapsed is not None:
+        retries['latency'].record(elapsed)
+
+def record_retry_result(results, recovered):
+    # Once per request that was retried: did a retry eventually succeed?
+    results['retries']['recovered' if recovered else 'exhausted'] += 1
+
+def record_journey(results, name, completed, elapsed=None):
+    # End-to-end time of a scripted journey, think times included
+    stats = results['journeys'].get(name)
+    if stats is None:
+        stats = results['journeys'][name] = _new_journey()
+    if completed:
+        stats['completed'] += 1
+        stats['latency'].record(elapsed)
+    else:
+        stats['aborted'] += 1
+
+def _merge_phases(into, other):
+    for name, hist in other.items():
+        into.setdefault(name, Histogram()).merge(hist)
+
+def _merge_counts(into, other):
+    for key, count in other.items():
+        into[key] = into.get(key, 0) + count
+
+def merge_results(into, other):
+    """Fold another run's (or worker's) results into `into`."""
+    into['success'] += other['success']
+    into['fail'] += other['fail']
+    into['latency'].merge(other['latency'])
+    into['lag'].merge(other['lag'])
+    _merge_phases(into['phases'], other['phases'])
+    for key in ('requests', 'tokens'):
+        into['stream'][key] += other['stream'][key]
+    for key in ('ttft', 'itl', 'tokens_per_sec'):
+        into['stream'][key].merge(other['stream'][key])
+    _merge_counts(into['connections'], other['connections'])
+    _merge_counts(into['status_codes'], other['status_codes'])
+    _merge_counts(into['outcomes'], other['outcomes'])
+    for key in ('attempts', 'recovered', 'exhausted'):
+        into['retries'][key] += other['retries'][key]
+    _merge_counts(into['retries']['outcomes'], other['retries']['outcomes'])
+    into['retries']['latency'].merge(other['retries']['latency'])
+    for status, hist in other['status_latency'].items():
+        into['status_latency'].setdefault(status, Histogram()).merge(hist)
+    for endpoint, stats in other['endpoints'].items():
+        target = _endpoint_stats(into, endpoint)
+        target['success'] += stats['success']
+        target['fail'] += stats['fail']
+        target['latency'].merge(stats['latency'])
+        _merge_counts(target['status_codes'], stats['status_codes'])
+        _merge_phases(target['phases'], stats['phases'])
+    for name, stats in other['journeys'].items():
+        target = into['journeys'].setdefault(name, _new_journey())
+        target['completed'] += stats['completed']
+        target['aborted'] += stats['aborted']
+        target['latency'].merge(stats['latency'])
+    into['errors'].merge(other['errors'])
+    # Workers run side by side, so the merged run lasts as long as the slowest one
+    into['elapsed'] = max(into['elapsed'], other['elapsed'])
+    return into
+
+def _encode(value):
+    if isinstance(value, Histogram):
+        return {"__histogram__": value.to_dict()}
+    if isinstance(value, ErrorAggregator):
+        return {"__errors__": value.to_dict()}
+    if isinstance(value, dict):
+        # Status codes are int keys, which JSON objects can't keep
+        return {"__items__": [[k, _encode(v)] for k, v in value.items()]}
+    return value
+
+def _decode(value):
+    if isinstance(value, dict):
+        if "__histogram__" in value:
+            return Histogram.from_dict(value["__histogram__"])
+        if "__errors__" in value:
+            return ErrorAggregator.from_dict(value["__errors__"])
+        return {k: _decode(v) for k, v in value["__items__"]}
+    return value
+
+def results_to_dict(results):
+    """JSON-safe copy of a results dict (histograms and error classes included)."""
+    return _encode({k: v for k, v in results.items() if k not in ('window', 'log')})
+
+def results_from_dict(data):
+    results = _decode(data)
+    results['window'] = None
+    results['log'] = None
+    return results
+
+def _format_latency(hist):
+    s = hist.summary()
+    return (f"p50 {s['p50']:.3f}s  p90 {s['p90']:.3f}s  p99 {s['p99']:.3f}s  "
+            f"p99.9 {s['p99.9']:.3f}s  max {s['max']:.3f}s")
+
+def _print_phases(phases, indent=""):
+    for name, _, _ in PHASES:
+        hist = phases.get(name)
+        if hist and hist.count:
+            print(f"{indent}{name:<8} n={hist.count:<8} {_format_latency(hist)}")
 
 def print_summary(results):
     total = results['success'] + results['fail']
-    avg_time = sum(results['times']) / len(results['times']) if results['times'] else 0
+    latency = results['latency']
 
     print("\n📊 Load Test Summary")
     print("--------------------")
     print(f"Total Requests  : {total}")
     print(f"Successful       : {results['success']}")
     print(f"Failed           : {results['fail']}")
-    print(f"Avg Response Time: {avg_time:.2f}s")
+    print(f"Avg Response Time: {latency.mean():.2f}s")
+    if results['elapsed']:
+        print(f"Throughput       : {total / results['elapsed']:.1f} req/s over {results['elapsed']:.1f}s")
+    print(f"Latency          : {_format_latency(latency)}")
     print(f"Status Codes     : {results['status_codes']}")
-    if results['errors']:
-        print(f"\nErrors:\n--------")
-        for err in results['errors']:
-            print(f"❌ {err}")
+    if results['outcomes']:
+        print(f"Outcomes         : {dict(sorted(results['outcomes'].items(), key=lambda kv: -kv[1]))}")
+    retries = results['retries']
+    if retries['attempts']:
+        print(f"Retries          : {retries['attempts']} attempts, {retries['recovered']} recovered, "
+              f"{retries['exhausted']} exhausted  {retries['outcomes']}")
+        print(f"Retry Latency    : {_format_latency(retries['latency'])}")
+    lag = results['lag']
+    if lag.count:
+        print(f"Schedule Lag     : avg {lag.mean():.4f}s, p99 {lag.percentile(99):.4f}s, max {lag.max:.4f}s")
+
+    conns = results['connections']
+    if conns['new'] or conns['reused']:
+        print(f"Connections      : {conns['new']} new, {conns['reused']} reused")
+
+    stream = results['stream']
+    if stream['requests']:
+        tps = stream['tokens_per_sec']
+        print("\nStreaming:\n----------")
+        print(f"Streamed Requests: {stream['requests']}")
+        print(f"Total Tokens     : {stream['tokens']}")
+        if results['elapsed']:
+            print(f"Aggregate Rate   : {stream['tokens'] / results['elapsed']:.1f} tokens/s")
+        print(f"Time To 1st Token: {_format_latency(stream['ttft'])}")
+        print(f"Inter-Token      : {_format_latency(stream['itl'])}")
+        if tps.count:
+            print(f"Tokens/s per Req : p50 {tps.percentile(50):.1f}  p10 {tps.percentile(10):.1f}  "
+                  f"min {tps.min:.1f}  max {tps.max:.1f}")
+
+    if results['phases']:
+        print("\nPhase Breakdown:\n----------------")
+        _print_phases(results['phases'])
+
+    if len(results['status_latency']) > 1:
+        print("\nBy Status Code:\n---------------")
+        for status, hist in sorted(results['status_latency'].items(), key=lambda kv: str(kv[0])):
+            print(f"{status}  n={hist.count}  {_format_latency(hist)}")
+
+    if results['endpoints']:
+        print("\nBy Endpoint:\n------------")
+        for endpoint, stats in sorted(results['endpoints'].items()):
+            print(f"{endpoint}  ok={stats['success']} fail={stats['fail']}  {_format_latency(stats['latency'])}")
+            _print_phases(stats['phases'], indent="    ")
+
+    if results['journeys']:
+        print("\nJourneys:\n---------")
+        for name, stats in sorted(results['journeys'].items()):
+            print(f"{name}  completed={stats['completed']} aborted={stats['aborted']}  {_format_latency(stats['latency'])}")
+
+    errors = results['errors']
+    if errors:
+        print(f"\nErrors ({errors.total} total, {len(errors.classes)} distinct):\n--------")
+        for etype, message, entry in errors.top(10):
+            seen = entry['last_seen'] - entry['first_seen']
+            print(f"❌ {entry['count']:>8}x  {etype}: {message}  (over {seen:.1f}s)")
+            for sample in entry['samples']:
+                print(f"      e.g. {sample}")
+        if len(errors.classes) > 10:
+            print(f"   ... and {len(errors.classes) - 10} more error classes")
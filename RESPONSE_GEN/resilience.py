@@ -0,0 +1,168 @@
+"""Timeout budgets, retries and per-host circuit breaking for the runner.
+
+Every attempt ends in an outcome: "ok", "http_4xx", "http_5xx", a specific
+timeout ("connect_timeout", "read_timeout", "write_timeout", "pool_timeout"),
+"connect_error", "protocol_error", "circuit_open" or "other". Outcomes drive
+retries and the breaker, and are counted in the results.
+"""
+import random
+import time
+import httpx
+from config import TIMEOUT, CONNECT_TIMEOUT, READ_TIMEOUT, POOL_TIMEOUT, ENDPOINT_TIMEOUTS
+from config import RETRIES, RETRY_BACKOFF, RETRY_BACKOFF_MAX, BREAKER_THRESHOLD, BREAKER_COOLDOWN
+
+# Failures that say something about the target's health (not about the request)
+_UNHEALTHY = frozenset({"http_5xx", "connect_timeout", "read_timeout", "write_timeout",
+                        "pool_timeout", "connect_error", "protocol_error"})
+_RETRYABLE = _UNHEALTHY | {"http_429"}
+_TIMEOUTS = (
+    (httpx.ConnectTimeout, "connect_timeout"),
+    (httpx.ReadTimeout, "read_timeout"),
+    (httpx.WriteTimeout, "write_timeout"),
+    (httpx.PoolTimeout, "pool_timeout"),
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised in place of sending a request while the target's breaker is open."""
+
+
+def classify_outcome(response=None, error=None):
+    if error is not None:
+        for error_type, outcome in _TIMEOUTS:
+            if isinstance(error, error_type):
+                return outcome
+        if isinstance(error, CircuitOpenError):
+            return "circuit_open"
+        if isinstance(error, httpx.ConnectError):
+            return "connect_error"
+        if isinstance(error, (httpx.RemoteProtocolError, httpx.ReadError, httpx.WriteError)):
+            return "protocol_error"
+        return "other"
+    status = response.status_code
+    if status == 429:
+        return "http_429"
+    if status >= 500:
+        return "http_5xx"
+    if status >= 400:
+        return "http_4xx"
+    return "ok"
+
+
+def build_timeout(timeout=TIMEOUT, connect=CONNECT_TIMEOUT, read=READ_TIMEOUT, pool=POOL_TIMEOUT):
+    """httpx.Timeout from a default plus optional connect/read/pool overrides."""
+    return httpx.Timeout(timeout, connect=connect if connect is not None else timeout,
+                         read=read if read is not None else timeout,
+                         pool=pool if pool is not None else timeout)
+
+
+def parse_timeout(spec):
+    """A number of seconds, or a {"timeout", "connect", "read", "pool"} dict, as httpx.Timeout."""
+    if isinstance(spec, dict):
+        default = spec.get("timeout", TIMEOUT)
+        return build_timeout(default, spec.get("connect"), spec.get("read"), spec.get("pool"))
+    return httpx.Timeout(float(spec))
+
+
+def parse_endpoint_timeouts(specs):
+    """["GET /users/{id}=2", "POST /upload=30"] -> {"GET /users/{id}": 2.0, "POST /upload": 30.0}."""
+    timeouts = {}
+    for spec in specs or ():
+        endpoint, sep, seconds = spec.rpartition("=")
+        if not sep or not endpoint.strip():
+            raise ValueError(f"Invalid endpoint timeout '{spec}' (expected 'METHOD /path=seconds')")
+        try:
+            timeouts[endpoint.strip()] = float(seconds)
+        except ValueError:
+            raise ValueError(f"Invalid endpoint timeout '{spec}' (expected 'METHOD /path=seconds')")
+    return timeouts
+
+
+def policy_settings(timeout=TIMEOUT, connect=CONNECT_TIMEOUT, read=READ_TIMEOUT, pool=POOL_TIMEOUT,
+                    endpoint_timeouts=None, retries=RETRIES, backoff=RETRY_BACKOFF, backoff_max=RETRY_BACKOFF_MAX,
+                    breaker_threshold=BREAKER_THRESHOLD, breaker_cooldown=BREAKER_COOLDOWN):
+    return {
+        "timeout": timeout,
+        "connect": connect,
+        "read": read,
+        "pool": pool,
+        "endpoint_timeouts": dict(ENDPOINT_TIMEOUTS if endpoint_timeouts is None else endpoint_timeouts),
+        "retries": retries,
+        "backoff": backoff,
+        "backoff_max": backoff_max,
+        "breaker_threshold": breaker_threshold,
+        "breaker_cooldown": breaker_cooldown,
+    }
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open (fail fast) -> half-open (one probe) -> closed."""
+
+    __slots__ = ("threshold", "cooldown", "failures", "opened_at", "probing")
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def allow(self):
+        if self.opened_at is None:
+            return True
+        if self.probing or time.monotonic() - self.opened_at < self.cooldown:
+            return False
+        # Cooldown over: let a single probe through
+        self.probing = True
+        return True
+
+    def record(self, outcome):
+        if outcome in _UNHEALTHY:
+            self.failures += 1
+            if self.probing or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+        elif outcome != "circuit_open":
+            self.failures = 0
+            self.opened_at = None
+        self.probing = False
+
+
+class RequestPolicy:
+    """Per-run timeout, retry and breaker state shared by every request of one runner."""
+
+    def __init__(self, settings=None):
+        settings = settings or policy_settings()
+        self.client_timeout = build_timeout(settings["timeout"], settings["connect"], settings["read"], settings["pool"])
+        self.endpoint_timeouts = {endpoint: parse_timeout(spec) for endpoint, spec in settings["endpoint_timeouts"].items()}
+        self.retries = settings["retries"]
+        self.backoff = settings["backoff"]
+        self.backoff_max = settings["backoff_max"]
+        self.breaker_threshold = settings["breaker_threshold"]
+        self.breaker_cooldown = settings["breaker_cooldown"]
+        self._breakers = {}
+        self._rng = random.Random()
+
+    def timeout_for(self, request):
+        """Request-level timeout, then endpoint-level, else None (the client default applies)."""
+        return request.timeout or self.endpoint_timeouts.get(request.endpoint)
+
+    def breaker(self, host):
+        if not self.breaker_threshold:
+            return None
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_cooldown)
+        return breaker
+
+    def should_retry(self, outcome, attempt):
+        return attempt < self.retries and outcome in _RETRYABLE
+
+    def backoff_delay(self, attempt):
+        # "Full jitter": spreads retries out so they don't arrive at the target in waves
+        return self._rng.uniform(0, min(self.backoff_max, self.backoff * 2 ** attempt))
+
+
+def send_options(request, policy):
+    # Only pass timeout= when one is set: timeout=None would mean "no timeout" to httpx
+    timeout = policy.timeout_for(request) if policy else request.timeout
+    return {"timeout": timeout} if timeout is not None else {}
@@ -0,0 +1,200 @@
+"""Append-only, columnar per-request result log with memory-mapped readback.
+
+Every attempt becomes one row: send time, endpoint, outcome, attempt number,
+status, latency, the trace phases and bytes sent/received. Rows are
+buffered column-by-column in typed arrays and written out as blocks of
+RESULT_LOG_BLOCK rows, so the hot path is a dozen array appends.
+
+Layout (little endian):
+
+    header : magic b"LLMRLOG1", version u32
+    'E' id u16, length u16, utf-8    endpoint name for an id (written on first use)
+    'O' id u16, length u16, utf-8    outcome name for an id
+    'B' rows u32, padding to 8 bytes, then each column's values back to back
+
+Columns are ordered by item size, so every column in a block stays aligned
+and is read back as a zero-copy memoryview of the mmap.
+"""
+import mmap
+import struct
+import sys
+from array import array
+from tracing import PHASES
+from config import RESULT_LOG_BLOCK
+
+MAGIC = b"LLMRLOG1"
+VERSION = 1
+RESULT_LOG_SUFFIX = ".rlog"
+_HEADER = struct.Struct("<8sI")
+_NAME = struct.Struct("<HH")
+_BLOCK = struct.Struct("<I")
+NAN = float("nan")
+
+# (column, array typecode), widest first to keep every column aligned
+COLUMNS = (
+    ("time", "d"),
+    ("latency", "f"),
+    *((phase, "f") for phase, _, _ in PHASES),
+    ("bytes_out", "I"),
+    ("bytes_in", "I"),
+    ("endpoint", "H"),
+    ("status", "H"),
+    ("outcome", "B"),
+    ("attempt", "B"),
+)
+PHASE_NAMES = tuple(phase for phase, _, _ in PHASES)
+# Names past what an id column can hold share one id, as the reporter does for endpoints
+OTHER = "OTHER"
+_ID_LIMITS = {name: 1 << 8 * array(code).itemsize for name, code in COLUMNS if name in ("endpoint", "outcome")}
+
+
+def _suffixed_path(path, suffix):
+    path = str(path)
+    stem = path[:-len(RESULT_LOG_SUFFIX)] if path.endswith(RESULT_LOG_SUFFIX) else path
+    return f"{stem}.{suffix}{RESULT_LOG_SUFFIX}"
+
+
+def worker_log_path(path, index):
+    """Per-process log file name for multi-process runs: run.rlog -> run.w0.rlog."""
+    return _suffixed_path(path, f"w{index}")
+
+
+def step_log_path(path, step):
+    """Per-step log file name for capacity searches: run.rlog -> run.step1.rlog."""
+    return _suffixed_path(path, f"step{step}")
+
+
+class ResultLog:
+    """Writer. append() is called once per attempt; full blocks are written as they fill."""
+
+    def __init__(self, path, block_size=RESULT_LOG_BLOCK):
+        self.path = str(path)
+        self.block_size = block_size
+        self._file = open(self.path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION))
+        self._columns = {name: array(code) for name, code in COLUMNS}
+        self._endpoints = {}
+        self._outcomes = {}
+        self.rows = 0
+        # Bound once: append() runs for every request
+        c = self._columns
+        self._time, self._latency = c["time"].append, c["latency"].append
+        self._phases = tuple(c[name].append for name in PHASE_NAMES)
+        self._bytes_out, self._bytes_in = c["bytes_out"].append, c["bytes_in"].append
+        self._endpoint, self._status = c["endpoint"].append, c["status"].append
+        self._outcome, self._attempt = c["outcome"].append, c["attempt"].append
+
+    def _name_id(self, names, tag, name, limit):
+        ident = names.get(name)
+        if ident is None:
+            # Keep the last id free for OTHER so the column can never overflow
+            if len(names) >= limit - 1:
+                name = OTHER
+                ident = names.get(name)
+            if ident is None:
+                ident = names[name] = len(names)
+                data = name.encode("utf-8")
+                self._file.write(tag + _NAME.pack(ident, len(data)) + data)
+        return ident
+
+    def append(self, sent_at, endpoint, outcome, status=0, latency=None, trace=None, bytes_out=0, bytes_in=0, attempt=0):
+        self._time(sent_at)
+        self._latency(NAN if latency is None else latency)
+        phases = dict(trace.phases()) if trace is not None else {}
+        for name, add in zip(PHASE_NAMES, self._phases):
+            add(phases.get(name, NAN))
+        self._bytes_out(bytes_out)
+        self._bytes_in(min(bytes_in, 0xFFFFFFFF))
+        self._endpoint(self._name_id(self._endpoints, b"E", endpoint or "", _ID_LIMITS["endpoint"]))
+        self._status(status)
+        self._outcome(self._name_id(self._outcomes, b"O", outcome, _ID_LIMITS["outcome"]))
+        self._attempt(min(attempt, 255))
+        self.rows += 1
+        if len(self._columns["time"]) >= self.block_size:
+            self.flush()
+
+    def flush(self):
+        rows = len(self._columns["time"])
+        if not rows:
+            return
+        f = self._file
+        f.write(b"B" + _BLOCK.pack(rows))
+        f.write(b"\0" * (-f.tell() % 8))
+        for name, code in COLUMNS:
+            column = self._columns[name]
+            if sys.byteorder != "little":
+                column.byteswap()
+            column.tofile(f)
+            del column[:]
+        f.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+class ResultLogReader:
+    """mmap'd reader: blocks() yields {column: memoryview} without copying the data."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._file = open(self.path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} result log")
+        self.endpoints = {}
+        self.outcomes = {}
+        self._blocks = []
+        self._index()
+
+    def _index(self):
+        mm, view = self._mm, memoryview(self._mm)
+        pos, end = _HEADER.size, len(mm)
+        while pos < end:
+            tag = mm[pos:pos + 1]
+            pos += 1
+            if tag in (b"E", b"O"):
+                ident, length = _NAME.unpack_from(mm, pos)
+                pos += _NAME.size
+                names = self.endpoints if tag == b"E" else self.outcomes
+                names[ident] = mm[pos:pos + length].decode("utf-8")
+                pos += length
+            elif tag == b"B":
+                (rows,) = _BLOCK.unpack_from(mm, pos)
+                pos += _BLOCK.size
+                pos += -pos % 8
+                block = {}
+                for name, code in COLUMNS:
+                    size = rows * array(code).itemsize
+                    if pos + size > end:
+                        # Truncated final block (the writer was killed mid-write): stop here
+                        return
+                    block[name] = view[pos:pos + size].cast(code)
+                    pos += size
+                self._blocks.append(block)
+            else:
+                raise ValueError(f"{self.path}: corrupt record at byte {pos - 1}")
+
+    def __len__(self):
+        return sum(len(block["time"]) for block in self._blocks)
+
+    def blocks(self):
+        return iter(self._blocks)
+
+    def rows(self):
+        """Rows as dicts with endpoint/outcome names resolved (convenient, not fast)."""
+        for block in self._blocks:
+            for i in range(len(block["time"])):
+                row = {name: block[name][i] for name, _ in COLUMNS}
+                row["endpoint"] = self.endpoints[row["endpoint"]]
+                row["outcome"] = self.outcomes[row["outcome"]]
+                yield row
+
+    def close(self):
+        for block in self._blocks:
+            for column in block.values():
+                column.release()
+        self._blocks = []
+        self._mm.close()
+        self._file.close()
@@ -1,35 +1,171 @@
-import httpx
 import asyncio
+import contextlib
 import time
-from config import TIMEOUT, REPEAT
-from reporter import record_result
+from config import REPEAT, SHUFFLE_WINDOW, SEED, MAX_IN_FLIGHT, STREAMING
+from feed import build_feed, cycle_requests
+from client import build_client, HostLimiter, pool_settings
+from reporter import new_results, record_result, record_lag, record_trace, record_outcome, record_retry, record_retry_result
+from reporter import open_result_log, close_result_log
+from resilience import RequestPolicy, CircuitOpenError, classify_outcome, send_options
+from tracing import RequestTrace
+from scheduler import arrival_times
+from streaming import hit_streaming_endpoint
+from live import start_live
 
-async def hit_endpoint(session, request, results):
-    url = request['url']
-    method = request['method'].lower()
-    headers = request.get('headers', {})
-    body = request.get('body', {})
+_UNLIMITED = contextlib.nullcontext()
 
-    try:
-        start = time.monotonic()
-        response = await session.request(method, url, headers=headers, json=body, timeout=TIMEOUT)
-        elapsed = time.monotonic() - start
+async def _attempt(session, request, results, slot, breaker, options, scheduled=None, attempt=0):
+    """Send once and record it: first attempts go to the main stats, retries to results['retries']."""
+    endpoint = request.endpoint
+    retry = attempt > 0
+    log = results['log']
+    if breaker and not breaker.allow():
+        if retry:
+            record_retry(results, "circuit_open")
+        else:
+            record_result(results, False, None, CircuitOpenError(f"circuit open for {request.host}"), endpoint, request)
+        if log is not None:
+            log.append(time.time(), endpoint, "circuit_open", attempt=attempt)
+        return None, "circuit_open"
 
-        record_result(results, True, elapsed, response.status_code)
+    trace = RequestTrace()
+    response = error = elapsed = None
+    sent_at = None
+    try:
+        async with slot:
+            start = time.monotonic()
+            sent_at = time.time()
+            if scheduled is not None:
+                # Open-loop: latency counts from when the request *should* have gone out,
+                # so a slow target can't hide queueing delay (coordinated omission)
+                record_lag(results, max(start - scheduled, 0.0))
+                sent_at -= start - scheduled
+                start = scheduled
+            response = await session.request(request.method, request.url, headers=request.headers,
+                                             content=request.content, extensions={"trace": trace}, **options)
+            elapsed = time.monotonic() - start
     except Exception as e:
-        record_result(results, False, None, str(e))
+        error = e
+
+    outcome = classify_outcome(response, error)
+    if breaker:
+        breaker.record(outcome)
+    if retry:
+        record_retry(results, outcome, elapsed)
+    elif error is None:
+        record_result(results, True, elapsed, response.status_code, endpoint)
+        record_trace(results, trace, endpoint)
+    else:
+        record_result(results, False, None, error, endpoint, request)
+    if log is not None:
+        log.append(sent_at or time.time(), endpoint, outcome,
+                   response.status_code if response is not None else 0, elapsed, trace,
+                   len(request.content or b""), response.num_bytes_downloaded if response is not None else 0, attempt)
+    return response, outcome
+
+async def hit_endpoint(session, request, results, scheduled=None, limiter=None, policy=None):
+    # `request` is a PreparedRequest: body bytes, headers and URL are already final
+    slot = limiter.slot(request.host) if limiter else _UNLIMITED
+    breaker = policy.breaker(request.host) if policy else None
+    options = send_options(request, policy)
+
+    response, outcome = await _attempt(session, request, results, slot, breaker, options, scheduled)
+    record_outcome(results, outcome)
+    attempt = 0
+    while policy and policy.should_retry(outcome, attempt):
+        await asyncio.sleep(policy.backoff_delay(attempt))
+        attempt += 1
+        response, outcome = await _attempt(session, request, results, slot, breaker, options, attempt=attempt)
+    if attempt:
+        record_retry_result(results, outcome == "ok")
+    return response
+
+async def run_requests_concurrently(requests, concurrency, repeat=REPEAT, window=SHUFFLE_WINDOW, seed=SEED,
+                                    pool=None, streaming=STREAMING, live=None, policy=None, results=None, result_log=None):
+    # `results` may be passed in so a caller can read it while the run is going
+    results = results if results is not None else new_results()
+    open_result_log(results, result_log)
+    hit = hit_streaming_endpoint if streaming else hit_endpoint
+    pool = pool or pool_settings()
+    policy = RequestPolicy(policy)
+
+    connector = build_client(pool, default_connections=concurrency, timeout=policy.client_timeout)
+    limiter = HostLimiter(pool["max_per_host"]) if pool["max_per_host"] else None
+    # Prepared requests are pulled lazily from one shared feed, so memory stays
+    # flat however many repeats are asked for. A sequence or a callable
+    # re-reading the source is needed when repeat > 1.
+    feed = build_feed(requests, repeat, window, seed)
 
-async def run_requests_concurrently(requests, concurrency):
-    results = {"success": 0, "fail": 0, "times": [], "status_codes": {}, "errors": []}
-    
-    connector = httpx.AsyncClient()
-    sem = asyncio.Semaphore(concurrency)
+    async def worker():
+        for req in feed:
+            # Scenario journeys are callables that drive their own requests
+            if callable(req):
+                await req(connector, results, limiter=limiter, policy=policy)
+            else:
+                await hit(connector, req, results, limiter=limiter, policy=policy)
 
-    async def sem_task(req):
-        async with sem:
-            await hit_endpoint(connector, req, results)
+    metrics = await start_live(results, live)
+    start = time.monotonic()
+    try:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        # Also on Ctrl-C or cancellation, so the buffered result log block is kept
+        results['elapsed'] = time.monotonic() - start
+        if metrics:
+            await metrics.stop()
+        close_result_log(results)
+        await connector.aclose()
+    return results
+
+async def run_requests_open_loop(requests, stages, arrival="constant", max_in_flight=MAX_IN_FLIGHT, seed=SEED,
+                                 pool=None, streaming=STREAMING, live=None, policy=None, results=None, result_log=None,
+                                 phase=0.0):
+    """Fire requests on a fixed arrival schedule, regardless of how fast responses come back."""
+    results = results if results is not None else new_results()
+    open_result_log(results, result_log)
+    hit = hit_streaming_endpoint if streaming else hit_endpoint
+    feed = cycle_requests(requests)
+
+    pool = pool or pool_settings()
+    policy = RequestPolicy(policy)
+    connector = build_client(pool, default_connections=max_in_flight, timeout=policy.client_timeout)
+    limiter = HostLimiter(pool["max_per_host"]) if pool["max_per_host"] else None
+    slots = asyncio.Semaphore(max_in_flight)
+    in_flight = set()
+
+    async def fire(req, scheduled):
+        try:
+            if callable(req):
+                await req(connector, results, scheduled, limiter, policy)
+            else:
+                await hit(connector, req, results, scheduled, limiter, policy)
+        finally:
+            slots.release()
+
+    metrics = await start_live(results, live)
+    start = time.monotonic()
+    try:
+        for offset in arrival_times(stages, arrival, seed, phase):
+            scheduled = start + offset
+            # sleep(0) still yields when we're behind, so in-flight requests keep progressing
+            await asyncio.sleep(max(scheduled - time.monotonic(), 0))
+            req = next(feed, None)
+            if req is None:
+                break
+            await slots.acquire()
+            task = asyncio.create_task(fire(req, scheduled))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
 
-    tasks = [sem_task(req) for _ in range(REPEAT) for req in requests]
-    await asyncio.gather(*tasks)
-    await connector.aclose()
+        if in_flight:
+            await asyncio.gather(*in_flight)
+    finally:
+        # Interrupted: don't leave requests running once the run has returned
+        for task in list(in_flight):
+            task.cancel()
+        results['elapsed'] = time.monotonic() - start
+        if metrics:
+            await metrics.stop()
+        close_result_log(results)
+        await connector.aclose()
     return results
@@ -0,0 +1,204 @@
+"""Weighted traffic mixes and multi-step user journeys.
+
+A scenario file is JSON:
+
+    {
+      "mix": [
+        {"name": "read",   "weight": 70, "requests": "users.corpus"},
+        {"name": "search", "weight": 25, "requests": "search.jsonl"},
+        {"name": "create", "weight": 5,  "journey": [
+            {"request": {"method": "POST", "url": "http://api/posts", "body": {"title": "t"}},
+             "extract": {"post_id": "id"}, "think": 0.5},
+            {"request": {"method": "GET", "url": "http://api/posts/{{post_id}}"}, "think": [0.2, 1.0]}
+        ]}
+      ]
+    }
+
+Request files are resolved relative to the scenario file. Each draw picks a
+mix entry from a precomputed alias table and then a uniformly random request
+from it, both O(1). Journey steps may use {{name}} placeholders for values
+extracted (by dotted path into the JSON response) from earlier steps, and
+wait `think` seconds (fixed, or a [min, max] range) after each step.
+"""
+import asyncio
+import json
+import random
+import re
+import time
+from pathlib import Path
+from corpus import Corpus, is_corpus
+from prepared import compile_requests, prepare_request
+from reporter import record_journey
+from runner import hit_endpoint
+from utils import iter_requests
+
+_PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}")
+
+
+class AliasTable:
+    """Vose's alias method: O(n) setup, O(1) weighted draws."""
+
+    __slots__ = ("prob", "alias")
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0 or any(w < 0 for w in weights):
+            raise ValueError("weights must be non-negative with a positive sum")
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left is 1.0 up to rounding error
+
+    def sample(self, rng):
+        i = int(rng.random() * len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+def _render(value, variables):
+    """Substitute {{name}} placeholders; a string that is just one placeholder keeps the value's type."""
+    if isinstance(value, str):
+        whole = _PLACEHOLDER.fullmatch(value)
+        if whole:
+            return variables[whole.group(1)]
+        return _PLACEHOLDER.sub(lambda m: str(variables[m.group(1)]), value)
+    if isinstance(value, dict):
+        return {k: _render(v, variables) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_render(v, variables) for v in value]
+    return value
+
+
+def _has_placeholder(value):
+    return bool(_PLACEHOLDER.search(json.dumps(value)))
+
+
+def _extract(data, path):
+    for part in path.split("."):
+        if isinstance(data, list):
+            data = data[int(part)]
+        else:
+            data = data[part]
+    return data
+
+
+def _think_time(think):
+    if isinstance(think, (list, tuple)):
+        low, high = think
+        return lambda rng: rng.uniform(low, high)
+    return lambda rng: think
+
+
+class JourneyStep:
+    __slots__ = ("raw", "prepared", "extract", "think")
+
+    def __init__(self, spec):
+        self.raw = spec["request"]
+        # Steps without placeholders are prepared once, like plain corpus requests
+        self.prepared = None if _has_placeholder(self.raw) else prepare_request(self.raw)
+        self.extract = spec.get("extract", {})
+        self.think = _think_time(spec.get("think", 0))
+
+    def request(self, variables):
+        return self.prepared or prepare_request(_render(self.raw, variables))
+
+
+class Journey:
+    """A scripted sequence of requests run back to back by one virtual user."""
+
+    def __init__(self, name, steps, rng):
+        self.name = name
+        self.steps = [JourneyStep(step) for step in steps]
+        self.rng = rng
+
+    async def __call__(self, session, results, scheduled=None, limiter=None, policy=None):
+        variables = {}
+        start = scheduled if scheduled is not None else time.monotonic()
+        for i, step in enumerate(self.steps):
+            try:
+                request = step.request(variables)
+            except KeyError:
+                record_journey(results, self.name, False)
+                return
+            # Only the first step has a scheduled send time; the rest follow its response
+            response = await hit_endpoint(session, request, results, scheduled if i == 0 else None,
+                                          limiter, policy)
+            if response is None or response.status_code >= 400:
+                record_journey(results, self.name, False)
+                return
+            if step.extract:
+                try:
+                    data = response.json()
+                    for name, path in step.extract.items():
+                        variables[name] = _extract(data, path)
+                except (ValueError, KeyError, IndexError, TypeError):
+                    record_journey(results, self.name, False)
+                    return
+            pause = step.think(self.rng)
+            if pause > 0:
+                await asyncio.sleep(pause)
+        record_journey(results, self.name, True, time.monotonic() - start)
+
+
+def _load_entry_requests(path):
+    # Draws need random access: compiled corpora are mmap'd, anything else is compiled into memory
+    if is_corpus(path):
+        return Corpus(path)
+    return compile_requests(iter_requests(path))
+
+
+class Scenario:
+    def __init__(self, entries, seed=None):
+        self.rng = random.Random(seed)
+        self.names = []
+        self.choices = []
+        weights = []
+        for entry in entries:
+            self.names.append(entry["name"])
+            weights.append(entry.get("weight", 1))
+            if "journey" in entry:
+                self.choices.append(Journey(entry["name"], entry["journey"], self.rng))
+            else:
+                requests = entry["requests"]
+                if not len(requests):
+                    raise ValueError(f"scenario entry {entry['name']!r} has no requests")
+                self.choices.append(requests)
+        self.table = AliasTable(weights)
+
+    def draw(self):
+        choice = self.choices[self.table.sample(self.rng)]
+        if isinstance(choice, Journey):
+            return choice
+        return choice[int(self.rng.random() * len(choice))]
+
+    def feed(self, count=None):
+        """Yield `count` draws, or draw forever when count is None (open-loop runs)."""
+        if count is None:
+            while True:
+                yield self.draw()
+        for _ in range(count):
+            yield self.draw()
+
+
+def load_scenario(file_path, seed=None):
+    file_path = Path(file_path)
+    with open(file_path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    entries = []
+    for i, entry in enumerate(spec["mix"]):
+        entry = dict(entry)
+        entry.setdefault("name", f"entry-{i}")
+        if "requests" in entry:
+            entry["requests"] = _load_entry_requests(file_path.parent / entry["requests"])
+        elif "journey" not in entry:
+            raise ValueError(f"scenario entry {entry['name']!r} needs 'requests' or 'journey'")
+        entries.append(entry)
+    return Scenario(entries, seed)
@@ -0,0 +1,77 @@
+import math
+import random
+
+
+def parse_profile(spec):
+    """Parse "30:50,60:50-200" into [(30, 50, 50), (60, 50, 200)] stages.
+
+    Each stage is seconds:rps for a step, or seconds:start-end for a linear ramp.
+    """
+    stages = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            duration, rates = part.split(':', 1)
+            if '-' in rates:
+                start_rate, end_rate = rates.split('-', 1)
+            else:
+                start_rate = end_rate = rates
+            stage = (float(duration), float(start_rate), float(end_rate))
+        except ValueError:
+            raise ValueError(f"Invalid profile stage '{part}' (expected seconds:rps or seconds:rps-rps)")
+        if stage[0] <= 0 or stage[1] < 0 or stage[2] < 0:
+            raise ValueError(f"Invalid profile stage '{part}' (duration must be > 0, rates >= 0)")
+        stages.append(stage)
+    if not stages:
+        raise ValueError("Profile must contain at least one stage")
+    return stages
+
+
+def constant_profile(rate, duration):
+    return [(float(duration), float(rate), float(rate))]
+
+
+def _stage_offset(u, duration, start_rate, end_rate):
+    """Invert the stage's cumulative rate r0*t + (r1-r0)*t^2/(2d): seconds until `u` arrivals are due."""
+    if u <= 0:
+        return 0.0
+    if start_rate == end_rate:
+        return u / start_rate
+    a = (end_rate - start_rate) / (2 * duration)
+    # Root of a*t^2 + r0*t - u = 0, in the form that stays stable as a -> 0
+    return 2 * u / (start_rate + math.sqrt(max(start_rate * start_rate + 4 * a * u, 0.0)))
+
+
+def arrival_times(stages, arrival="constant", seed=None, phase=0.0):
+    """Yield send offsets (seconds from test start) following the rate profile.
+
+    The k-th constant arrival is sent where the expected number of arrivals so
+    far (the integral of the rate) reaches k; Poisson arrivals where it reaches
+    a running sum of Exp(1) draws. Both carry over stage boundaries, so the
+    count over a profile matches its integral however steep the ramps are.
+
+    `phase` (0 <= phase < 1) delays constant arrivals by that fraction of an
+    arrival, so N schedules at phases 0, 1/N, ... interleave evenly.
+    """
+    if arrival not in ("constant", "poisson"):
+        raise ValueError(f"Unknown arrival distribution: {arrival}")
+    rng = random.Random(seed)
+    stage_start = 0.0
+    total = 0.0  # expected arrivals before the current stage
+    k = 0
+    u = rng.expovariate(1.0) if arrival == "poisson" else 0.0
+    for duration, start_rate, end_rate in stages:
+        expected = duration * (start_rate + end_rate) / 2
+        while True:
+            target = u if arrival == "poisson" else k + phase
+            if target >= total + expected:
+                break
+            yield stage_start + _stage_offset(target - total, duration, start_rate, end_rate)
+            if arrival == "poisson":
+                u += rng.expovariate(1.0)
+            else:
+                k += 1
+        total += expected
+        stage_start += duration
@@ -0,0 +1,87 @@
+import contextlib
+import time
+from reporter import record_result, record_lag, record_trace, record_stream, record_outcome
+from resilience import CircuitOpenError, classify_outcome, send_options
+from tracing import RequestTrace
+
+_UNLIMITED = contextlib.nullcontext()
+
+
+async def _sse_events(response):
+    # One SSE "data:" event per generated token/delta (OpenAI-style chat streams).
+    # Read through to the end even after [DONE] so the connection goes back to the pool.
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data and data != "[DONE]":
+            yield data
+
+
+async def _chunks(response):
+    # Plain chunked responses: every non-empty chunk counts as one token
+    async for chunk in response.aiter_raw():
+        if chunk:
+            yield chunk
+
+
+async def hit_streaming_endpoint(session, request, results, scheduled=None, limiter=None, policy=None):
+    """Consume a streamed (SSE or chunked) response incrementally and record token timings.
+
+    Nothing but the current line/chunk is held in memory; time-to-first-token and
+    the gaps between tokens go straight into the results histograms. Timeouts
+    and the circuit breaker apply, but streams are never retried: tokens may
+    already have been counted when one fails.
+    """
+    endpoint = request.endpoint
+    trace = RequestTrace()
+    slot = limiter.slot(request.host) if limiter else _UNLIMITED
+    stream = results['stream']
+    breaker = policy.breaker(request.host) if policy else None
+    log = results['log']
+    if breaker and not breaker.allow():
+        record_outcome(results, "circuit_open")
+        record_result(results, False, None, CircuitOpenError(f"circuit open for {request.host}"), endpoint, request)
+        if log is not None:
+            log.append(time.time(), endpoint, "circuit_open")
+        return
+
+    response = elapsed = sent_at = None
+    try:
+        async with slot:
+            start = time.monotonic()
+            sent_at = time.time()
+            if scheduled is not None:
+                record_lag(results, max(start - scheduled, 0.0))
+                sent_at -= start - scheduled
+                start = scheduled
+            async with session.stream(request.method, request.url, headers=request.headers, content=request.content,
+                                      extensions={"trace": trace}, **send_options(request, policy)) as response:
+                is_sse = response.headers.get("content-type", "").startswith("text/event-stream")
+                tokens = 0
+                first = last = None
+                async for _ in (_sse_events(response) if is_sse else _chunks(response)):
+                    now = time.monotonic()
+                    if first is None:
+                        first = now
+                        stream['ttft'].record(now - start)
+                    else:
+                        stream['itl'].record(now - last)
+                    last = now
+                    tokens += 1
+            elapsed = time.monotonic() - start
+
+        outcome = classify_outcome(response)
+        record_result(results, True, elapsed, response.status_code, endpoint)
+        record_trace(results, trace, endpoint)
+        record_stream(results, tokens, first, last, start)
+    except Exception as e:
+        outcome = classify_outcome(error=e)
+        record_result(results, False, None, e, endpoint, request)
+    record_outcome(results, outcome)
+    if breaker:
+        breaker.record(outcome)
+    if log is not None:
+        log.append(sent_at or time.time(), endpoint, outcome, response.status_code if response is not None else 0,
+                   elapsed, trace, len(request.content or b""),
+                   response.num_bytes_downloaded if response is not None else 0)
@@ -0,0 +1,17 @@
+import sys
+from pathlib import Path
+import pytest
+
+# The modules are flat scripts run from RESPONSE_GEN (`from config import ...`).
+# Run from RESPONSE_GEN: `python -m pytest tests` (LLM-REQUEST_GEN has its own
+# `client` and `utils`, so the two suites can't share one interpreter).
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmark import MockTarget  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def mock_target():
+    """mock_server.py on a free local port, with SSE streams of 5 tokens under /sse."""
+    with MockTarget("--sse-tokens", "5") as target:
+        yield target
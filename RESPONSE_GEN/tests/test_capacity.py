@@ -0,0 +1,57 @@
+import pytest
+from capacity import meets_slo, search_capacity, step_stats
+from reporter import new_results, record_result
+
+
+def synthetic_step(knee, errors_past_knee=False):
+    """A fake system: fast below `knee`, slow (or failing with 503s) above it."""
+    loads = []
+
+    def run_step(load):
+        loads.append(load)
+        results = new_results()
+        over = load > knee
+        for _ in range(100):
+            if over and errors_past_knee:
+                record_result(results, True, 0.01, 503)
+            else:
+                record_result(results, True, 1.0 if over else 0.01, 200)
+        results['elapsed'] = 1.0
+        return results
+
+    return run_step, loads
+
+
+def test_bisects_to_the_knee():
+    run_step, loads = synthetic_step(37)
+    report = search_capacity(run_step, 5, slo_p99=0.5, slo_error_rate=0.01, precision=0.02)
+    # Ramp 5, 10, 20, 40, then bisect between 20 and 40
+    assert loads[:4] == [5, 10, 20, 40]
+    assert report['limit'] > 37 >= report['capacity']
+    assert report['limit'] - report['capacity'] <= 0.02 * report['limit']
+    assert len(report['steps']) == len(loads)
+
+
+def test_integer_loads_end_on_neighbours():
+    run_step, loads = synthetic_step(13, errors_past_knee=True)
+    report = search_capacity(run_step, 1, slo_p99=0.5, slo_error_rate=0.01, integer=True)
+    assert all(isinstance(load, int) for load in loads)
+    assert (report['capacity'], report['limit']) == (13, 14)
+
+
+def test_ceiling_stops_the_ramp():
+    run_step, loads = synthetic_step(1000)
+    report = search_capacity(run_step, 10, slo_p99=0.5, slo_error_rate=0.01, max_load=50)
+    assert loads == [10, 20, 40, 50]
+    assert report == {"steps": report['steps'], "capacity": 50, "limit": None}
+
+
+def test_server_errors_break_the_slo():
+    results = new_results()
+    record_result(results, True, 0.01, 200)
+    record_result(results, True, 0.01, 500)
+    results['elapsed'] = 1.0
+    stats = step_stats(results)
+    assert stats['error_rate'] == pytest.approx(0.5)
+    assert not meets_slo(stats, 1.0, 0.1)
+    assert not meets_slo({"requests": 0, "p99": 0, "error_rate": 0}, 1.0, 0.1)
@@ -0,0 +1,68 @@
+import struct
+import pytest
+from corpus import Corpus, compile_corpus, is_corpus
+
+REQUESTS = [
+    {"method": "get", "url": "http://127.0.0.1:8800/users/1"},
+    {"method": "POST", "url": "http://127.0.0.1:8800/posts", "headers": {"X-Trace": "a"}, "body": {"title": "é"}},
+    {"method": "DELETE", "url": "http://127.0.0.1:8800/posts/7", "body": None, "timeout": {"read": 2.5}},
+]
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    path = tmp_path / "reqs.corpus"
+    assert compile_corpus(REQUESTS, path) == len(REQUESTS)
+    corpus = Corpus(path)
+    yield corpus
+    corpus.close()
+
+
+def test_is_corpus():
+    assert is_corpus("run.corpus")
+    assert not is_corpus("run.jsonl")
+
+
+def test_round_trip(corpus):
+    assert len(corpus) == 3
+    get, post, delete = corpus
+    assert get.method == "GET"
+    assert str(get.url) == "http://127.0.0.1:8800/users/1"
+    assert get.endpoint == "GET /users/{id}"
+    assert get.host == "127.0.0.1:8800"
+    assert bytes(get.content) == b"{}"
+    assert post.headers == {"X-Trace": "a", "Content-Type": "application/json"}
+    assert "é" in bytes(post.content).decode("utf-8")
+    assert delete.content is None
+    assert delete.timeout.read == 2.5
+    assert get.timeout is None
+
+
+def test_random_access_and_shards(corpus):
+    assert corpus[-1].method == "DELETE"
+    with pytest.raises(IndexError):
+        corpus[3]
+    shard = corpus.shard(1, 2)
+    assert len(shard) == 1
+    assert [r.method for r in shard] == ["POST"]
+    # Shards are re-iterable (repeat > 1)
+    assert [r.method for r in shard] == ["POST"]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "bad.corpus"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        Corpus(path)
+
+
+def test_index_is_little_endian(tmp_path):
+    # Byte order is fixed on disk, so compiled corpora can move between machines
+    path = tmp_path / "reqs.corpus"
+    compile_corpus(REQUESTS, path)
+    data = path.read_bytes()
+    _, _, count, index_offset = struct.unpack_from("<8sIQQ", data)
+    offsets = struct.unpack_from(f"<{count + 1}Q", data, index_offset)
+    assert offsets[0] == struct.calcsize("<8sIQQ")
+    assert offsets[-1] == index_offset
+    assert list(offsets) == sorted(offsets)
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import time
+import pytest
+from distributed import Agent, agent_plans, read_message, run_distributed, send_message
+from scheduler import constant_profile
+
+
+async def start_agents(count):
+    servers = []
+    for _ in range(count):
+        servers.append(await asyncio.start_server(Agent(progress_interval=0.2).handle, "127.0.0.1", 0))
+    return servers, [server.sockets[0].getsockname()[:2] for server in servers]
+
+
+def write_corpus(tmp_path, target, count):
+    path = tmp_path / "reqs.json"
+    requests = [{"method": "GET", "url": f"http://127.0.0.1:{target.port}/items/{i}"} for i in range(count)]
+    path.write_text(json.dumps({"requests": requests}))
+    return path
+
+
+def test_frames_round_trip():
+    async def run():
+        frames = []
+
+        class Sink:
+            def write(self, data):
+                frames.append(data)
+
+            async def drain(self):
+                pass
+
+        await send_message(Sink(), {"type": "ready", "count": 3})
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"".join(frames))
+        reader.feed_eof()
+        return await read_message(reader), await read_message(reader)
+
+    assert asyncio.run(run()) == ({"type": "ready", "count": 3}, None)
+
+
+def test_closed_loop_split_across_agents(tmp_path, mock_target):
+    path = write_corpus(tmp_path, mock_target, 30)
+
+    async def run():
+        servers, addresses = await start_agents(2)
+        try:
+            plans = agent_plans(2, "closed", concurrency=4, repeat=2)
+            return await run_distributed(addresses, path, plans, start_delay=0.2)
+        finally:
+            for server in servers:
+                server.close()
+
+    results = asyncio.run(run())
+    # Each agent runs every other request, twice over
+    assert results['success'] == 60
+    assert results['fail'] == 0
+    assert results['latency'].count == 60
+
+
+def test_open_loop_splits_the_rate(tmp_path, mock_target):
+    path = write_corpus(tmp_path, mock_target, 10)
+
+    async def run():
+        servers, addresses = await start_agents(2)
+        try:
+            plans = agent_plans(2, "open", stages=constant_profile(40, 1), max_in_flight=20)
+            return await run_distributed(addresses, path, plans, start_delay=0.2)
+        finally:
+            for server in servers:
+                server.close()
+
+    results = asyncio.run(run())
+    assert results['success'] + results['fail'] == 40
+
+
+def test_agent_stops_when_the_controller_goes_away(tmp_path, mock_target):
+    path = write_corpus(tmp_path, mock_target, 10)
+
+    async def run():
+        servers, addresses = await start_agents(1)
+        plans = agent_plans(1, "open", stages=constant_profile(20, 30), max_in_flight=20)
+        controller = asyncio.create_task(run_distributed(addresses, path, plans, start_delay=0.1))
+        await asyncio.sleep(1.0)
+        started = time.monotonic()
+        controller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await controller
+        # The agent is free for the next controller once it has stopped the run
+        while True:
+            reader, writer = await asyncio.open_connection(*addresses[0])
+            await send_message(writer, {"type": "setup", "plan": plans[0]})
+            await send_message(writer, {"type": "corpus", "requests": []})
+            await send_message(writer, {"type": "corpus_end"})
+            reply = await asyncio.wait_for(read_message(reader), 5)
+            writer.close()
+            if reply["type"] != "error" or time.monotonic() - started > 5:
+                break
+            await asyncio.sleep(0.1)
+        servers[0].close()
+        return reply, time.monotonic() - started
+
+    reply, elapsed = asyncio.run(run())
+    assert reply == {"type": "ready", "count": 0}
+    assert elapsed < 5
+
+
+def test_failed_setup_releases_the_ready_agents(tmp_path, mock_target):
+    path = write_corpus(tmp_path, mock_target, 10)
+
+    async def run():
+        servers, addresses = await start_agents(1)
+        # Nothing listens here: grab a free port and close it again
+        closed = await asyncio.start_server(lambda r, w: None, "127.0.0.1", 0)
+        refused = closed.sockets[0].getsockname()[:2]
+        closed.close()
+        await closed.wait_closed()
+        plans = agent_plans(2, "closed", concurrency=2)
+        with pytest.raises(OSError):
+            await run_distributed([addresses[0], refused], path, plans, start_delay=0.1)
+        # The agent that did get ready was told to stop, so the next test can use it
+        results = await run_distributed(addresses, path, agent_plans(1, "closed", concurrency=2), start_delay=0.1)
+        for server in servers:
+            server.close()
+        return results
+
+    results = asyncio.run(run())
+    assert results['success'] == 10
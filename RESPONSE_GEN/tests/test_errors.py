@@ -0,0 +1,44 @@
+import json
+from types import SimpleNamespace
+from errors import ErrorAggregator, classify
+
+
+def test_variable_parts_are_normalised():
+    a = classify(ConnectionError("connect to 10.0.0.1:8080 failed after 3.5s"))
+    b = classify(ConnectionError("connect to 10.0.0.2:9090 failed after 12s"))
+    assert a == b == ("ConnectionError", "connect to <ip> failed after Ns")
+    assert classify("HTTP 503")[0] == "Error"
+
+
+def test_identical_failures_are_counted_once():
+    errors = ErrorAggregator(samples=2)
+    for i in range(10):
+        request = SimpleNamespace(method="GET", url=f"http://x/items/{i}")
+        errors.record(TimeoutError(f"timed out after {i}s"), request)
+    assert len(errors) == 10
+    [(etype, message, entry)] = errors.top()
+    assert (etype, message) == ("TimeoutError", "timed out after Ns")
+    assert entry["count"] == 10
+    assert len(entry["samples"]) == 2
+
+
+def test_classes_are_bounded():
+    errors = ErrorAggregator(max_classes=3)
+    for kind in (ValueError, KeyError, OSError, TypeError, RuntimeError):
+        errors.record(kind("boom"))
+    # Three real classes plus the shared overflow class
+    assert len(errors.classes) == 4
+    assert errors.total == 5
+    etype, _, entry = errors.top()[0]
+    assert etype == "Other"
+    assert entry["count"] == 2
+
+
+def test_merge_and_round_trip():
+    a, b = ErrorAggregator(), ErrorAggregator()
+    a.record(OSError("reset"))
+    b.record(OSError("reset"))
+    b.record(ValueError("bad"))
+    a.merge(ErrorAggregator.from_dict(json.loads(json.dumps(b.to_dict()))))
+    assert a.total == 3
+    assert {(etype, entry["count"]) for etype, _, entry in a.top()} == {("OSError", 2), ("ValueError", 1)}
@@ -0,0 +1,39 @@
+import itertools
+from feed import build_feed, cycle_requests, repeat_requests, shuffle_window
+
+
+def test_feed_is_lazy():
+    pulled = []
+
+    def source():
+        for i in itertools.count():
+            pulled.append(i)
+            yield i
+
+    feed = build_feed(source, repeat=1, window=4)
+    assert len(list(itertools.islice(feed, 10))) == 10
+    # Only the shuffle window is held ahead of what was consumed
+    assert len(pulled) <= 10 + 4
+
+
+def test_repeat_rereads_callable_sources():
+    calls = []
+
+    def source():
+        calls.append(1)
+        return iter([1, 2])
+
+    assert list(repeat_requests(source, 3)) == [1, 2] * 3
+    assert len(calls) == 3
+
+
+def test_shuffle_window_is_a_permutation():
+    shuffled = list(shuffle_window(range(100), 10, seed=1))
+    assert sorted(shuffled) == list(range(100))
+    assert shuffled != list(range(100))
+    assert shuffled == list(shuffle_window(range(100), 10, seed=1))
+
+
+def test_cycle_stops_on_empty_source():
+    assert list(cycle_requests([])) == []
+    assert list(itertools.islice(cycle_requests([1, 2]), 5)) == [1, 2, 1, 2, 1]
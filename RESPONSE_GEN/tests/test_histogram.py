@@ -0,0 +1,53 @@
+import json
+import random
+import pytest
+from histogram import Histogram
+
+
+def exact_percentile(values, q):
+    ordered = sorted(values)
+    return ordered[max(int(round(q / 100 * len(ordered))) - 1, 0)]
+
+
+def test_percentiles_within_bucket_precision():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(-3, 1) for _ in range(20000)]
+    hist = Histogram()
+    for v in values:
+        hist.record(v)
+    assert hist.count == len(values)
+    for q in (50, 90, 99, 99.9):
+        # 8 precision bits: reported values are within 1/128 of the true one
+        assert hist.percentile(q) == pytest.approx(exact_percentile(values, q), rel=0.02)
+    assert hist.mean() == pytest.approx(sum(values) / len(values), rel=1e-6)
+    assert hist.max == pytest.approx(max(values), abs=1e-6)
+
+
+def test_empty_histogram():
+    hist = Histogram()
+    assert hist.count == 0
+    assert hist.percentile(99) == 0
+
+
+def test_merge_equals_recording_everything():
+    rng = random.Random(1)
+    a, b, both = Histogram(), Histogram(), Histogram()
+    for i in range(5000):
+        v = rng.expovariate(20)
+        (a if i % 2 else b).record(v)
+        both.record(v)
+    a.merge(b)
+    assert a.count == both.count
+    assert a.counts == both.counts
+    assert a.percentile(99) == both.percentile(99)
+
+
+def test_to_dict_round_trip():
+    hist = Histogram()
+    for v in (0.001, 0.02, 0.02, 0.5, 3.0):
+        hist.record(v)
+    # Must survive the JSON frames of the distributed protocol
+    copy = Histogram.from_dict(json.loads(json.dumps(hist.to_dict())))
+    assert copy.count == hist.count
+    assert copy.counts == hist.counts
+    assert copy.summary() == hist.summary()
@@ -0,0 +1,82 @@
+import asyncio
+import json
+import socket
+import pytest
+from live import LiveMetrics, live_settings, start_live
+from reporter import new_results, record_result
+
+
+def test_tick_snapshots_only_the_last_window():
+    async def run():
+        results = new_results()
+        metrics = LiveMetrics(results, 60)
+        await metrics.start()
+        for latency in (0.1, 0.2, 0.3):
+            record_result(results, True, latency, 200)
+        record_result(results, False, 0.5, "timeout")
+        metrics.tick()
+        first = metrics.snapshot
+        record_result(results, True, 0.1, 200)
+        metrics.tick()
+        await metrics.stop()
+        return results, first, metrics.snapshot
+
+    results, first, second = asyncio.run(run())
+    assert first["requests"] == 4
+    assert first["error_rate"] == 0.25
+    assert first["p50"] == pytest.approx(0.2, rel=0.05)
+    # The second window starts empty; the totals keep counting
+    assert second["requests"] == 1
+    assert second["error_rate"] == 0.0
+    assert second["total_success"] == 4
+    assert results["window"] is None
+
+
+def test_start_live_is_off_by_default():
+    assert asyncio.run(start_live(new_results(), live_settings())) is None
+    assert asyncio.run(start_live(new_results(), None)) is None
+
+
+def test_jsonl_alone_turns_it_on(tmp_path):
+    path = tmp_path / "live.jsonl"
+
+    async def run():
+        results = new_results()
+        metrics = await start_live(results, live_settings(jsonl_path=str(path)))
+        assert metrics.interval == 5
+        record_result(results, True, 0.1, 200)
+        metrics.tick()
+        await metrics.stop()
+
+    asyncio.run(run())
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert lines[0]["requests"] == 1
+
+
+def test_prometheus_endpoint():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    async def get(path):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+        response = await reader.read()
+        writer.close()
+        return response.decode()
+
+    async def run():
+        results = new_results()
+        metrics = await start_live(results, live_settings(prometheus_port=port))
+        record_result(results, True, 0.1, 200)
+        record_result(results, False, 0.1, 500)
+        try:
+            return await get("/metrics"), await get("/other")
+        finally:
+            await metrics.stop()
+
+    metrics, other = asyncio.run(run())
+    assert metrics.startswith("HTTP/1.1 200 OK")
+    assert 'loadtest_requests_total{outcome="success"} 1' in metrics
+    assert 'loadtest_requests_total{outcome="fail"} 1' in metrics
+    assert other.startswith("HTTP/1.1 404")
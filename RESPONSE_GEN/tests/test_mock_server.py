@@ -0,0 +1,57 @@
+import json
+import socket
+import statistics
+import httpx
+import pytest
+from benchmark import MockTarget
+from mock_server import parse_latency
+
+
+def test_latency_specs():
+    assert parse_latency("0.25")() == 0.25
+    assert parse_latency(None)() == 0.0
+    assert all(0.1 <= parse_latency("uniform:0.1-0.2")() <= 0.2 for _ in range(100))
+    samples = [parse_latency("lognormal:0.02,0.5")() for _ in range(5000)]
+    assert statistics.median(samples) == pytest.approx(0.02, rel=0.1)
+    assert statistics.mean(parse_latency("exp:0.05")() for _ in range(5000)) == pytest.approx(0.05, rel=0.1)
+    for spec in ("gamma:1", "uniform:1", "fixed:abc"):
+        with pytest.raises(ValueError):
+            parse_latency(spec)
+
+
+def read_responses(sock, count):
+    data = b""
+    while data.count(b"HTTP/1.1") < count or not data.endswith(b"}"):
+        data += sock.recv(65536)
+    return data
+
+
+def test_pipelined_requests_on_one_connection(mock_target):
+    with socket.create_connection(("127.0.0.1", mock_target.port)) as sock:
+        body = b'{"a": 1}'
+        sock.sendall(b"GET /a HTTP/1.1\r\nHost: x\r\n\r\n"
+                     b"POST /b HTTP/1.1\r\nHost: x\r\nContent-Length: %d\r\n\r\n%s"
+                     b"GET /c HTTP/1.1\r\nHost: x\r\n\r\n" % (len(body), body))
+        data = read_responses(sock, 3)
+    # The POST body was consumed, not read as a request line
+    assert data.count(b"HTTP/1.1 200 OK") == 3
+
+
+def test_payload_size_and_sse(mock_target):
+    with httpx.Client() as client:
+        response = client.get(f"http://127.0.0.1:{mock_target.port}/items/1")
+        assert len(response.content) == 64
+        assert response.json()["id"] == 1
+        with client.stream("GET", f"http://127.0.0.1:{mock_target.port}/sse") as stream:
+            assert stream.headers["content-type"] == "text/event-stream"
+            events = [line for line in stream.iter_lines() if line.startswith("data: ")]
+    # --sse-tokens 5 in the fixture, then the terminator
+    assert events[-1] == "data: [DONE]"
+    assert [json.loads(e[6:])["choices"][0]["delta"]["content"] for e in events[:-1]] == ["tok"] * 5
+
+
+def test_injected_errors():
+    with MockTarget("--error-rate", "1", "--error-status", "503") as target:
+        response = httpx.get(f"http://127.0.0.1:{target.port}/items/1")
+    assert response.status_code == 503
+    assert response.json() == {"error": "injected failure"}
@@ -0,0 +1,30 @@
+import json
+from multiproc import _split, run_multiprocess
+from scheduler import constant_profile
+
+
+def write_corpus(tmp_path, target, count):
+    path = tmp_path / "reqs.json"
+    requests = [{"method": "GET", "url": f"http://127.0.0.1:{target.port}/items/{i}"} for i in range(count)]
+    path.write_text(json.dumps({"requests": requests}))
+    return path
+
+
+def test_split_is_near_equal():
+    assert _split(10, 3) == [4, 3, 3]
+    assert sum(_split(1000, 7)) == 1000
+
+
+def test_closed_run_never_exceeds_concurrency(tmp_path, mock_target):
+    path = write_corpus(tmp_path, mock_target, 12)
+    log = tmp_path / "run.rlog"
+    results = run_multiprocess(str(path), 4, concurrency=2, result_log=str(log))
+    assert results["success"] == 12
+    # Two one-slot workers, not four
+    assert sorted(p.name for p in tmp_path.glob("run.w*.rlog")) == ["run.w0.rlog", "run.w1.rlog"]
+
+
+def test_open_run_sends_the_whole_profile(tmp_path, mock_target):
+    path = write_corpus(tmp_path, mock_target, 10)
+    results = run_multiprocess(str(path), 3, mode="open", stages=constant_profile(30, 1))
+    assert results["success"] + results["fail"] == 30
@@ -0,0 +1,95 @@
+import asyncio
+import socket
+import httpx
+import pytest
+import resilience
+from resilience import CircuitBreaker, RequestPolicy, classify_outcome, parse_timeout, policy_settings
+from prepared import compile_requests
+from runner import run_requests_concurrently
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock)
+    return clock
+
+
+def test_breaker_opens_probes_and_closes(clock):
+    breaker = CircuitBreaker(threshold=3, cooldown=5)
+    for _ in range(2):
+        breaker.record("http_5xx")
+    assert breaker.allow()
+    breaker.record("connect_error")
+    assert not breaker.allow()
+    clock.now += 5
+    # One probe after the cooldown, nothing else until it reports back
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record("ok")
+    assert breaker.allow()
+    assert breaker.failures == 0
+
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker(threshold=2, cooldown=1)
+    breaker.record("read_timeout")
+    breaker.record("read_timeout")
+    clock.now += 1
+    assert breaker.allow()
+    breaker.record("read_timeout")
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+
+
+def test_client_errors_do_not_trip_the_breaker():
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    breaker.record("http_4xx")
+    breaker.record("http_429")
+    assert breaker.allow()
+
+
+def test_retry_policy_and_jittered_backoff():
+    policy = RequestPolicy(policy_settings(retries=2, backoff=0.1, backoff_max=0.3))
+    assert policy.should_retry("http_5xx", 0)
+    assert policy.should_retry("http_429", 1)
+    assert not policy.should_retry("http_5xx", 2)
+    assert not policy.should_retry("http_4xx", 0)
+    for attempt, cap in ((0, 0.1), (1, 0.2), (5, 0.3)):
+        delays = [policy.backoff_delay(attempt) for _ in range(500)]
+        assert all(0 <= d <= cap for d in delays)
+        # Full jitter spreads retries over the whole window, not at its edge
+        assert min(delays) < cap / 4 and max(delays) > cap * 3 / 4
+
+
+def test_outcomes_and_timeouts():
+    assert classify_outcome(error=httpx.ConnectTimeout("x")) == "connect_timeout"
+    assert classify_outcome(error=httpx.ConnectError("x")) == "connect_error"
+    assert classify_outcome(error=ValueError("x")) == "other"
+    assert classify_outcome(httpx.Response(503)) == "http_5xx"
+    timeout = parse_timeout({"timeout": 10, "connect": 1})
+    assert (timeout.connect, timeout.read, timeout.pool) == (1, 10, 10)
+    assert parse_timeout("2.5").read == 2.5
+
+
+def test_refused_requests_are_retried_then_fail_fast():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    requests = compile_requests({"method": "GET", "url": f"http://127.0.0.1:{port}/x"} for _ in range(10))
+    policy = policy_settings(retries=1, backoff=0.001, breaker_threshold=4, breaker_cooldown=60)
+    results = asyncio.run(run_requests_concurrently(requests, 1, policy=policy))
+    assert results['fail'] == 10
+    # Two requests with one retry each trip the breaker; the rest never leave the client
+    assert results['outcomes'] == {"connect_error": 2, "circuit_open": 8}
+    assert results['retries']['outcomes'] == {"connect_error": 2}
+    assert results['retries']['exhausted'] == 2
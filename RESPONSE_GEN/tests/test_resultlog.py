@@ -0,0 +1,67 @@
+import math
+from resultlog import ResultLog, ResultLogReader, step_log_path, worker_log_path
+
+
+def test_write_and_read_back(tmp_path):
+    path = tmp_path / "run.rlog"
+    log = ResultLog(path, block_size=4)
+    for i in range(10):
+        log.append(1000.0 + i, "GET /a" if i % 2 else "POST /b", "ok", 200, 0.01 * i, bytes_out=10, bytes_in=100 + i)
+    log.append(2000.0, "GET /a", "connect_error", attempt=1)
+    log.close()
+
+    reader = ResultLogReader(path)
+    try:
+        assert len(reader) == 11
+        rows = list(reader.rows())
+        assert rows[3]["endpoint"] == "GET /a"
+        assert rows[3]["status"] == 200
+        assert rows[3]["bytes_in"] == 103
+        assert math.isclose(rows[3]["latency"], 0.03, rel_tol=1e-6)
+        failed = rows[-1]
+        assert failed["outcome"] == "connect_error"
+        assert failed["attempt"] == 1
+        assert failed["status"] == 0
+        assert math.isnan(failed["latency"])
+        # Three blocks of at most four rows, read as zero-copy column views
+        assert [len(block["time"]) for block in reader.blocks()] == [4, 4, 3]
+    finally:
+        reader.close()
+
+
+def test_truncated_final_block_is_skipped(tmp_path):
+    path = tmp_path / "run.rlog"
+    log = ResultLog(path, block_size=2)
+    for i in range(4):
+        log.append(float(i), "GET /a", "ok", 200, 0.1)
+    log.close()
+    data = path.read_bytes()
+    path.write_bytes(data[:-8])
+    reader = ResultLogReader(path)
+    try:
+        assert len(reader) == 2
+    finally:
+        reader.close()
+
+
+def test_derived_paths():
+    assert worker_log_path("run.rlog", 0) == "run.w0.rlog"
+    assert step_log_path("run.rlog", 2) == "run.step2.rlog"
+    assert worker_log_path(step_log_path("out", 1), 3) == "out.step1.w3.rlog"
+
+
+def test_endpoint_ids_past_the_column_width_share_other(tmp_path):
+    path = tmp_path / "run.rlog"
+    log = ResultLog(path)
+    for i in range(70000):
+        log.append(float(i), f"GET /e{i}", "ok", 200, 0.1)
+    log.close()
+    reader = ResultLogReader(path)
+    try:
+        assert len(reader.endpoints) == 65536
+        rows = list(reader.rows())
+        assert rows[65534]["endpoint"] == "GET /e65534"
+        assert rows[65535]["endpoint"] == "OTHER"
+        assert rows[-1]["endpoint"] == "OTHER"
+    finally:
+        reader.close()
@@ -0,0 +1,20 @@
+import asyncio
+from runner import run_requests_concurrently, run_requests_open_loop
+from scheduler import constant_profile
+
+
+def test_closed_loop_against_mock(mock_target):
+    requests = mock_target.requests(20)
+    results = asyncio.run(run_requests_concurrently(requests, 5, repeat=2))
+    assert results['success'] == 40
+    assert results['fail'] == 0
+    assert results['latency'].count == 40
+    assert results['status_codes'] == {200: 40}
+
+
+def test_open_loop_sends_the_profile(mock_target):
+    requests = mock_target.requests(10)
+    results = asyncio.run(run_requests_open_loop(requests, constant_profile(50, 1)))
+    assert results['success'] + results['fail'] == 50
+    assert results['lag'].count == 50
+
@@ -0,0 +1,68 @@
+import asyncio
+import json
+import random
+from collections import Counter
+import pytest
+from runner import run_requests_concurrently
+from scenario import AliasTable, _render, load_scenario
+
+
+def test_alias_table_follows_the_weights():
+    table = AliasTable([70, 25, 5, 0])
+    rng = random.Random(1)
+    counts = Counter(table.sample(rng) for _ in range(100_000))
+    assert counts[3] == 0
+    for i, share in enumerate((0.70, 0.25, 0.05)):
+        assert counts[i] / 100_000 == pytest.approx(share, abs=0.01)
+
+
+@pytest.mark.parametrize("weights", [[], [0, 0], [1, -1]])
+def test_alias_table_rejects_bad_weights(weights):
+    with pytest.raises(ValueError):
+        AliasTable(weights)
+
+
+def test_placeholders_keep_whole_values_typed():
+    variables = {"id": 7, "name": "ann"}
+    assert _render({"url": "http://x/{{id}}/{{name}}", "body": {"ref": "{{id}}"}}, variables) == \
+        {"url": "http://x/7/ann", "body": {"ref": 7}}
+
+
+def write_scenario(tmp_path, target):
+    base = f"http://127.0.0.1:{target.port}"
+    (tmp_path / "reads.json").write_text(json.dumps(
+        {"requests": [{"method": "GET", "url": f"{base}/items/{i}"} for i in range(5)]}))
+    spec = {"mix": [
+        {"name": "read", "weight": 3, "requests": "reads.json"},
+        {"name": "create", "weight": 1, "journey": [
+            {"request": {"method": "POST", "url": f"{base}/posts", "body": {"title": "t"}}, "extract": {"post_id": "id"}},
+            {"request": {"method": "GET", "url": f"{base}/posts/{{{{post_id}}}}"}, "think": [0, 0.01]},
+        ]},
+        {"name": "broken", "weight": 1, "journey": [
+            {"request": {"method": "GET", "url": f"{base}/posts"}, "extract": {"post_id": "missing.field"}},
+            {"request": {"method": "GET", "url": f"{base}/posts/{{{{post_id}}}}"}},
+        ]},
+    ]}
+    path = tmp_path / "scenario.json"
+    path.write_text(json.dumps(spec))
+    return path
+
+
+def test_seeded_draws_are_reproducible(tmp_path, mock_target):
+    path = write_scenario(tmp_path, mock_target)
+    first = [getattr(d, "name", None) for d in load_scenario(path, seed=5).feed(50)]
+    again = [getattr(d, "name", None) for d in load_scenario(path, seed=5).feed(50)]
+    assert first == again
+    assert {"create", "broken", None} == set(first)
+
+
+def test_journeys_run_against_mock(tmp_path, mock_target):
+    scenario = load_scenario(write_scenario(tmp_path, mock_target), seed=1)
+    results = asyncio.run(run_requests_concurrently(scenario.feed(100), 5, 1, 0, None))
+    journeys = results['journeys']
+    # The extracted id feeds the second step; a missing extract path aborts the journey
+    assert journeys['create']['completed'] > 0
+    assert journeys['create']['aborted'] == 0
+    assert journeys['broken']['completed'] == 0
+    assert journeys['broken']['aborted'] > 0
+    assert results['fail'] == 0
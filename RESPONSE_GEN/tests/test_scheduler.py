@@ -0,0 +1,70 @@
+import math
+import pytest
+from scheduler import arrival_times, constant_profile, parse_profile
+
+
+def expected_arrivals(stages):
+    return sum(duration * (start + end) / 2 for duration, start, end in stages)
+
+
+def test_parse_profile():
+    assert parse_profile("30:50, 60:50-200") == [(30.0, 50.0, 50.0), (60.0, 50.0, 200.0)]
+    with pytest.raises(ValueError):
+        parse_profile("30:-5")
+    with pytest.raises(ValueError):
+        parse_profile("")
+
+
+@pytest.mark.parametrize("spec", ["2:10", "10:0-100", "60:0-200", "10:100-0", "5:0,5:0-50,3:20", "1:7,1:3.5"])
+def test_constant_counts_match_integral(spec):
+    stages = parse_profile(spec)
+    times = list(arrival_times(stages))
+    assert len(times) == math.ceil(expected_arrivals(stages))
+    assert times == sorted(times)
+    assert 0 <= times[0] and times[-1] < sum(stage[0] for stage in stages)
+
+
+def test_constant_step_is_evenly_spaced():
+    times = list(arrival_times(constant_profile(10, 2)))
+    assert len(times) == 20
+    assert times[1] - times[0] == pytest.approx(0.1)
+    assert times[-1] == pytest.approx(1.9)
+
+
+def test_ramp_from_zero_follows_the_rate():
+    times = list(arrival_times(parse_profile("10:0-100")))
+    # Half the duration of a 0->r ramp carries a quarter of its arrivals
+    assert sum(t < 5 for t in times) == 125
+
+
+def test_zero_rate_stage_sends_nothing():
+    times = list(arrival_times(parse_profile("5:0,5:20")))
+    assert len(times) == 100
+    assert times[0] == pytest.approx(5.0)
+
+
+@pytest.mark.parametrize("spec", ["60:100", "60:0-200", "30:50,30:50-150"])
+def test_poisson_counts_match_integral(spec):
+    stages = parse_profile(spec)
+    expected = expected_arrivals(stages)
+    counts = [sum(1 for _ in arrival_times(stages, "poisson", seed)) for seed in range(5)]
+    # Poisson count: sd = sqrt(expected); allow 4 sd on the mean of 5 runs
+    assert abs(sum(counts) / len(counts) - expected) < 4 * math.sqrt(expected / len(counts))
+
+
+def test_poisson_is_reproducible_with_seed():
+    stages = parse_profile("5:0-40")
+    assert list(arrival_times(stages, "poisson", 3)) == list(arrival_times(stages, "poisson", 3))
+
+
+def test_unknown_arrival():
+    with pytest.raises(ValueError):
+        list(arrival_times(constant_profile(1, 1), "burst"))
+
+
+def test_phased_schedules_interleave():
+    # Four workers at a quarter of 40 req/s each, as multiproc splits an open-loop run
+    workers = [list(arrival_times(constant_profile(10, 1), phase=i / 4)) for i in range(4)]
+    merged = sorted(t for times in workers for t in times)
+    assert len(merged) == 40
+    assert all(b - a == pytest.approx(0.025) for a, b in zip(merged, merged[1:]))
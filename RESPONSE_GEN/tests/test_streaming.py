@@ -0,0 +1,14 @@
+import asyncio
+from runner import run_requests_concurrently
+
+
+def test_streaming_records_token_metrics(mock_target):
+    requests = mock_target.requests(4, path="/sse")
+    results = asyncio.run(run_requests_concurrently(requests, 2, streaming=True))
+    stream = results['stream']
+    assert results['success'] == 4
+    assert stream['requests'] == 4
+    assert stream['tokens'] == 20
+    assert stream['ttft'].count == 4
+    # Five tokens give four gaps per request
+    assert stream['itl'].count == 16
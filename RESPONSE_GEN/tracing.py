@@ -0,0 +1,42 @@
+import time
+
+
+# (phase, start event, end event). DNS lookup happens inside httpcore's
+# connect_tcp, so it is part of "connect" rather than a phase of its own.
+PHASES = (
+    ("connect", "connect_tcp.started", "connect_tcp.complete"),
+    ("tls", "start_tls.started", "start_tls.complete"),
+    ("send", "send_request_headers.started", "send_request_body.complete"),
+    ("wait", "send_request_body.complete", "receive_response_headers.complete"),
+    ("ttfb", "send_request_headers.started", "receive_response_headers.complete"),
+    ("body", "receive_response_headers.complete", "receive_response_body.complete"),
+)
+
+
+class RequestTrace:
+    """Collects httpcore trace events for one request.
+
+    Pass as extensions={"trace": trace}; httpcore awaits it with event names
+    like "connection.connect_tcp.started" or
+    "http11.receive_response_headers.complete".
+    """
+
+    __slots__ = ("marks",)
+
+    def __init__(self):
+        self.marks = {}
+
+    async def __call__(self, event, info):
+        # Drop the "connection." / "http11." / "http2." prefix
+        self.marks[event.partition('.')[2]] = time.monotonic()
+
+    @property
+    def new_connection(self):
+        return "connect_tcp.started" in self.marks
+
+    def phases(self):
+        """Yield (phase, seconds) for every phase this request went through."""
+        marks = self.marks
+        for name, start, end in PHASES:
+            if start in marks and end in marks:
+                yield name, marks[end] - marks[start]
@@ -1,3 +1,4 @@
+import gzip
 import json
 from pathlib import Path
 
@@ -9,8 +10,44 @@ REQUESTS_PATH = (
     .parent / "LLM-REQUEST_GEN" / "generated" / "requests_generated.json"
 )
 
+JSONL_SUFFIXES = ('.jsonl', '.jsonl.gz', '.jsonl.zst')
+
+def is_jsonl(file_path):
+    return str(file_path).endswith(JSONL_SUFFIXES)
+
 def load_requests(file_path=REQUESTS_PATH):
+    file_path = Path(file_path)
     if not file_path.exists():
         raise FileNotFoundError(f"Request file not found at: {file_path}")
+    if is_jsonl(file_path):
+        return list(iter_requests(file_path))
     with open(file_path, 'r') as f:
         return json.load(f)['requests']
+
+def _open_jsonl(file_path):
+    name = str(file_path)
+    if name.endswith('.gz'):
+        return gzip.open(file_path, 'rt', encoding='utf-8')
+    if name.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("Reading .zst corpora needs the 'zstandard' package (pip install zstandard)")
+        return zstandard.open(file_path, 'rt', encoding='utf-8')
+    return open(file_path, 'r', encoding='utf-8')
+
+def iter_requests(file_path=REQUESTS_PATH):
+    # Yields requests one at a time. JSONL corpora (optionally .gz/.zst) are
+    # streamed line by line, so memory stays flat however large the file is;
+    # classic JSON documents still have to be loaded whole.
+    file_path = Path(file_path)
+    if not is_jsonl(file_path):
+        yield from load_requests(file_path)
+        return
+    if not file_path.exists():
+        raise FileNotFoundError(f"Request file not found at: {file_path}")
+    with _open_jsonl(file_path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
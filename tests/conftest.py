@@ -0,0 +1,19 @@
+import importlib.util
+import sys
+from importlib.machinery import SourceFileLoader
+from pathlib import Path
+import pytest
+
+# locallm is a script without a .py suffix, so it is loaded by path.
+# Run from the repository root: `python -m pytest tests` (RESPONSE_GEN and
+# LLM-REQUEST_GEN have their own suites and can't share one interpreter).
+LOCALLM = Path(__file__).resolve().parent.parent / "locallm"
+
+
+@pytest.fixture(scope="session")
+def locallm():
+    loader = SourceFileLoader("locallm", str(LOCALLM))
+    module = importlib.util.module_from_spec(importlib.util.spec_from_loader("locallm", loader))
+    sys.modules["locallm"] = module
+    loader.exec_module(module)
+    return module
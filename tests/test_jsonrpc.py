@@ -0,0 +1,101 @@
+import asyncio
+import json
+import pytest
+
+
+async def fake_server(handler):
+    """A TCP stand-in for an MCP server's stdin/stdout, running `handler(reader, writer)`."""
+    server = await asyncio.start_server(handler, "127.0.0.1", 0)
+    reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+    return server, reader, writer
+
+
+async def read_json(reader):
+    return json.loads(await reader.readline())
+
+
+def write_json(writer, message):
+    writer.write((json.dumps(message) + "\n").encode())
+
+
+def test_responses_are_routed_by_id(locallm):
+    notes = []
+
+    async def reply_backwards(reader, writer):
+        requests = [await read_json(reader) for _ in range(3)]
+        write_json(writer, {"jsonrpc": "2.0", "method": "notifications/progress", "params": {}})
+        for request in reversed(requests):
+            write_json(writer, {"jsonrpc": "2.0", "id": request["id"], "result": request["params"]})
+        await writer.drain()
+
+    async def run():
+        server, reader, writer = await fake_server(reply_backwards)
+        mux = locallm.JSONRPCMultiplexer(reader, writer, default_timeout=5, on_message=notes.append)
+        mux.start()
+        try:
+            return await asyncio.gather(*(mux.request("tools/call", {"n": n}) for n in range(3)))
+        finally:
+            await mux.close()
+            writer.close()
+            server.close()
+
+    responses = asyncio.run(run())
+    assert [response["result"] for response in responses] == [{"n": 0}, {"n": 1}, {"n": 2}]
+    assert [note["method"] for note in notes] == ["notifications/progress"]
+
+
+def test_server_requests_are_answered(locallm):
+    async def ping_first(reader, writer):
+        request = await read_json(reader)
+        write_json(writer, {"jsonrpc": "2.0", "id": "s1", "method": "ping"})
+        write_json(writer, {"jsonrpc": "2.0", "id": "s2", "method": "sampling/createMessage", "params": {}})
+        await writer.drain()
+        replies = [await read_json(reader), await read_json(reader)]
+        write_json(writer, {"jsonrpc": "2.0", "id": request["id"], "result": {"replies": replies}})
+        await writer.drain()
+
+    async def run():
+        server, reader, writer = await fake_server(ping_first)
+        mux = locallm.JSONRPCMultiplexer(reader, writer, default_timeout=5)
+        mux.start()
+        try:
+            return await mux.request("initialize")
+        finally:
+            await mux.close()
+            writer.close()
+            server.close()
+
+    ping, sampling = asyncio.run(run())["result"]["replies"]
+    assert ping == {"jsonrpc": "2.0", "id": "s1", "result": {}}
+    assert sampling["id"] == "s2"
+    assert sampling["error"]["code"] == -32601
+
+
+def test_timeouts_and_closed_streams(locallm):
+    async def answer_late_then_hang_up(reader, writer):
+        slow = await read_json(reader)
+        await read_json(reader)
+        await asyncio.sleep(0.2)
+        # The first call has timed out by now, so this reply is dropped
+        write_json(writer, {"jsonrpc": "2.0", "id": slow["id"], "result": {}})
+        await writer.drain()
+        writer.close()
+
+    async def run():
+        server, reader, writer = await fake_server(answer_late_then_hang_up)
+        mux = locallm.JSONRPCMultiplexer(reader, writer, default_timeout=5)
+        mux.start()
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await mux.request("slow", timeout=0.05)
+            with pytest.raises(ConnectionError):
+                await mux.request("never_answered")
+            # Once the stream is gone, new calls fail straight away
+            with pytest.raises(ConnectionError):
+                await mux.request("after_close")
+        finally:
+            await mux.close()
+            writer.close()
+            server.close()
+
+    asyncio.run(run())
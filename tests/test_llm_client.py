@@ -0,0 +1,152 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+TOOL_CALL = {"tool_name": "execute_sql_query", "parameters": {"query": "SELECT '}\" {' FROM t"}}
+
+
+class StubOllama(ThreadingHTTPServer):
+    """/api/tags and a streamed /api/generate that keeps going long after the tool call."""
+
+    def __init__(self):
+        self.calls = []
+        self.cut_early = threading.Event()
+        super().__init__(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = b'{"models": []}'
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        # No keep-alive, so a stopped stub is seen as down on the next check
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.server.calls.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+        self.send_response(200)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        text = "```json\n" + json.dumps(TOOL_CALL)
+        tokens = [text[i:i + 7] for i in range(0, len(text), 7)] + ["\n```"] + ["junk"] * 50
+        try:
+            for token in tokens:
+                data = (json.dumps({"response": token, "done": False}) + "\n").encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+                time.sleep(0.01)
+            self.wfile.write(b"0\r\n\r\n")
+        except OSError:
+            self.server.cut_early.set()
+
+
+@pytest.fixture
+def ollama():
+    server = StubOllama()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_scanner_finds_the_first_object_across_chunks(locallm):
+    scanner = locallm.JSONObjectScanner()
+    text = 'Sure! ```json\n{"a": "brace } in a string \\" {", "b": {"c": [1, 2]}} trailing {"x": 1}'
+    results = [scanner.feed(text[i:i + 4]) for i in range(0, len(text), 4)]
+    found = [r for r in results if r is not None]
+    assert found[0] == {"a": 'brace } in a string " {', "b": {"c": [1, 2]}}
+
+
+def test_scanner_skips_invalid_candidates(locallm):
+    scanner = locallm.JSONObjectScanner()
+    assert scanner.feed("{not json} ") is None
+    assert scanner.feed('{"ok": true}') == {"ok": True}
+
+
+def test_stream_stops_at_the_first_tool_call(locallm, ollama):
+    tools = [locallm.MCPTool("execute_sql_query", "run sql", {"properties": {"query": {"description": "SQL"}}})]
+
+    async def run():
+        client = locallm.LocalLLMClient(base_url=ollama.url, keep_alive="5m")
+        try:
+            first = await client.generate_tool_call("all rows", tools)
+            second = await client.generate_tool_call("all rows again", tools)
+            return first, second
+        finally:
+            await client.close()
+
+    first, second = asyncio.run(run())
+    assert first == second == TOOL_CALL
+    assert ollama.cut_early.wait(2)
+    # Same tools, same preamble: only the user request differs between the two prompts
+    a, b = (call["prompt"] for call in ollama.calls)
+    assert a.split("User Request:")[0] == b.split("User Request:")[0]
+    assert all(call["stream"] and call["keep_alive"] == "5m" for call in ollama.calls)
+
+
+def test_health_is_tracked_in_the_background(locallm, ollama):
+    async def run():
+        client = locallm.LocalLLMClient(base_url=ollama.url, health_interval=0.05)
+        await client.start()
+        up = client.available
+        ollama.shutdown()
+        ollama.server_close()
+        await asyncio.sleep(0.3)
+        down = client.available
+        task = client._health_task
+        await client.close()
+        return up, down, task
+
+    up, down, task = asyncio.run(run())
+    assert (up, down) == (True, False)
+    # close() waits for the cancelled health task instead of leaving it pending
+    assert task.cancelled()
+
+
+def test_interactive_input_does_not_block_the_loop(locallm, monkeypatch):
+    answers = iter(["show rows", ""])
+    ticks = []
+
+    def slow_input(prompt):
+        time.sleep(0.2)
+        answer = next(answers, None)
+        if answer is None:
+            raise EOFError
+        return answer
+
+    class Wrapper:
+        queries = []
+
+        async def process_user_query(self, query):
+            self.queries.append(query)
+            return "ok"
+
+    async def ticker():
+        while True:
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.02)
+
+    async def run():
+        task = asyncio.create_task(ticker())
+        await locallm.interactive_mode(Wrapper())
+        task.cancel()
+
+    monkeypatch.setattr("builtins.input", slow_input)
+    asyncio.run(run())
+    assert Wrapper.queries == ["show rows"]
+    # Other tasks kept running while input() waited, and EOF ended the session
+    assert len(ticks) > 10
@@ -0,0 +1,60 @@
+import pytest
+
+
+@pytest.fixture
+def tools(locallm):
+    return [locallm.MCPTool("execute_sql_query", "run sql", {"properties": {"query": {}}})]
+
+
+def call(sql):
+    return {"tool_name": "execute_sql_query", "parameters": {"query": sql}}
+
+
+def test_exact_hits_ignore_case_and_punctuation(locallm, tools):
+    cache = locallm.ToolCallCache()
+    cache.set_context(tools, "")
+    cache.put("Show me all employees?", call("SELECT * FROM employees"))
+    assert cache.get("  show me   ALL employees ") == call("SELECT * FROM employees")
+    assert cache.get("show me all managers") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_is_evicted(locallm, tools):
+    cache = locallm.ToolCallCache(max_entries=2)
+    cache.set_context(tools, "")
+    cache.put("a", call("A"))
+    cache.put("b", call("B"))
+    cache.get("a")
+    cache.put("c", call("C"))
+    assert cache.get("b") is None
+    assert cache.get("a") == call("A")
+    assert cache.get("c") == call("C")
+
+
+def test_changed_tools_or_schema_clear_the_cache(locallm, tools):
+    cache = locallm.ToolCallCache()
+    cache.set_context(tools, "employees(id, name)")
+    cache.put("list employees", call("SELECT * FROM employees"))
+    cache.set_context(tools, "employees(id, name)")
+    assert cache.get("list employees") is not None
+    cache.set_context(tools, "staff(id, name)")
+    assert cache.get("list employees") is None
+    cache.put("list staff", call("SELECT * FROM staff"))
+    cache.set_context(tools + [locallm.MCPTool("describe_schema", "schema", {})], "staff(id, name)")
+    assert not cache.entries
+
+
+def test_similar_prompts_reuse_a_call_above_the_threshold(locallm, tools):
+    cache = locallm.ToolCallCache(similarity=0.8)
+    cache.set_context(tools, "")
+    cache.put("show me all employees", call("SELECT * FROM employees"))
+    cache.put("find products with price over 100", call("SELECT * FROM products WHERE price > 100"))
+    assert cache.get("show me all the employees") == call("SELECT * FROM employees")
+    assert cache.get("count orders by customer") is None
+
+
+def test_exact_only_by_default(locallm, tools):
+    cache = locallm.ToolCallCache()
+    cache.set_context(tools, "")
+    cache.put("show me all employees", call("SELECT * FROM employees"))
+    assert cache.get("show me all the employees") is None